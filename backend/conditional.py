@@ -0,0 +1,75 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Mixin para vistas de DRF que responden GET condicionales (ETag).
+
+    Antes de ejecutar la consulta completa y la serialización, la vista
+    calcula un sello de versión barato con get_version_stamp(). Con él se
+    arma el ETag (junto con el usuario actual, la URL y la cabecera
+    Save-Data, porque la respuesta incluye campos por usuario como iliked o
+    i_follow y URLs de imágenes que dependen del ahorro de datos) y, si el
+    cliente ya tiene esa versión (If-None-Match), se responde 304 Not
+    Modified sin cuerpo.
+
+    No se envía Last-Modified: tiene resolución de un segundo (un cambio en
+    el mismo segundo daría un 304 falso con If-Modified-Since) y no
+    refleja las partes de la versión que no son fechas, como la del
+    usuario actual o una publicación que sale de la página.
+
+    Métodos:
+        get_version_stamp(request, *args, **kwargs): Devuelve las partes de la
+            versión, o None para no usar GET condicional.
+    """
+
+    def get_version_stamp(self, request, *args, **kwargs):
+        """
+        Devuelve el sello de versión de la respuesta sin serializarla.
+
+        Returns:
+            list: Partes de la versión, o None si no se puede calcular.
+        """
+        raise NotImplementedError('Las vistas con ConditionalGetMixin deben definir get_version_stamp()')
+
+    def get_etag(self, request, parts):
+        """
+        Construye el ETag a partir de las partes de la versión.
+
+        Args:
+            request: Objeto de solicitud.
+            parts (list): Partes de la versión.
+
+        Returns:
+            str: ETag entre comillas.
+        """
+        user_id = request.user.pk if request.user.is_authenticated else None
+        save_data = request.META.get('HTTP_SAVE_DATA', '')
+        raw = repr([user_id, request.get_full_path(), save_data, parts])
+        return quote_etag(hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest())
+
+    def set_conditional_headers(self, response, etag):
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ['Authorization', 'Save-Data'])
+        return response
+
+    def get(self, request, *args, **kwargs):
+        """
+        Responde 304 si el cliente ya tiene la versión actual; si no, la respuesta completa.
+        """
+        parts = self.get_version_stamp(request, *args, **kwargs)
+        if parts is None:
+            return super().get(request, *args, **kwargs)
+        etag = self.get_etag(request, parts)
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return self.set_conditional_headers(not_modified, etag)
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            self.set_conditional_headers(response, etag)
+        return response
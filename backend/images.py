@@ -0,0 +1,261 @@
+import io
+import logging
+import os
+
+from django.apps import apps
+from django.db import transaction
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+from backend.tasks import run_in_background
+from backend.uploads import process_uploaded_image
+from backend.versioning import version_bump
+
+logger = logging.getLogger(__name__)
+
+# (modelo, campo de imagen) -> (campo con las variantes, {tamaño: lado mayor en píxeles})
+VARIANT_SPECS = {
+    ('blog.Post', 'image'): ('image_variants', {'small': 480, 'medium': 1080}),
+    ('users.User', 'avatar'): ('avatar_variants', {'small': 64, 'medium': 200}),
+    ('users.User', 'cover_image'): ('cover_image_variants', {'small': 640, 'medium': 1500}),
+}
+# formato -> (formato de Pillow, extensión, opciones de guardado)
+VARIANT_FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 75, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 80, 'optimize': True, 'progressive': True}),
+}
+VARIANTS_DIR = 'variants'
+
+
+def wants_data_saver(request):
+    """
+    Indica si el cliente pidió ahorrar datos.
+
+    Se acepta la cabecera estándar Save-Data: on (la envían los navegadores
+    con el modo de ahorro activado) o el parámetro ?data_saver=1.
+
+    Args:
+        request: Objeto de solicitud o None.
+
+    Returns:
+        bool: True si se deben servir las variantes más pequeñas.
+    """
+    if request is None:
+        return False
+    if request.META.get('HTTP_SAVE_DATA', '').strip().lower() == 'on':
+        return True
+    return request.GET.get('data_saver', '').lower() in ('1', 'true', 'on')
+
+
+def select_variant(variants, request=None, size=None):
+    """
+    Elige la variante que se debe servir.
+
+    Con ahorro de datos se elige la más liviana de todas; si no, la más
+    liviana del tamaño pedido. Sin variantes (o sin tamaño pedido) se usa
+    la imagen original.
+
+    Args:
+        variants (dict): {tamaño: {formato: {'name', 'bytes', 'width', 'height'}}}.
+        request: Objeto de solicitud o None.
+        size (str): Tamaño preferido o None para la imagen original.
+
+    Returns:
+        str: Nombre del fichero de la variante o None para usar el original.
+    """
+    if not variants:
+        return None
+    if wants_data_saver(request):
+        candidates = [variant for formats in variants.values() for variant in formats.values()]
+    elif size in variants:
+        candidates = list(variants[size].values())
+    else:
+        return None
+    return min(candidates, key=lambda variant: variant['bytes'])['name']
+
+
+def render_variant(image, max_side, fmt):
+    """
+    Redimensiona la imagen y la codifica en el formato indicado.
+
+    Args:
+        image (Image): Imagen de Pillow ya orientada.
+        max_side (int): Lado mayor máximo en píxeles.
+        fmt (str): Clave de VARIANT_FORMATS.
+
+    Returns:
+        tuple: (bytes codificados, ancho, alto).
+    """
+    pil_format, _, options = VARIANT_FORMATS[fmt]
+    variant = image.copy()
+    variant.thumbnail((max_side, max_side), Image.LANCZOS)
+    if variant.mode not in ('RGB', 'L'):
+        background = Image.new('RGB', variant.size, (255, 255, 255))
+        background.paste(variant, mask=variant.convert('RGBA').split()[-1])
+        variant = background
+    buffer = io.BytesIO()
+    variant.save(buffer, pil_format, **options)
+    return buffer.getvalue(), variant.width, variant.height
+
+
+def generate_variants(field_file, sizes):
+    """
+    Genera y guarda las variantes de una imagen.
+
+    Args:
+        field_file (FieldFile): Imagen original.
+        sizes (dict): {tamaño: lado mayor en píxeles}.
+
+    Returns:
+        dict: {tamaño: {formato: {'name', 'bytes', 'width', 'height'}}}.
+    """
+    storage = field_file.storage
+    stem = os.path.splitext(field_file.name)[0]
+    with field_file.open('rb') as original:
+        image = ImageOps.exif_transpose(Image.open(original))
+        image.load()
+
+    variants = {}
+    for size, max_side in sizes.items():
+        variants[size] = {}
+        for fmt, (_, extension, _) in VARIANT_FORMATS.items():
+            content, width, height = render_variant(image, max_side, fmt)
+            name = storage.save(f'{VARIANTS_DIR}/{stem}_{size}.{extension}', ContentFile(content))
+            variants[size][fmt] = {'name': name, 'bytes': len(content), 'width': width, 'height': height}
+    return variants
+
+
+def variant_names(variants):
+    return {variant['name'] for formats in (variants or {}).values() for variant in formats.values()}
+
+
+def build_image_variants(model_label, pk, field_name):
+    """
+    Genera las variantes de la imagen de un objeto y las guarda en su campo de variantes.
+
+    Se ejecuta en segundo plano (backend.tasks.run_in_background) después de
+    subir la imagen. Si la imagen cambió mientras se generaban las variantes,
+    estas se descartan; la nueva subida programa su propia generación. Las
+    variantes de la imagen anterior se borran.
+
+    Args:
+        model_label (str): Modelo en formato 'app.Modelo'.
+        pk (int): Clave primaria del objeto.
+        field_name (str): Campo de imagen.
+    """
+    variants_field, sizes = VARIANT_SPECS[(model_label, field_name)]
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).only('pk', field_name, variants_field).first()
+    if instance is None:
+        return
+    field_file = getattr(instance, field_name)
+    # La imagen por defecto la comparten todos los usuarios; no se copia por cada uno.
+    if not field_file or field_file.name == model._meta.get_field(field_name).default:
+        return
+    previous = variant_names(getattr(instance, variants_field))
+
+    try:
+        variants = generate_variants(field_file, sizes)
+    except (OSError, ValueError):
+        logger.exception('No se pudieron generar las variantes de %s %s.%s', model_label, pk, field_name)
+        return
+
+    updated = model.objects.filter(pk=pk, **{field_name: field_file.name}).update(
+        **{variants_field: variants}, **version_bump()
+    )
+    stale = variant_names(variants) if not updated else previous - variant_names(variants)
+    for name in stale:
+        field_file.storage.delete(name)
+
+
+def reset_variants(instance, field_name):
+    """
+    Vacía las variantes de una imagen que se va a reemplazar.
+
+    Se llama antes de guardar la imagen nueva para no servir variantes de la
+    anterior; sus ficheros se borran cuando se confirma la transacción.
+
+    Args:
+        instance: Objeto del modelo (sin guardar todavía).
+        field_name (str): Campo de imagen.
+    """
+    variants_field, _ = VARIANT_SPECS[(instance._meta.label, field_name)]
+    names = variant_names(getattr(instance, variants_field))
+    setattr(instance, variants_field, {})
+    if names:
+        storage = getattr(instance, field_name).storage
+        transaction.on_commit(lambda: [storage.delete(name) for name in names])
+
+
+def schedule_variants(instance, field_name):
+    """
+    Programa en segundo plano la generación de las variantes de una imagen.
+
+    Args:
+        instance: Objeto del modelo ya guardado.
+        field_name (str): Campo de imagen.
+    """
+    if getattr(instance, field_name):
+        run_in_background(build_image_variants, instance._meta.label, instance.pk, field_name)
+
+
+class VariantImageField(serializers.ImageField):
+    """
+    Campo de imagen que puede devolver la URL de una variante en vez del original.
+
+    Lee las variantes del campo variants_field del mismo objeto y elige la
+    que corresponde con select_variant(): la más liviana si el cliente pidió
+    ahorro de datos, la del tamaño size si se indica, o el original.
+
+    Al escribir, la imagen subida se decodifica, valida y limpia de metadatos
+    EXIF en el pool de procesos (backend.uploads), no en el hilo de la solicitud.
+
+    Atributos:
+        variants_field (str): Campo del modelo con las variantes.
+        size (str): Tamaño preferido (None sirve el original sin ahorro de datos).
+        absolute (bool): Devuelve URLs absolutas cuando hay solicitud en el contexto.
+    """
+
+    def __init__(self, *args, variants_field, size=None, absolute=True, **kwargs):
+        self.variants_field = variants_field
+        self.size = size
+        self.absolute = absolute
+        super().__init__(*args, **kwargs)
+
+    def to_internal_value(self, data):
+        data = serializers.FileField.to_internal_value(self, data)
+        return process_uploaded_image(data)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        request = self.context.get('request')
+        name = select_variant(getattr(value.instance, self.variants_field, None), request, self.size)
+        url = value.storage.url(name) if name else value.url
+        if self.absolute and request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Campo de solo lectura con las URLs de todas las variantes de una imagen.
+
+    Devuelve {tamaño: {formato: {'url', 'bytes', 'width', 'height'}}}.
+    """
+
+    def to_representation(self, value):
+        return {
+            size: {
+                fmt: {
+                    'url': default_storage.url(variant['name']),
+                    'bytes': variant['bytes'],
+                    'width': variant['width'],
+                    'height': variant['height'],
+                }
+                for fmt, variant in formats.items()
+            }
+            for size, formats in (value or {}).items()
+        }
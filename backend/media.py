@@ -0,0 +1,229 @@
+import hashlib
+import mimetypes
+import os
+import re
+import stat
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotAllowed
+from django.urls import re_path
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+# Nombres con hash de contenido: nombre.<hash>.ext (o nombre.<hash>_<sufijo>.ext si
+# Django tuvo que evitar un choque de nombres al guardar).
+HASH_LENGTH = 16
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{%d}(?:_[A-Za-z0-9]{7})?\.[^./]+$' % HASH_LENGTH)
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# Tamaño de bloque cuando el servidor no ofrece wsgi.file_wrapper (runserver):
+# el fichero se lee en Python y conviene hacer pocas lecturas grandes.
+FALLBACK_BLOCK_SIZE = 256 * 1024
+
+
+class HashedMediaStorage(FileSystemStorage):
+    """
+    Almacenamiento de ficheros subidos que agrega al nombre un hash de su contenido.
+
+    foto.png se guarda como foto.<hash>.png. Como un mismo nombre nunca
+    apunta a otro contenido, serve_media() puede servirlo con caché inmutable.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        root, ext = os.path.splitext(name)
+        name = f'{root}.{digest.hexdigest()[:HASH_LENGTH]}{ext}'
+        return super().save(name, content, max_length=max_length)
+
+
+def is_hashed_name(path):
+    return HASHED_NAME_RE.search(path) is not None
+
+
+class FileRange:
+    """
+    Vista de solo lectura sobre un tramo de un fichero abierto.
+
+    Expone fileno() y deja el descriptor en la posición inicial del tramo,
+    así los servidores WSGI con wsgi.file_wrapper (gunicorn) lo envían con
+    os.sendfile limitado por Content-Length; los demás lo leen por bloques.
+
+    Atributos:
+        remaining (int): Bytes del tramo que faltan por leer.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Interpreta una cabecera Range de un solo tramo.
+
+    Args:
+        header (str): Valor de la cabecera Range.
+        size (int): Tamaño del fichero en bytes.
+
+    Returns:
+        tuple: (inicio, fin inclusivo); None si se debe servir el fichero
+            completo (cabecera ausente, mal formada o con varios tramos).
+
+    Raises:
+        ValueError: Si el tramo no se puede satisfacer (respuesta 416).
+    """
+    match = RANGE_RE.match(header.replace(' ', '')) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        # Un fichero vacío no tiene ningún byte que servir: bytes 0--1/0 no es válido.
+        if length == 0 or size == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def offload_response(path, full_path, content_type):
+    """
+    Devuelve una respuesta vacía para que el servidor web envíe el fichero.
+
+    Con MEDIA_SENDFILE = 'x-sendfile' (Apache mod_xsendfile, lighttpd) se
+    indica la ruta absoluta; con 'x-accel-redirect' (nginx) la ubicación
+    interna MEDIA_ACCEL_REDIRECT_PREFIX + ruta. El servidor web atiende
+    Range por su cuenta.
+    """
+    response = HttpResponse(content_type=content_type)
+    if settings.MEDIA_SENDFILE == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + path
+    else:
+        response['X-Sendfile'] = full_path
+    return response
+
+
+def serve_media(request, path):
+    """
+    Sirve un fichero de MEDIA_ROOT con caché, GET condicional y Range.
+
+    Métodos HTTP admitidos:
+        - GET, HEAD
+
+    Los nombres con hash de contenido (HashedMediaStorage) se sirven con
+    Cache-Control inmutable de un año; el resto (imágenes por defecto y
+    subidas anteriores) con MEDIA_CACHE_MAX_AGE y revalidación por ETag.
+    Si MEDIA_SENDFILE está configurado, el envío se delega al servidor web.
+    Si no, se usa FileResponse sobre el fichero abierto: los servidores WSGI
+    con wsgi.file_wrapper (gunicorn, uWSGI) lo envían con os.sendfile; los
+    que no lo tienen (runserver) lo leen en bloques de FALLBACK_BLOCK_SIZE.
+
+    Args:
+        request: Objeto de solicitud.
+        path (str): Ruta del fichero relativa a MEDIA_ROOT.
+
+    Returns:
+        HttpResponse: 200, 206, 304 o 416 con el fichero o sus cabeceras.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        st = os.stat(full_path)
+    except (SuspiciousFileOperation, OSError, ValueError):
+        raise Http404('El fichero no existe.')
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404('El fichero no existe.')
+
+    etag = quote_etag(f'{st.st_mtime_ns:x}-{st.st_size:x}')
+    if is_hashed_name(path):
+        cache_control = f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    else:
+        cache_control = f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+
+    def with_headers(response):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(st.st_mtime)
+        response['Cache-Control'] = cache_control
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=int(st.st_mtime))
+    if not_modified is not None:
+        return with_headers(not_modified)
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    content_type = content_type or 'application/octet-stream'
+    if settings.MEDIA_SENDFILE:
+        return with_headers(offload_response(path, full_path, content_type))
+
+    # If-Range: el tramo solo vale si el cliente tiene la versión actual.
+    if_range = request.META.get('HTTP_IF_RANGE')
+    header = request.META.get('HTTP_RANGE') if if_range in (None, etag) else None
+    try:
+        byte_range = parse_range(header, st.st_size)
+    except ValueError:
+        response = with_headers(HttpResponse(status=416, content_type=content_type))
+        response['Content-Range'] = f'bytes */{st.st_size}'
+        return response
+
+    start, end = byte_range or (0, st.st_size - 1)
+    length = max(end - start + 1, 0)
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+    else:
+        response = FileResponse(FileRange(open(full_path, 'rb'), start, length), content_type=content_type)
+        if 'wsgi.file_wrapper' not in request.META:
+            response.block_size = FALLBACK_BLOCK_SIZE
+    if byte_range is not None:
+        response.status_code = 206
+        response['Content-Range'] = f'bytes {start}-{end}/{st.st_size}'
+    response['Content-Length'] = length
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return with_headers(response)
+
+
+def media_urlpatterns():
+    """
+    Devuelve la ruta de MEDIA_URL hacia serve_media, si corresponde servirla.
+
+    Solo se sirve desde Django con MEDIA_SERVE (por defecto, en DEBUG) o con
+    MEDIA_SENDFILE, en cuyo caso Django solo arma las cabeceras y el
+    servidor web envía el fichero. En producción sin ninguno de los dos,
+    MEDIA_ROOT lo debe servir el servidor web directamente.
+
+    Returns:
+        list: Patrones de URL (vacía si no se sirven los ficheros subidos).
+    """
+    if not (settings.MEDIA_SERVE or settings.MEDIA_SENDFILE):
+        return []
+    return [re_path(r'^%s(?P<path>.*)$' % re.escape(settings.MEDIA_URL.lstrip('/')), serve_media, name='media')]
@@ -1,13 +1,209 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
 class CustomPagination(PageNumberPagination):
+    """
+    Paginación del proyecto con dos modos y la misma envoltura {'data', 'meta'}.
+
+    - Modo por página (por defecto): ?page=N, con LIMIT/OFFSET.
+    - Modo cursor (keyset): se activa enviando ?cursor= (vacío en la primera
+      página). Filtra por (created_at, id) a partir del último elemento de la
+      página anterior, así que la página 500 cuesta lo mismo que la primera.
+      meta.next contiene el cursor de la siguiente página.
+
+    El total (meta.count) se calcula por defecto en modo página y se omite en
+    modo cursor; ?count=true / ?count=false cambia ese comportamiento.
+
+    Atributos:
+        cursor_ordering (tuple): Campos del orden keyset; '-' indica orden descendente.
+        cursor_by_default (bool): Usa el modo cursor si la solicitud no envía ?page=.
+    """
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 10
     page_query_param = 'page'
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    cursor_ordering = ('-created_at', '-id')
+    cursor_by_default = False
+    invalid_cursor_message = 'Cursor inválido'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Pagina el queryset en modo página o en modo cursor según la solicitud.
+
+        Args:
+            queryset: QuerySet a paginar.
+            request: Objeto de solicitud.
+            view: Vista que pagina (opcional).
+
+        Returns:
+            list: Objetos de la página actual.
+        """
+        self.request = request
+        self.cursor_mode = self.cursor_query_param in request.query_params or (
+            self.cursor_by_default and self.page_query_param not in request.query_params
+        )
+        self.with_count = self.get_with_count(request)
+        self.count = None
+
+        if self.cursor_mode:
+            return self.paginate_cursor(queryset, request)
+        if not self.with_count:
+            return self.paginate_without_count(queryset, request)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_with_count(self, request):
+        """
+        Indica si se debe calcular el total de elementos.
+
+        Args:
+            request: Objeto de solicitud.
+
+        Returns:
+            bool: True si se debe incluir meta.count.
+        """
+        value = request.query_params.get(self.count_query_param)
+        if value is None:
+            return not self.cursor_mode
+        return value.lower() not in ('0', 'false', 'no')
+
+    def paginate_without_count(self, queryset, request):
+        """
+        Pagina por número de página sin ejecutar COUNT(*).
+
+        Se pide un elemento de más para saber si existe una página siguiente.
+
+        Args:
+            queryset: QuerySet a paginar.
+            request: Objeto de solicitud.
+
+        Returns:
+            list: Objetos de la página actual.
+        """
+        self.page = None
+        try:
+            number = max(int(request.query_params.get(self.page_query_param, 1)), 1)
+        except ValueError:
+            raise NotFound(self.invalid_page_message)
+        page_size = self.get_page_size(request)
+        offset = (number - 1) * page_size
+        items = list(queryset[offset:offset + page_size + 1])
+
+        self.next_value = number + 1 if len(items) > page_size else None
+        self.previous_value = number - 1 if number > 1 else None
+        return items[:page_size]
+
+    def paginate_cursor(self, queryset, request):
+        """
+        Pagina por keyset a partir del cursor recibido.
+
+        Args:
+            queryset: QuerySet a paginar.
+            request: Objeto de solicitud.
+
+        Returns:
+            list: Objetos de la página actual.
+        """
+        self.page = None
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.cursor_ordering)
+
+        if self.with_count:
+            self.count = queryset.count()
+        raw_cursor = request.query_params.get(self.cursor_query_param)
+        if raw_cursor:
+            queryset = queryset.filter(self.keyset_filter(queryset.model, self.decode_cursor(raw_cursor)))
+
+        items = list(queryset[:page_size + 1])
+        has_next = len(items) > page_size
+        items = items[:page_size]
+
+        self.next_value = self.encode_cursor(items[-1]) if has_next else None
+        self.previous_value = None
+        return items
+
+    def keyset_filter(self, model, values):
+        """
+        Construye el filtro keyset para los elementos posteriores al cursor.
+
+        Además de la expansión (a < x) OR (a = x AND b < y) se añade a <= x
+        para que la base de datos pueda buscar por rango en el índice.
+
+        Args:
+            model: Modelo del queryset.
+            values (list): Valores del cursor, en el orden de cursor_ordering.
+
+        Returns:
+            Q: Filtro keyset.
+        """
+        fields = [(field.lstrip('-'), 'lt' if field.startswith('-') else 'gt') for field in self.cursor_ordering]
+        try:
+            values = [model._meta.get_field(name).to_python(value) for (name, _), value in zip(fields, values)]
+        except (ValidationError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        expanded = Q()
+        for i, (name, lookup) in enumerate(fields):
+            condition = Q(**{f'{name}__{lookup}': values[i]})
+            for (previous_name, _), previous_value in zip(fields[:i], values):
+                condition &= Q(**{previous_name: previous_value})
+            expanded |= condition
+
+        first_name, first_lookup = fields[0]
+        bound = 'lte' if first_lookup == 'lt' else 'gte'
+        return Q(**{f'{first_name}__{bound}': values[0]}) & expanded
+
+    def encode_cursor(self, obj):
+        """
+        Codifica la posición de un objeto como cursor opaco.
+
+        Args:
+            obj: Último objeto de la página.
+
+        Returns:
+            str: Cursor en base64 url-safe.
+        """
+        values = []
+        for field in self.cursor_ordering:
+            value = getattr(obj, field.lstrip('-'))
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(self, raw_cursor):
+        """
+        Decodifica un cursor recibido del cliente.
+
+        Args:
+            raw_cursor (str): Cursor en base64 url-safe.
+
+        Returns:
+            list: Valores del cursor.
+        """
+        try:
+            values = json.loads(base64.urlsafe_b64decode(raw_cursor.encode()))
+        except (ValueError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.cursor_ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
 
     def get_paginated_response(self, data):
+        if self.page is None:
+            return Response({
+                'data': data,
+                'meta': {
+                    'next': self.next_value,
+                    'previous': self.previous_value,
+                    'count': self.count,
+                    }
+            })
         return Response({
             'data': data,
             'meta': {
@@ -16,3 +212,65 @@ class CustomPagination(PageNumberPagination):
                 'count': self.page.paginator.count,
                 }
         })
+
+class ProfilePagination(CustomPagination):
+    """
+    Paginación de las pestañas del perfil (publicaciones, "me gusta", compartidos,
+    seguidores y seguidos).
+
+    Usa el modo cursor por defecto para que cargar un perfil dependa del
+    tamaño de página y no de la antigüedad de la cuenta.
+    """
+    cursor_by_default = True
+
+class FeedPagination(CustomPagination):
+    """
+    Paginación del feed de publicaciones y del timeline de inicio.
+
+    Usa el modo cursor por defecto y sin total: el feed continúa con las
+    publicaciones archivadas, y contar en cada solicitud recorrería también
+    esa tabla; el timeline se lee con un único recorrido por rango del
+    índice (user, -created_at, -id), sin COUNT(*) ni OFFSET. ?page= sigue
+    disponible y calcula el total como en CustomPagination.
+    """
+    cursor_by_default = True
+
+class CommentPagination(CustomPagination):
+    """
+    Paginación de los comentarios de una publicación.
+
+    Usa el modo cursor por defecto: la primera página trae los comentarios
+    más recientes y meta.next carga los más antiguos, así los hilos largos
+    se abren sin recorrerlos completos.
+    """
+    cursor_by_default = True
+
+class SearchPagination(CustomPagination):
+    """
+    Paginación de los resultados de búsqueda, ordenados por relevancia.
+
+    Solo admite el modo por página: el orden por relevancia no tiene un
+    keyset estable. El total se omite salvo que se pida con ?count=true,
+    porque contarlo obliga a recorrer todas las coincidencias.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Pagina los resultados por número de página, con o sin el total.
+
+        Args:
+            queryset: Resultados a paginar (QuerySet u objeto que admita cortes).
+            request: Objeto de solicitud; ?count=true pide el total.
+            view: Vista que pagina (opcional).
+
+        Returns:
+            list: Objetos de la página actual.
+        """
+        self.request = request
+        self.cursor_mode = False
+        self.count = None
+        value = request.query_params.get(self.count_query_param, 'false')
+        self.with_count = value.lower() not in ('0', 'false', 'no')
+        if not self.with_count:
+            return self.paginate_without_count(queryset, request)
+        return PageNumberPagination.paginate_queryset(self, queryset, request, view)
@@ -169,6 +169,22 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'dist/static')
 ]
 
+# Los ficheros subidos llevan un hash de su contenido en el nombre y se sirven
+# con backend.media.serve_media: caché inmutable para los nombres con hash y
+# MEDIA_CACHE_MAX_AGE segundos para el resto. MEDIA_SENDFILE delega el envío al
+# servidor web: None (lo envía Django), 'x-sendfile' o 'x-accel-redirect'
+# (nginx, con una location interna en MEDIA_ACCEL_REDIRECT_PREFIX). La ruta de
+# MEDIA_URL solo existe con MEDIA_SERVE (por defecto en DEBUG) o con
+# MEDIA_SENDFILE; si no, MEDIA_ROOT lo sirve el servidor web.
+STORAGES = {
+    'default': {'BACKEND': 'backend.media.HashedMediaStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+MEDIA_CACHE_MAX_AGE = 60 * 60
+MEDIA_SERVE = DEBUG
+MEDIA_SENDFILE = None
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -214,6 +230,81 @@ SIMPLE_JWT = {
     # 'SLIDING_TOKEN_REFRESH_LIFETIME' : timedelta(minutes=1),
 }
 
+# Tareas en segundo plano (backend/tasks.py)
+BACKGROUND_TASKS_WORKERS = 4
+BACKGROUND_TASKS_ASYNC = True
+
+# Subidas de imágenes (backend/uploads.py): límites que se comprueban mientras
+# llega el cuerpo y pool de procesos que decodifica, valida y quita el EXIF.
+# Como mucho IMAGE_PROCESS_WORKERS + IMAGE_PROCESS_QUEUE imágenes en proceso o
+# en espera; las demás esperan IMAGE_PROCESS_WAIT segundos y reciben un 503.
+MAX_UPLOAD_REQUEST_SIZE = 25 * 1024 * 1024
+MAX_IMAGE_UPLOAD_SIZE = 10 * 1024 * 1024
+MAX_IMAGE_PIXELS = 40 * 1000 * 1000
+MAX_IMAGE_SIDE = 10000
+IMAGE_PROCESS_WORKERS = 2
+IMAGE_PROCESS_QUEUE = 4
+IMAGE_PROCESS_WAIT = 2
+IMAGE_PROCESS_TIMEOUT = 30
+IMAGE_PROCESS_ASYNC = True
+
+# Timeline de inicio: las cuentas con más seguidores que este umbral no se
+# reparten al escribir, sus publicaciones se traen al leer el timeline.
+TIMELINE_FANOUT_THRESHOLD = 10000
+TIMELINE_PULL_LIMIT = 200
+
+# Reacciones con escritura diferida (blog/buffer.py): los "me gusta" y
+# compartidos se aceptan en memoria y se escriben por lotes cada intervalo.
+# Cada proceso usa su propio diario, reactions.<pid>.journal; los que dejan los
+# procesos terminados se reaplican con "manage.py recover_reactions".
+REACTION_WRITE_BEHIND = False
+REACTION_BUFFER_INTERVAL = 1.0
+REACTION_BUFFER_JOURNAL = os.path.join(BASE_DIR, 'reactions.journal')
+REACTION_BUFFER_FSYNC = True
+
+# Tendencias de etiquetas: ventana deslizante de TRENDING_WINDOW segundos en
+# bloques de TRENDING_BUCKET_SIZE, con vida media TRENDING_HALF_LIFE. Cada
+# proceso lee los usos nuevos como mucho cada TRENDING_REFRESH_INTERVAL segundos.
+TRENDING_WINDOW = 24 * 60 * 60
+TRENDING_HALF_LIFE = 6 * 60 * 60
+TRENDING_BUCKET_SIZE = 5 * 60
+TRENDING_SIZE = 10
+TRENDING_REFRESH_INTERVAL = 5
+# Cada lectura vuelve a leer los últimos TRENDING_REFRESH_OVERLAP segundos
+# (filas de transacciones que confirmaron tarde) y cada
+# TRENDING_RECONCILE_INTERVAL segundos se restan los usos de filas borradas.
+TRENDING_REFRESH_OVERLAP = 60
+TRENDING_RECONCILE_INTERVAL = 600
+
+# Archivo de publicaciones (blog/archive.py): el comando archive_posts mueve a
+# las tablas frías las publicaciones con más de ARCHIVE_AFTER_DAYS días, en
+# transacciones de ARCHIVE_BATCH_SIZE publicaciones.
+ARCHIVE_AFTER_DAYS = 180
+ARCHIVE_BATCH_SIZE = 500
+
+# Búsqueda de usuarios (users/search.py): como mucho USER_SEARCH_LIMIT
+# resultados; las búsquedas de hasta USER_SEARCH_CACHE_MAX_LENGTH caracteres se
+# guardan USER_SEARCH_CACHE_TTL segundos en una caché LRU por proceso.
+USER_SEARCH_LIMIT = 10
+USER_SEARCH_CACHE_SIZE = 1024
+USER_SEARCH_CACHE_TTL = 60
+USER_SEARCH_CACHE_MAX_LENGTH = 3
+
+# Sugerencias de a quién seguir (users/recommendations.py): RECO_SIZE por
+# usuario; las cuentas con más de RECO_MAX_DEGREE seguidores no cuentan para
+# el co-seguimiento.
+RECO_SIZE = 20
+RECO_MAX_DEGREE = 1000
+
+# Índice en memoria del grafo de seguimientos (users/graph.py): se reconstruye en
+# segundo plano al tener más de FOLLOW_GRAPH_MAX_AGE segundos o FOLLOW_GRAPH_MAX_DELTA cambios.
+FOLLOW_GRAPH_MAX_AGE = 300
+FOLLOW_GRAPH_MAX_DELTA = 10000
+
+# Caché LRU en memoria de fragmentos serializados de publicaciones
+# (blog/fragments.py): cantidad máxima de fragmentos por proceso; 0 la desactiva.
+POST_FRAGMENT_CACHE_SIZE = 10000
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_executor():
+    """
+    Devuelve el pool de hilos compartido para tareas en segundo plano.
+
+    Returns:
+        ThreadPoolExecutor: Pool creado de forma perezosa con BACKGROUND_TASKS_WORKERS hilos.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'BACKGROUND_TASKS_WORKERS', 4),
+            thread_name_prefix='background-task',
+        )
+    return _executor
+
+
+def _run(func, args, kwargs):
+    """
+    Ejecuta la tarea y cierra la conexión a la base de datos del hilo.
+    """
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception('Error en la tarea en segundo plano %s', getattr(func, '__name__', func))
+    finally:
+        connection.close()
+
+
+def run_in_background(func, *args, **kwargs):
+    """
+    Programa una tarea para después del commit de la transacción actual.
+
+    Si BACKGROUND_TASKS_ASYNC es False la tarea se ejecuta en el mismo hilo
+    (útil en pruebas y en despliegues sin hilos extra).
+
+    Args:
+        func: Función a ejecutar.
+        *args: Argumentos posicionales de la función.
+        **kwargs: Argumentos con nombre de la función.
+    """
+    if getattr(settings, 'BACKGROUND_TASKS_ASYNC', True):
+        transaction.on_commit(lambda: get_executor().submit(_run, func, args, kwargs))
+    else:
+        transaction.on_commit(lambda: func(*args, **kwargs))
@@ -0,0 +1,150 @@
+import os
+import tempfile
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404
+from django.test import RequestFactory, TestCase, override_settings
+from backend.media import FALLBACK_BLOCK_SIZE, media_urlpatterns, parse_range, serve_media
+
+class MediaServingTests(TestCase):
+    """
+    Pruebas para el servicio de ficheros subidos (backend.media).
+
+    Métodos:
+        test_hashed_name_is_immutable(): Verifica el nombre con hash y la caché inmutable.
+        test_unhashed_name_revalidates(): Verifica la caché corta de los nombres sin hash.
+        test_if_none_match(): Verifica que If-None-Match responde 304.
+        test_range(): Verifica las respuestas parciales y los tramos no satisfacibles.
+        test_range_on_empty_file(): Verifica que ningún tramo de un fichero vacío se puede satisfacer.
+        test_offload(): Verifica la delegación del envío al servidor web.
+        test_path_traversal(): Verifica que no se sirven ficheros fuera de MEDIA_ROOT.
+        test_fallback_block_size(): Verifica el bloque grande sin wsgi.file_wrapper.
+        test_route_is_opt_in(): Verifica que la ruta solo existe con MEDIA_SERVE o MEDIA_SENDFILE.
+    """
+
+    def setUp(self):
+        """
+        Usa un MEDIA_ROOT temporal con un fichero subido.
+        """
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.name = default_storage.save('docs/numeros.txt', ContentFile(b'0123456789'))
+
+    def get(self, name, **headers):
+        response = serve_media(RequestFactory().get(f'/media/{name}', **headers), name)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        response.close()
+        return response, body
+
+    def test_hashed_name_is_immutable(self):
+        """
+        Verifica el nombre con hash y la caché inmutable.
+        """
+        self.assertRegex(self.name, r'^docs/numeros\.[0-9a-f]{16}\.txt$')
+        response, body = self.get(self.name)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, b'0123456789')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_unhashed_name_revalidates(self):
+        """
+        Verifica la caché corta de los nombres sin hash.
+        """
+        with open(os.path.join(default_storage.location, 'suelto.txt'), 'wb') as fp:
+            fp.write(b'hola')
+        response, body = self.get('suelto.txt')
+        self.assertEqual(body, b'hola')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=3600')
+
+    def test_if_none_match(self):
+        """
+        Verifica que If-None-Match responde 304.
+        """
+        response, _ = self.get(self.name)
+        response, body = self.get(self.name, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(body, b'')
+
+    def test_range(self):
+        """
+        Verifica las respuestas parciales y los tramos no satisfacibles.
+        """
+        response, body = self.get(self.name, HTTP_RANGE='bytes=2-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, b'2345')
+        self.assertEqual(response['Content-Range'], 'bytes 2-5/10')
+
+        response, body = self.get(self.name, HTTP_RANGE='bytes=-3')
+        self.assertEqual(body, b'789')
+
+        response, _ = self.get(self.name, HTTP_RANGE='bytes=20-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+        response, body = self.get(self.name, HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE='"viejo"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, b'0123456789')
+
+    def test_range_on_empty_file(self):
+        """
+        Verifica que ningún tramo de un fichero vacío se puede satisfacer.
+        """
+        for header in ('bytes=-5', 'bytes=0-', 'bytes=0-0'):
+            with self.assertRaises(ValueError):
+                parse_range(header, 0)
+        name = default_storage.save('docs/vacio.txt', ContentFile(b''))
+        response, _ = self.get(name, HTTP_RANGE='bytes=-5')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */0')
+        response, body = self.get(name)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, b'')
+
+    @override_settings(MEDIA_SENDFILE='x-accel-redirect')
+    def test_offload(self):
+        """
+        Verifica la delegación del envío al servidor web.
+        """
+        response, body = self.get(self.name)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{self.name}')
+        self.assertEqual(body, b'')
+        with override_settings(MEDIA_SENDFILE='x-sendfile'):
+            response, _ = self.get(self.name)
+        self.assertEqual(response['X-Sendfile'], default_storage.path(self.name))
+
+    def test_path_traversal(self):
+        """
+        Verifica que no se sirven ficheros fuera de MEDIA_ROOT.
+        """
+        with self.assertRaises(Http404):
+            self.get('../settings.py')
+
+    def test_fallback_block_size(self):
+        """
+        Verifica que sin wsgi.file_wrapper el fichero se lee en bloques grandes.
+        """
+        request = RequestFactory().get(f'/media/{self.name}')
+        response = serve_media(request, self.name)
+        self.assertEqual(response.block_size, FALLBACK_BLOCK_SIZE)
+        response.close()
+
+        request = RequestFactory().get(f'/media/{self.name}', **{'wsgi.file_wrapper': object})
+        response = serve_media(request, self.name)
+        self.assertEqual(response.block_size, FileResponse.block_size)
+        response.close()
+
+    def test_route_is_opt_in(self):
+        """
+        Verifica que la ruta de MEDIA_URL solo existe con MEDIA_SERVE o MEDIA_SENDFILE.
+        """
+        with override_settings(MEDIA_SERVE=False, MEDIA_SENDFILE=None):
+            self.assertEqual(media_urlpatterns(), [])
+        with override_settings(MEDIA_SERVE=False, MEDIA_SENDFILE='x-sendfile'):
+            self.assertEqual(len(media_urlpatterns()), 1)
+        with override_settings(MEDIA_SERVE=True, MEDIA_SENDFILE=None):
+            self.assertEqual(media_urlpatterns()[0].name, 'media')
@@ -0,0 +1,278 @@
+import io
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, TemporaryFileUploadHandler
+from PIL import Image, ImageOps
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+# Formatos de imagen aceptados y opciones para volver a codificarlos sin metadatos.
+IMAGE_FORMATS = {
+    'JPEG': {'quality': 90},
+    'PNG': {},
+    'GIF': {},
+    'WEBP': {'quality': 90},
+}
+# Bytes del inicio del fichero que se guardan para leer la cabecera de la imagen.
+HEADER_SNIFF_SIZE = 256 * 1024
+ORIENTATION_TAG = 0x0112
+
+_pool = None
+_slots = None
+_pool_lock = threading.Lock()
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'El archivo es demasiado grande.'
+    default_code = 'upload_too_large'
+
+
+class ImageProcessingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'El servidor está procesando demasiadas imágenes, inténtalo de nuevo en unos segundos.'
+    default_code = 'image_processing_busy'
+    wait = 1
+
+
+class InvalidImage(ValueError):
+    """
+    Imagen rechazada por formato, tamaño o dimensiones. Se lanza también en los
+    procesos del pool, por eso solo guarda el mensaje.
+    """
+
+
+def check_dimensions(width, height, max_pixels, max_side):
+    """
+    Rechaza imágenes con demasiados píxeles o con un lado demasiado grande.
+
+    Raises:
+        InvalidImage: Si la imagen supera alguno de los límites.
+    """
+    if width > max_side or height > max_side or width * height > max_pixels:
+        raise InvalidImage(f'La imagen es demasiado grande ({width}x{height} píxeles).')
+
+
+def image_limits():
+    return settings.MAX_IMAGE_PIXELS, settings.MAX_IMAGE_SIDE
+
+
+def sanitize_image(source, max_pixels, max_side):
+    """
+    Decodifica, valida y vuelve a codificar una imagen sin sus metadatos EXIF.
+
+    Se ejecuta en un proceso del pool de imágenes, así que solo recibe y
+    devuelve valores simples. La orientación EXIF se aplica a los píxeles
+    antes de descartar los metadatos. Los JPEG que no hace falta girar se
+    guardan con sus tablas de cuantización originales para no perder calidad.
+
+    Args:
+        source (str | bytes): Ruta del fichero temporal o contenido de la imagen.
+        max_pixels (int): Cantidad máxima de píxeles.
+        max_side (int): Lado mayor máximo en píxeles.
+
+    Returns:
+        tuple: (bytes de la imagen limpia, formato de Pillow, ancho, alto).
+
+    Raises:
+        InvalidImage: Si no es una imagen válida o supera los límites.
+    """
+    def open_source():
+        return open(source, 'rb') if isinstance(source, str) else io.BytesIO(source)
+
+    try:
+        with open_source() as fp:
+            image = Image.open(fp)
+            if image.format not in IMAGE_FORMATS:
+                raise InvalidImage('Formato de imagen no admitido.')
+            check_dimensions(image.width, image.height, max_pixels, max_side)
+            image.verify()
+
+        with open_source() as fp:
+            image = Image.open(fp)
+            image_format = image.format
+            options = dict(IMAGE_FORMATS[image_format])
+            if image.info.get('icc_profile'):
+                options['icc_profile'] = image.info['icc_profile']
+            if getattr(image, 'is_animated', False):
+                options['save_all'] = True
+            elif image.getexif().get(ORIENTATION_TAG, 1) != 1:
+                image = ImageOps.exif_transpose(image)
+            elif image_format == 'JPEG':
+                options.update(quality='keep', subsampling='keep')
+            image.load()
+            buffer = io.BytesIO()
+            image.save(buffer, image_format, **options)
+    except InvalidImage:
+        raise
+    except (OSError, SyntaxError, ValueError, EOFError, Image.DecompressionBombError):
+        raise InvalidImage('Sube una imagen válida. El archivo no es una imagen o está dañado.')
+    return buffer.getvalue(), image_format, image.width, image.height
+
+
+def get_image_pool():
+    """
+    Devuelve el pool de procesos para decodificar imágenes y su límite de tareas.
+
+    El límite (IMAGE_PROCESS_WORKERS + IMAGE_PROCESS_QUEUE) acota las imágenes
+    en proceso o en espera; si está lleno las nuevas subidas esperan como
+    mucho IMAGE_PROCESS_WAIT segundos antes de rechazarse.
+
+    Returns:
+        tuple: (ProcessPoolExecutor, BoundedSemaphore).
+    """
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is None:
+            workers = getattr(settings, 'IMAGE_PROCESS_WORKERS', 2)
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _slots = threading.BoundedSemaphore(workers + getattr(settings, 'IMAGE_PROCESS_QUEUE', 4))
+        return _pool, _slots
+
+
+def reset_image_pool():
+    """
+    Descarta el pool de procesos (por ejemplo, si un proceso murió).
+    """
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = _slots = None
+
+
+def run_sanitize(source):
+    """
+    Ejecuta sanitize_image() en el pool de procesos con control de carga.
+
+    Si IMAGE_PROCESS_ASYNC es False se ejecuta en el mismo proceso.
+
+    Raises:
+        ImageProcessingBusy: Si el pool está saturado o no responde a tiempo.
+        InvalidImage: Si la imagen no es válida.
+    """
+    max_pixels, max_side = image_limits()
+    if not getattr(settings, 'IMAGE_PROCESS_ASYNC', True):
+        return sanitize_image(source, max_pixels, max_side)
+
+    pool, slots = get_image_pool()
+    if not slots.acquire(timeout=getattr(settings, 'IMAGE_PROCESS_WAIT', 2)):
+        raise ImageProcessingBusy()
+    try:
+        future = pool.submit(sanitize_image, source, max_pixels, max_side)
+    except BrokenProcessPool:
+        slots.release()
+        reset_image_pool()
+        raise ImageProcessingBusy()
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        return future.result(timeout=getattr(settings, 'IMAGE_PROCESS_TIMEOUT', 30))
+    except TimeoutError:
+        raise ImageProcessingBusy()
+    except BrokenProcessPool:
+        reset_image_pool()
+        raise ImageProcessingBusy()
+
+
+def process_uploaded_image(uploaded):
+    """
+    Valida una imagen subida y devuelve una copia sin metadatos.
+
+    Los ficheros que el manejador de subidas dejó en disco se pasan al pool
+    por su ruta, sin copiar su contenido entre procesos.
+
+    Args:
+        uploaded (UploadedFile): Imagen subida.
+
+    Returns:
+        SimpleUploadedFile: Imagen limpia con el mismo nombre.
+
+    Raises:
+        ValidationError: Si la imagen no es válida.
+        ImageProcessingBusy: Si el pool está saturado.
+    """
+    if hasattr(uploaded, 'temporary_file_path'):
+        source = uploaded.temporary_file_path()
+    else:
+        uploaded.seek(0)
+        source = uploaded.read()
+    try:
+        content, image_format, _, _ = run_sanitize(source)
+    except InvalidImage as exc:
+        raise ValidationError(str(exc), code='invalid_image')
+    return SimpleUploadedFile(uploaded.name, content, content_type=Image.MIME[image_format])
+
+
+class ImageUploadHandler(FileUploadHandler):
+    """
+    Manejador de subidas que rechaza las imágenes demasiado grandes mientras llegan.
+
+    Rechaza la solicitud completa si su Content-Length supera
+    MAX_UPLOAD_REQUEST_SIZE antes de leer el cuerpo, y cada fichero en
+    cuanto supera MAX_IMAGE_UPLOAD_SIZE o su cabecera declara más píxeles de
+    los permitidos. Los datos pasan sin copiarse al siguiente manejador
+    (TemporaryFileUploadHandler), que los escribe en disco.
+    """
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        if content_length > settings.MAX_UPLOAD_REQUEST_SIZE:
+            raise UploadTooLarge()
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.header = b''
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.MAX_IMAGE_UPLOAD_SIZE:
+            raise UploadTooLarge()
+        if self.header is not None:
+            self.header += raw_data
+            self.sniff_dimensions()
+        return raw_data
+
+    def sniff_dimensions(self):
+        """
+        Lee las dimensiones de la cabecera de la imagen con los bytes recibidos.
+
+        Si todavía no alcanzan, se reintenta con el siguiente bloque hasta
+        HEADER_SNIFF_SIZE bytes; los ficheros que no se reconocen se validan
+        después en el pool de imágenes.
+        """
+        try:
+            with Image.open(io.BytesIO(self.header)) as image:
+                size = image.size
+        except Image.DecompressionBombError:
+            raise ValidationError({self.field_name: ['La imagen es demasiado grande.']})
+        except Exception:
+            if len(self.header) >= HEADER_SNIFF_SIZE:
+                self.header = None
+            return
+        self.header = None
+        try:
+            check_dimensions(*size, *image_limits())
+        except InvalidImage as exc:
+            raise ValidationError({self.field_name: [str(exc)]})
+
+    def file_complete(self, file_size):
+        return None
+
+
+class StreamingUploadMixin:
+    """
+    Mixin para vistas de DRF que reciben imágenes.
+
+    Cambia los manejadores de subida de la solicitud por ImageUploadHandler
+    seguido de TemporaryFileUploadHandler: el cuerpo se lee por bloques, se
+    corta en cuanto supera los límites y los ficheros van a disco en vez de
+    quedarse en memoria.
+    """
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers = [ImageUploadHandler(request), TemporaryFileUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
@@ -15,9 +15,8 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include, re_path
-from django.conf import settings
-from django.conf.urls.static import static
+from django.urls import path, include
+from backend.media import media_urlpatterns
 
 urlpatterns = [
     path('admin/', admin.site.urls),    
@@ -25,6 +24,5 @@ urlpatterns = [
     path('blog/', include('blog.urls')),
     path('noti/', include('noti.urls')),
     path('chat/', include('chat.urls')),
-]
-
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    *media_urlpatterns(),
+]
\ No newline at end of file
@@ -0,0 +1,16 @@
+from django.db.models import F
+from django.utils import timezone
+
+
+def version_bump():
+    """
+    Devuelve los campos que marcan una fila como modificada.
+
+    Se pasan a QuerySet.update() o a serializer.save() junto con el cambio
+    real, para que la versión y la fecha de modificación se actualicen en la
+    misma sentencia. Las cachés de fragmentos y los ETag dependen de ellos.
+
+    Returns:
+        dict: {'version': version + 1, 'updated_at': ahora}.
+    """
+    return {'version': F('version') + 1, 'updated_at': timezone.now()}
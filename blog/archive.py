@@ -0,0 +1,144 @@
+from django.db import transaction
+from django.db.models import F
+
+from .models import ArchivedComment, ArchivedPost, ArchivedReaction, Comment, Post
+from noti.models import Noti
+
+# Campos que se copian de Post a ArchivedPost.
+POST_FIELDS = (
+    'id', 'user_id', 'content', 'image', 'image_variants', 'likes_count', 'shareds_count',
+    'comments_count', 'version', 'created_at', 'updated_at',
+)
+REACTION_KINDS = {'like': Post.liked.through, 'shared': Post.shared.through}
+
+
+def archive_batch(post_ids, batch_size=1000):
+    """
+    Mueve al nivel frío un lote de publicaciones con sus comentarios y reacciones.
+
+    Todo ocurre en una transacción: se copian las filas a las tablas
+    archivadas y después se borran las publicaciones del nivel caliente (el
+    borrado en cascada quita sus comentarios, reacciones, entradas de
+    timeline, etiquetas y su fila del índice de búsqueda). Las notificaciones
+    que apuntan a ellas pasan a apuntar a la publicación y al comentario
+    archivados, así siguen mostrándolos.
+
+    Args:
+        post_ids (list): Ids de las publicaciones a archivar.
+        batch_size (int): Tamaño de los INSERT por lotes.
+
+    Returns:
+        int: Cantidad de publicaciones archivadas.
+    """
+    with transaction.atomic():
+        posts = [ArchivedPost(**row) for row in Post.objects.filter(pk__in=post_ids).values(*POST_FIELDS)]
+        ArchivedPost.objects.bulk_create(posts, batch_size=batch_size)
+        comments = Comment.objects.filter(post_id__in=post_ids).values('id', 'user_id', 'post_id', 'body', 'created_at')
+        ArchivedComment.objects.bulk_create((ArchivedComment(**row) for row in comments.iterator()), batch_size=batch_size)
+        for kind, through in REACTION_KINDS.items():
+            rows = through.objects.filter(post_id__in=post_ids).values('post_id', 'user_id', 'created_at')
+            ArchivedReaction.objects.bulk_create(
+                (ArchivedReaction(kind=kind, **row) for row in rows.iterator()),
+                batch_size=batch_size,
+            )
+        Noti.objects.filter(post_id__in=post_ids).update(archived_post_id=F('post_id'), post=None)
+        Noti.objects.filter(comment__post_id__in=post_ids).update(archived_comment_id=F('comment_id'), comment=None)
+        Post.objects.filter(pk__in=post_ids).delete()
+    return len(posts)
+
+
+def archive_posts(cutoff, batch_size=500):
+    """
+    Archiva, por lotes y de la más antigua a la más nueva, las publicaciones anteriores a cutoff.
+
+    Args:
+        cutoff (datetime): Se archivan las publicaciones creadas antes de esta fecha.
+        batch_size (int): Publicaciones por transacción.
+
+    Returns:
+        int: Cantidad total de publicaciones archivadas.
+    """
+    total = 0
+    while True:
+        post_ids = list(
+            Post.objects.filter(created_at__lt=cutoff).order_by('created_at', 'id').values_list('id', flat=True)[:batch_size]
+        )
+        if not post_ids:
+            return total
+        total += archive_batch(post_ids)
+
+
+class TieredResults:
+    """
+    Resultados de publicaciones que continúan en el nivel frío al agotarse el caliente.
+
+    Se comporta como un QuerySet para la paginación (filter, order_by,
+    count y cortes). Todas las publicaciones calientes son más nuevas que
+    las archivadas, así que un corte lee primero el nivel caliente y solo
+    consulta el frío si el caliente no alcanza para completarlo: las
+    primeras páginas nunca tocan las tablas archivadas.
+
+    Con merge=True los niveles no están ordenados entre sí (por ejemplo,
+    reacciones ordenadas por su fecha, que puede ser posterior en una
+    publicación archivada): cada corte lee hasta su final en ambos niveles
+    por sus índices y los mezcla según el orden del queryset.
+
+    Atributos:
+        hot (QuerySet): Filas del nivel caliente.
+        cold (QuerySet): Filas archivadas con los mismos filtros.
+        merge (bool): Mezcla ambos niveles en vez de leerlos uno tras otro.
+    """
+    ordered = True
+
+    def __init__(self, hot, cold, merge=False):
+        self.hot = hot
+        self.cold = cold
+        self.merge = merge
+        self.model = hot.model
+
+    def _apply(self, method, *args, **kwargs):
+        return TieredResults(
+            getattr(self.hot, method)(*args, **kwargs), getattr(self.cold, method)(*args, **kwargs), merge=self.merge
+        )
+
+    def filter(self, *args, **kwargs):
+        return self._apply('filter', *args, **kwargs)
+
+    def order_by(self, *fields):
+        return self._apply('order_by', *fields)
+
+    def only(self, *fields):
+        return self._apply('only', *fields)
+
+    def count(self):
+        return self.hot.count() + self.cold.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            items = self[key:key + 1]
+            if not items:
+                raise IndexError(key)
+            return items[0]
+        start = key.start or 0
+        stop = key.stop
+        if self.merge:
+            return self._merged(start, stop)
+        items = list(self.hot[start:stop])
+        if stop is not None and len(items) == stop - start:
+            return items
+        hot_count = start + len(items) if items or start == 0 else self.hot.count()
+        cold_start = max(start - hot_count, 0)
+        cold_stop = None if stop is None else stop - hot_count
+        return items + list(self.cold[cold_start:cold_stop])
+
+    def _merged(self, start, stop):
+        items = list(self.hot[:stop]) + list(self.cold[:stop])
+        # Ordenamientos estables del último campo al primero.
+        for field in reversed(self.hot.query.order_by or self.model._meta.ordering):
+            name = field.lstrip('-')
+            items.sort(key=lambda item: getattr(item, name), reverse=field.startswith('-'))
+        return items[start:stop]
+
+    def __iter__(self):
+        return iter(self[0:None])
+
@@ -0,0 +1,353 @@
+import glob
+import json
+import logging
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos.
+    fcntl = None
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from backend.versioning import version_bump
+from noti.models import Noti
+from .models import Post
+from .reactions import REACTIONS, has_reaction
+
+logger = logging.getLogger(__name__)
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def journal_paths(journal_path):
+    """
+    Devuelve los diarios de todos los procesos para la ruta base journal_path.
+
+    Para 'reactions.journal' son 'reactions.<pid>.journal' y sus
+    '.flushing', es decir, los ficheros reactions*.journal*.
+    """
+    root, ext = os.path.splitext(journal_path)
+    return sorted(glob.glob(glob.escape(root) + '*' + ext + '*'))
+
+
+def _open_locked(path, mode, blocking):
+    """
+    Abre path y toma su bloqueo exclusivo (flock).
+
+    El bloqueo dura mientras el fichero está abierto y sigue al fichero
+    aunque se renombre. Si el fichero se borró entre la apertura y el
+    bloqueo (su dueño terminó de vaciarlo), se descarta.
+
+    Returns:
+        file: Fichero abierto y bloqueado, o None si no existe, lo bloquea
+            otro proceso vivo (con blocking=False) o ya se borró.
+    """
+    try:
+        journal = open(path, mode, encoding='utf-8')
+    except FileNotFoundError:
+        return None
+    if fcntl is not None:
+        try:
+            fcntl.flock(journal.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            journal.close()
+            return None
+        if os.fstat(journal.fileno()).st_nlink == 0:
+            journal.close()
+            return None
+    return journal
+
+
+class ReactionBuffer:
+    """
+    Buffer de escritura diferida (write-behind) para reacciones.
+
+    Acepta reacciones en memoria, combina las repetidas del mismo usuario
+    sobre la misma publicación (solo cuenta el último estado) y las escribe
+    por lotes cada flush_interval segundos: inserciones y borrados masivos en
+    las tablas intermedias y una sola actualización de contador por publicación.
+
+    Seguridad ante caídas: cada reacción se añade al diario (journal) del
+    proceso antes de aceptarla. Cada proceso escribe en su propio fichero,
+    'reactions.<pid>.journal' para la ruta base 'reactions.journal', y lo
+    mantiene bloqueado mientras vive. Al vaciar el buffer el diario se rota
+    a <diario>.flushing y se borra solo después del commit. recover() adopta
+    los diarios que quedaron sin bloquear (de procesos terminados); como las
+    reacciones son estados (no inversiones), reaplicar un lote ya escrito no
+    cambia nada.
+
+    Atributos:
+        journal_path (str): Ruta base de los diarios o None para no usar diario.
+        journal_id: Identificador del diario de este buffer (por defecto, el pid).
+        flush_interval (float): Segundos entre escrituras por lotes.
+        fsync (bool): Fuerza la escritura del diario a disco en cada reacción.
+    """
+
+    def __init__(self, journal_path=None, flush_interval=1.0, fsync=True, journal_id=None):
+        self.journal_path = None
+        if journal_path:
+            root, ext = os.path.splitext(journal_path)
+            self.journal_path = f'{root}.{os.getpid() if journal_id is None else journal_id}{ext}'
+        self.base_path = journal_path
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._journal = None
+        self._stopped = threading.Event()
+        self._thread = None
+        self.recover()
+
+    def _open_journal(self):
+        while self.journal_path and self._journal is None:
+            self._journal = _open_locked(self.journal_path, 'a', blocking=True)
+
+    def _write_journal(self, entries):
+        if not self.journal_path:
+            return
+        self._open_journal()
+        for (user_id, post_id, kind), value in entries:
+            self._journal.write(json.dumps([user_id, post_id, kind, value]) + '\n')
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    def _read_journal(self, path):
+        entries = {}
+        with open(path, encoding='utf-8') as journal:
+            for line in journal:
+                try:
+                    user_id, post_id, kind, value = json.loads(line)
+                except ValueError:
+                    # Línea incompleta por una caída a mitad de escritura.
+                    continue
+                entries[(user_id, post_id, kind)] = value
+        return entries
+
+    def recover(self):
+        """
+        Adopta las reacciones de los diarios que dejaron procesos terminados.
+
+        Los diarios bloqueados son de procesos vivos y no se tocan. Las
+        reacciones adoptadas se copian al diario propio antes de borrar los
+        ficheros de origen, así que una caída a mitad de la recuperación no
+        pierde nada.
+
+        Returns:
+            int: Cantidad de reacciones adoptadas.
+        """
+        if not self.journal_path:
+            return 0
+        with self._lock:
+            # Un diario con nuestro pid es de un proceso anterior: ya es el propio.
+            self._open_journal()
+            entries = self._read_journal(self.journal_path)
+            claimed = []
+            for path in journal_paths(self.base_path):
+                journal = None if path == self.journal_path else _open_locked(path, 'r', blocking=False)
+                if journal is not None:
+                    claimed.append((path, journal))
+            adopted = {}
+            # Primero .flushing y luego el diario: el orden en que se escribieron.
+            for path, _ in sorted(claimed, key=lambda item: not item[0].endswith('.flushing')):
+                adopted.update(self._read_journal(path))
+            self._write_journal(adopted.items())
+            for path, journal in claimed:
+                os.remove(path)
+                journal.close()
+            entries.update(adopted)
+            for key, value in entries.items():
+                self._pending.setdefault(key, value)
+            return len(entries)
+
+    def set_reaction(self, user_id, post_id, kind, value):
+        """
+        Acepta en el buffer el estado deseado de una reacción.
+
+        Args:
+            user_id (int): Id del usuario que reacciona.
+            post_id (int): Id de la publicación.
+            kind (str): Tipo de reacción ('like' o 'shared').
+            value (bool): Estado deseado de la reacción.
+        """
+        key = (user_id, post_id, kind)
+        with self._lock:
+            self._write_journal([(key, value)])
+            self._pending[key] = value
+
+    def toggle_reaction(self, user, post, kind):
+        """
+        Invierte una reacción teniendo en cuenta lo que aún está en el buffer.
+
+        Args:
+            user (User): Usuario que reacciona.
+            post (Post): Publicación.
+            kind (str): Tipo de reacción ('like' o 'shared').
+
+        Returns:
+            bool: Nuevo estado de la reacción.
+        """
+        key = (user.pk, post.pk, kind)
+        with self._lock:
+            current = self._pending.get(key)
+        if current is None:
+            current = has_reaction(user, post, kind)
+        with self._lock:
+            current = self._pending.get(key, current)
+            self._write_journal([(key, not current)])
+            self._pending[key] = not current
+        return not current
+
+    def pending_count(self):
+        """
+        Devuelve la cantidad de reacciones pendientes de escribir.
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """
+        Escribe por lotes las reacciones pendientes.
+
+        Returns:
+            int: Cantidad de reacciones procesadas.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                if not batch:
+                    return 0
+                # El diario rotado sigue abierto (y bloqueado) hasta borrarlo.
+                flushing, self._journal = self._journal, None
+                if flushing is not None:
+                    os.replace(self.journal_path, self.journal_path + '.flushing')
+
+            try:
+                write_reactions(batch)
+            except Exception:
+                logger.exception('Error al escribir el lote de reacciones; se reintentará')
+                with self._lock:
+                    # Las claves que volvieron a llegar durante la escritura ya
+                    # tienen un estado más nuevo en el buffer y en el diario.
+                    restored = [(key, value) for key, value in batch.items() if key not in self._pending]
+                    self._write_journal(restored)
+                    self._pending.update(restored)
+                raise
+            finally:
+                if flushing is not None:
+                    os.remove(self.journal_path + '.flushing')
+                    flushing.close()
+            return len(batch)
+
+    def start(self):
+        """
+        Arranca el hilo que vacía el buffer cada flush_interval segundos.
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name='reaction-buffer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Detiene el hilo y vacía lo pendiente.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._lock:
+            if self._journal is not None and not self._pending:
+                os.remove(self.journal_path)
+                self._journal.close()
+                self._journal = None
+
+    def _run(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                # Ya se registró en flush(); el lote sigue en el buffer.
+                pass
+            finally:
+                connection.close()
+
+
+def write_reactions(batch):
+    """
+    Escribe un lote de reacciones combinadas en una sola transacción.
+
+    Por cada publicación y tipo de reacción: una consulta para saber qué
+    reacciones ya existen, un bulk_create, un borrado y una actualización
+    del contador.
+
+    Args:
+        batch (dict): {(user_id, post_id, kind): value}.
+    """
+    grouped = {}
+    for (user_id, post_id, kind), value in batch.items():
+        grouped.setdefault((post_id, kind), {})[user_id] = value
+
+    posts = Post.objects.only('id', 'user_id').in_bulk({post_id for post_id, _ in grouped})
+
+    with transaction.atomic():
+        for (post_id, kind), users in grouped.items():
+            post = posts.get(post_id)
+            if post is None:
+                continue
+            relation, counter, noti_type = REACTIONS[kind]
+            through = getattr(Post, relation).through
+            existing = set(
+                through.objects.filter(post_id=post_id, user_id__in=list(users)).values_list('user_id', flat=True)
+            )
+            to_add = [user_id for user_id, value in users.items() if value and user_id not in existing]
+            to_remove = [user_id for user_id, value in users.items() if not value and user_id in existing]
+
+            if to_add:
+                through.objects.bulk_create(
+                    [through(post_id=post_id, user_id=user_id) for user_id in to_add], ignore_conflicts=True
+                )
+                notified = set(
+                    Noti.objects.filter(type=noti_type, post_id=post_id, from_user_id__in=to_add)
+                    .values_list('from_user_id', flat=True)
+                )
+                Noti.objects.bulk_create([
+                    Noti(type=noti_type, post_id=post_id, to_user_id=post.user_id, from_user_id=user_id)
+                    for user_id in to_add if user_id != post.user_id and user_id not in notified
+                ])
+            if to_remove:
+                through.objects.filter(post_id=post_id, user_id__in=to_remove).delete()
+
+            delta = len(to_add) - len(to_remove)
+            if delta:
+                Post.objects.filter(pk=post_id).update(
+                    **{counter: Greatest(F(counter) + delta, 0)}, **version_bump()
+                )
+
+
+def get_buffer():
+    """
+    Devuelve el buffer de reacciones del proceso, creándolo y arrancándolo la primera vez.
+
+    Returns:
+        ReactionBuffer: Buffer configurado con los ajustes REACTION_BUFFER_*.
+    """
+    global _buffer
+    with _buffer_lock:
+        if _buffer is None:
+            # Cada proceso adopta al arrancar los diarios de procesos terminados.
+            _buffer = ReactionBuffer(
+                journal_path=getattr(settings, 'REACTION_BUFFER_JOURNAL', None),
+                flush_interval=getattr(settings, 'REACTION_BUFFER_INTERVAL', 1.0),
+                fsync=getattr(settings, 'REACTION_BUFFER_FSYNC', True),
+            )
+            _buffer.start()
+        return _buffer
@@ -0,0 +1,106 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class FragmentCache:
+    """
+    Caché LRU en memoria de fragmentos serializados.
+
+    Guarda como mucho max_size fragmentos; al superar el límite descarta el
+    usado hace más tiempo. Cuenta aciertos, fallos y descartes.
+
+    Atributos:
+        max_size (int): Cantidad máxima de fragmentos (0 desactiva la caché).
+        hits (int): Lecturas que encontraron el fragmento.
+        misses (int): Lecturas que no lo encontraron.
+        evictions (int): Fragmentos descartados por el límite de tamaño.
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+
+    def get(self, key):
+        """
+        Devuelve el fragmento guardado con la clave o None.
+
+        Args:
+            key: Clave del fragmento.
+
+        Returns:
+            dict: Fragmento guardado o None si no está.
+        """
+        with self._lock:
+            fragment = self._items.get(key)
+            if fragment is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return fragment
+
+    def set(self, key, fragment):
+        """
+        Guarda un fragmento y descarta los menos usados si se supera max_size.
+
+        Args:
+            key: Clave del fragmento.
+            fragment (dict): Fragmento serializado.
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[key] = fragment
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Vacía la caché y reinicia los contadores.
+        """
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Devuelve los contadores de la caché.
+
+        Returns:
+            dict: Tamaño, límite, aciertos, fallos, descartes y tasa de aciertos.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._items),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def get_fragment_cache():
+    """
+    Devuelve la caché de fragmentos de publicaciones del proceso.
+
+    Returns:
+        FragmentCache: Caché configurada con POST_FRAGMENT_CACHE_SIZE.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = FragmentCache(max_size=getattr(settings, 'POST_FRAGMENT_CACHE_SIZE', 10000))
+        return _cache
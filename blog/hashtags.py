@@ -0,0 +1,79 @@
+import re
+
+from django.utils import timezone
+
+from .models import Hashtag, PostHashtag
+
+HASHTAG_RE = re.compile(r'(?<!\w)#(\w{1,50})', re.UNICODE)
+
+
+def extract_hashtags(content):
+    """
+    Extrae las etiquetas (#hashtags) del contenido de una publicación.
+
+    Args:
+        content (str): Contenido de la publicación.
+
+    Returns:
+        list: Nombres de las etiquetas en minúsculas, sin repetir y en orden de aparición.
+    """
+    names = []
+    for name in HASHTAG_RE.findall(content or ''):
+        name = name.lower()
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def _link_hashtags(post, names, created_at):
+    """
+    Crea las etiquetas nuevas con un bulk_create y relaciona la publicación
+    con todas ellas, sin importar cuántas tenga.
+    """
+    if not names:
+        return
+    Hashtag.objects.bulk_create([Hashtag(name=name) for name in names], ignore_conflicts=True)
+    hashtag_ids = Hashtag.objects.filter(name__in=names).values_list('id', flat=True)
+    PostHashtag.objects.bulk_create(
+        [PostHashtag(post=post, hashtag_id=hashtag_id, created_at=created_at) for hashtag_id in hashtag_ids],
+        ignore_conflicts=True,
+    )
+
+
+def save_hashtags(post):
+    """
+    Guarda las etiquetas del contenido de la publicación en la tabla de etiquetas.
+
+    Args:
+        post (Post): Publicación recién creada.
+
+    Returns:
+        list: Nombres de las etiquetas guardadas.
+    """
+    names = extract_hashtags(post.content)
+    _link_hashtags(post, names, post.created_at)
+    return names
+
+
+def update_hashtags(post):
+    """
+    Sincroniza las etiquetas de una publicación editada con su contenido.
+
+    Borra las filas de las etiquetas que ya no aparecen y crea las de las
+    nuevas. Las que se mantienen conservan su fila, así las tendencias no
+    las cuentan dos veces. Las nuevas se fechan en la edición: es cuando se
+    usaron, y refresh() de las tendencias solo lee filas recientes.
+
+    Args:
+        post (Post): Publicación editada.
+
+    Returns:
+        list: Ids de las filas de PostHashtag borradas.
+    """
+    names = extract_hashtags(post.content)
+    current = dict(PostHashtag.objects.filter(post=post).values_list('hashtag__name', 'id'))
+    removed = [row_id for name, row_id in current.items() if name not in names]
+    if removed:
+        PostHashtag.objects.filter(id__in=removed).delete()
+    _link_hashtags(post, [name for name in names if name not in current], timezone.now())
+    return removed
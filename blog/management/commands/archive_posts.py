@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.archive import archive_posts
+
+class Command(BaseCommand):
+    """
+    Comando para mover al nivel frío las publicaciones antiguas.
+
+    Archiva las publicaciones creadas hace más de ARCHIVE_AFTER_DAYS días
+    (o --days) junto con sus comentarios y reacciones, por lotes de una
+    transacción cada uno. Pensado para ejecutarse periódicamente (cron).
+
+    Uso:
+        python manage.py archive_posts [--days N] [--batch-size N]
+    """
+    help = 'Mueve a las tablas archivadas las publicaciones antiguas con sus comentarios y reacciones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ARCHIVE_AFTER_DAYS,
+                            help='Antigüedad en días a partir de la cual se archiva una publicación.')
+        parser.add_argument('--batch-size', type=int, default=settings.ARCHIVE_BATCH_SIZE,
+                            help='Cantidad de publicaciones archivadas por transacción.')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        archived = archive_posts(cutoff, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Publicaciones archivadas: {archived}'))
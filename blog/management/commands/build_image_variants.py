@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from backend.images import VARIANT_SPECS, build_image_variants
+from blog.models import Post
+from users.models import User
+
+class Command(BaseCommand):
+    """
+    Comando para generar las variantes de las imágenes que aún no las tienen.
+
+    Recorre las imágenes de publicaciones, avatares y portadas sin variantes
+    (por ejemplo, las subidas antes de existir el proceso en segundo plano)
+    y las genera en este proceso.
+
+    Uso:
+        python manage.py build_image_variants [--batch-size N]
+    """
+    help = 'Genera las variantes WebP/JPEG de las imágenes que aún no las tienen.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Cantidad de objetos leídos por lote.')
+
+    def handle(self, *args, **options):
+        built = 0
+        for (label, field_name), (variants_field, _) in VARIANT_SPECS.items():
+            model = {'blog.Post': Post, 'users.User': User}[label]
+            field = model._meta.get_field(field_name)
+            pending = (
+                model.objects.filter(**{variants_field: {}})
+                .exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True})
+            )
+            if field.has_default():
+                pending = pending.exclude(**{field_name: field.default})
+            pks = pending.values_list('pk', flat=True)
+            for pk in pks.iterator(chunk_size=options['batch_size']):
+                build_image_variants(label, pk, field_name)
+                built += 1
+        self.stdout.write(self.style.SUCCESS(f'Imágenes procesadas: {built}'))
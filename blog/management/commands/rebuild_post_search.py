@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.search import rebuild_index
+
+class Command(BaseCommand):
+    """
+    Comando para reconstruir el índice de búsqueda de publicaciones.
+
+    Vacía el índice (FTS5 en SQLite, tsvector en PostgreSQL) y vuelve a
+    indexar todas las publicaciones. Sirve para rellenar el índice con las
+    publicaciones existentes o repararlo tras cargas masivas que no pasan
+    por el ORM.
+
+    Uso:
+        python manage.py rebuild_post_search [--batch-size N]
+    """
+    help = 'Reconstruye el índice de búsqueda de texto completo de las publicaciones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Cantidad de publicaciones leídas por lote.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            indexed = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Publicaciones indexadas: {indexed}'))
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from backend.versioning import version_bump
+from blog.models import Post
+
+class Command(BaseCommand):
+    """
+    Comando para rellenar y reconciliar los contadores desnormalizados de Post.
+
+    Recalcula likes_count, shareds_count y comments_count a partir de las
+    tablas de "me gusta", compartidos y comentarios, y actualiza solo las
+    publicaciones cuyos contadores no coinciden.
+
+    Uso:
+        python manage.py recount_posts [--batch-size N] [--dry-run]
+    """
+    help = 'Rellena y reconcilia los contadores likes_count, shareds_count y comments_count de las publicaciones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Cantidad de publicaciones procesadas por lote.')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Muestra cuántas publicaciones se corregirían sin guardar cambios.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+        fixed = 0
+        last_id = 0
+
+        while True:
+            batch = list(
+                Post.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .annotate(
+                    real_likes=Count('liked', distinct=True),
+                    real_shareds=Count('shared', distinct=True),
+                    real_comments=Count('parent', distinct=True),
+                )
+                .values_list('id', 'likes_count', 'shareds_count', 'comments_count',
+                             'real_likes', 'real_shareds', 'real_comments')[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+
+            for post_id, *stored, real_likes, real_shareds, real_comments in batch:
+                if stored == [real_likes, real_shareds, real_comments]:
+                    continue
+                fixed += 1
+                if not dry_run:
+                    Post.objects.filter(id=post_id).update(
+                        likes_count=real_likes, shareds_count=real_shareds, comments_count=real_comments,
+                        **version_bump(),
+                    )
+
+        verb = 'se corregirían' if dry_run else 'corregidas'
+        self.stdout.write(self.style.SUCCESS(f'Publicaciones {verb}: {fixed}'))
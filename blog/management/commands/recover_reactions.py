@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.buffer import ReactionBuffer
+
+
+class Command(BaseCommand):
+    """
+    Comando para reaplicar las reacciones de los diarios que dejaron procesos terminados.
+
+    Se ejecuta al desplegar, antes de arrancar los procesos de la
+    aplicación (como migrate). Los diarios bloqueados por procesos vivos no
+    se tocan, así que también puede ejecutarse con la aplicación en marcha.
+
+    Uso:
+        python manage.py recover_reactions
+    """
+    help = 'Escribe en la base de datos las reacciones pendientes en los diarios del buffer de reacciones.'
+
+    def handle(self, *args, **options):
+        journal_path = getattr(settings, 'REACTION_BUFFER_JOURNAL', None)
+        if not journal_path:
+            self.stdout.write('REACTION_BUFFER_JOURNAL no está configurado.')
+            return
+        buffer = ReactionBuffer(journal_path=journal_path, fsync=getattr(settings, 'REACTION_BUFFER_FSYNC', True))
+        recovered = buffer.pending_count()
+        buffer.stop()
+        self.stdout.write(self.style.SUCCESS(f'Reacciones recuperadas: {recovered}'))
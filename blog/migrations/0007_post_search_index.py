@@ -0,0 +1,42 @@
+from django.db import migrations
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE blog_post_search USING fts5(content, tokenize='unicode61 remove_diacritics 2')",
+    "INSERT INTO blog_post_search (rowid, content) SELECT id, content FROM blog_post",
+]
+SQLITE_DROP = ["DROP TABLE IF EXISTS blog_post_search"]
+
+POSTGRES_CREATE = [
+    "CREATE TABLE blog_post_search ("
+    " post_id bigint PRIMARY KEY REFERENCES blog_post (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED,"
+    " document tsvector NOT NULL)",
+    "CREATE INDEX blog_post_search_document_idx ON blog_post_search USING GIN (document)",
+    "INSERT INTO blog_post_search (post_id, document) SELECT id, to_tsvector('spanish', content) FROM blog_post",
+]
+POSTGRES_DROP = ["DROP TABLE IF EXISTS blog_post_search"]
+
+
+def run(statements_by_vendor):
+    def operation(apps, schema_editor):
+        statements = statements_by_vendor.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+    """
+    Crea el índice de búsqueda de texto completo de las publicaciones y lo
+    rellena con las existentes: FTS5 en SQLite y tsvector + GIN en PostgreSQL.
+    """
+
+    dependencies = [
+        ('blog', '0006_comment_blog_comment_post_created_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_CREATE, 'postgresql': POSTGRES_CREATE}),
+            run({'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP}),
+        ),
+    ]
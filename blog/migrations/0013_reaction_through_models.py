@@ -0,0 +1,104 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def backfill_created_at(apps, schema_editor):
+    """
+    Fecha las reacciones existentes con la fecha de su publicación (la hora
+    real de la reacción no se guardaba), así conservan el orden que tenían.
+    """
+    Post = apps.get_model('blog', 'Post')
+    ArchivedPost = apps.get_model('blog', 'ArchivedPost')
+    for name in ('PostLike', 'PostShare'):
+        apps.get_model('blog', name).objects.update(
+            created_at=Subquery(Post.objects.filter(pk=OuterRef('post_id')).values('created_at')[:1])
+        )
+    apps.get_model('blog', 'ArchivedReaction').objects.update(
+        created_at=Subquery(ArchivedPost.objects.filter(pk=OuterRef('post_id')).values('created_at')[:1])
+    )
+
+
+def through_model(name, table, related_name):
+    return migrations.CreateModel(
+        name=name,
+        fields=[
+            ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name=related_name, to='blog.post')),
+            ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name=related_name, to=settings.AUTH_USER_MODEL)),
+        ],
+        options={'db_table': table, 'unique_together': {('post', 'user')}},
+    )
+
+
+class Migration(migrations.Migration):
+    """
+    Convierte las relaciones automáticas Post.liked y Post.shared en los
+    modelos intermedios PostLike y PostShare sobre las mismas tablas, y les
+    agrega la fecha de la reacción.
+    """
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0012_archive_tables'),
+    ]
+
+    operations = [
+        # Las tablas ya existen: solo cambia el estado de los modelos.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                through_model('PostLike', 'blog_post_liked', 'likes'),
+                through_model('PostShare', 'blog_post_shared', 'shares'),
+                migrations.AlterField(
+                    model_name='post',
+                    name='liked',
+                    field=models.ManyToManyField(blank=True, default=None, related_name='liked', through='blog.PostLike', to=settings.AUTH_USER_MODEL),
+                ),
+                migrations.AlterField(
+                    model_name='post',
+                    name='shared',
+                    field=models.ManyToManyField(blank=True, default=None, related_name='shared', through='blog.PostShare', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='postlike',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='postshare',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='archivedreaction',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(backfill_created_at, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(name='postlike', unique_together=set()),
+        migrations.AlterUniqueTogether(name='postshare', unique_together=set()),
+        migrations.AddConstraint(
+            model_name='postlike',
+            constraint=models.UniqueConstraint(fields=('post', 'user'), name='blog_like_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='postshare',
+            constraint=models.UniqueConstraint(fields=('post', 'user'), name='blog_share_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='postlike',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='blog_like_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postshare',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='blog_share_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedreaction',
+            index=models.Index(fields=['user', 'kind', '-created_at', '-id'], name='blog_archreaction_created_idx'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F
+from django.utils import timezone
 from users.models import User
 
 class Post(models.Model):
@@ -9,22 +11,109 @@ class Post(models.Model):
         user (User): Usuario que creó la publicación.
         content (str): Contenido de la publicación.
         image (ImageField): Imagen asociada a la publicación (opcional).
-        liked (ManyToManyField): Usuarios que han dado "me gusta" a la publicación.
-        shared (ManyToManyField): Usuarios que han compartido la publicación.
+        image_variants (dict): Variantes redimensionadas (WebP/JPEG) de la imagen, generadas en segundo plano.
+        liked (ManyToManyField): Usuarios que han dado "me gusta" a la publicación (a través de PostLike).
+        shared (ManyToManyField): Usuarios que han compartido la publicación (a través de PostShare).
+        likes_count (int): Cantidad desnormalizada de "me gusta" de la publicación.
+        shareds_count (int): Cantidad desnormalizada de veces que se compartió la publicación.
+        comments_count (int): Cantidad desnormalizada de comentarios de la publicación.
+        version (int): Sello de versión; aumenta con cada cambio de la fila y
+            forma parte de la clave de la caché de fragmentos serializados.
         created_at (DateTimeField): Fecha y hora de creación de la publicación.
+        updated_at (DateTimeField): Fecha y hora del último cambio (se actualiza junto con version).
 
     Meta:
         ordering: Orden de las publicaciones por fecha de creación descendente.
+        indexes: Índices (created_at, id) para el feed y (user, created_at, id) para el perfil.
     """
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     content = models.CharField(max_length=140)
     image = models.ImageField(blank=True, null=True)
-    liked = models.ManyToManyField(User, default=None, blank=True, related_name='liked')
-    shared = models.ManyToManyField(User, default=None, blank=True, related_name='shared')
+    image_variants = models.JSONField(default=dict, blank=True)
+    liked = models.ManyToManyField(User, default=None, blank=True, related_name='liked', through='PostLike')
+    shared = models.ManyToManyField(User, default=None, blank=True, related_name='shared', through='PostShare')
+    likes_count = models.PositiveIntegerField(default=0)
+    shareds_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+    version = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='blog_post_created_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='blog_post_user_created_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Guarda la publicación y, si ya existía, aumenta version.
+
+        Así cualquier camino que guarde la fila (vistas, admin, shell o
+        comandos) invalida los fragmentos en caché y los ETag; updated_at lo
+        actualiza auto_now. Los cambios hechos con QuerySet.update() deben
+        pasar version_bump().
+        """
+        if not self._state.adding:
+            self.version = F('version') + 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'version', 'updated_at'}
+        super().save(*args, **kwargs)
+        if not isinstance(self.version, int):
+            self.refresh_from_db(fields=['version'])
+
+class PostLike(models.Model):
+    """
+    Modelo intermedio de los "me gusta" (Post.liked) con la fecha de la reacción.
+
+    Usa la tabla de la antigua relación automática. El índice
+    (user, created_at, id) sirve la pestaña "Me gusta" del perfil, de la más
+    reciente a la más antigua, con un recorrido por rango.
+
+    Atributos:
+        post (Post): Publicación que recibió el "me gusta".
+        user (User): Usuario que dio "me gusta".
+        created_at (DateTimeField): Fecha y hora del "me gusta".
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='likes')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='likes')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'blog_post_liked'
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='blog_like_user_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'user'], name='blog_like_unique'),
+        ]
+
+class PostShare(models.Model):
+    """
+    Modelo intermedio de los compartidos (Post.shared) con la fecha de la reacción.
+
+    Usa la tabla de la antigua relación automática. El índice
+    (user, created_at, id) sirve la pestaña "Compartidos" del perfil.
+
+    Atributos:
+        post (Post): Publicación compartida.
+        user (User): Usuario que la compartió.
+        created_at (DateTimeField): Fecha y hora en que se compartió.
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='shares')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='shares')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'blog_post_shared'
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='blog_share_user_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'user'], name='blog_share_unique'),
+        ]
 
 class Comment(models.Model):
     """
@@ -38,6 +127,7 @@ class Comment(models.Model):
 
     Meta:
         ordering: Orden de los comentarios por fecha de creación descendente.
+        indexes: Índice (post, created_at, id) para paginar los comentarios de una publicación.
     """
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='parent')
@@ -46,5 +136,184 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['post', '-created_at', '-id'], name='blog_comment_post_created_idx'),
+        ]
+
+class TimelineEntry(models.Model):
+    """
+    Modelo para el timeline de inicio materializado de cada usuario.
 
+    Cada fila indica que una publicación debe aparecer en el timeline de un
+    usuario. Se rellena al publicar (fan-out al escribir) y se lee con un
+    único recorrido por rango del índice (user, -created_at, -id).
+
+    Atributos:
+        user (User): Usuario dueño del timeline.
+        post (Post): Publicación que aparece en el timeline.
+        created_at (DateTimeField): Copia de la fecha de creación de la publicación.
+
+    Meta:
+        ordering: Orden de las entradas por fecha de creación descendente.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='timeline')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='timeline_entries')
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='blog_timeline_user_created'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'post'], name='blog_timeline_unique_entry'),
+        ]
+
+class Hashtag(models.Model):
+    """
+    Modelo para almacenar las etiquetas (#hashtags) usadas en las publicaciones.
+
+    Atributos:
+        name (str): Nombre de la etiqueta en minúsculas y sin '#'.
+    """
+    name = models.CharField(max_length=50, unique=True)
+
+class PostHashtag(models.Model):
+    """
+    Modelo que relaciona una publicación con las etiquetas de su contenido.
+
+    Atributos:
+        post (Post): Publicación que usa la etiqueta.
+        hashtag (Hashtag): Etiqueta usada.
+        created_at (DateTimeField): Copia de la fecha de creación de la publicación o,
+            para las etiquetas agregadas al editarla, fecha de la edición.
+
+    Meta:
+        indexes: Índices (hashtag, created_at) para listar una etiqueta y
+            (created_at) para cargar la ventana de tendencias al arrancar.
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='post_hashtags')
+    hashtag = models.ForeignKey(Hashtag, on_delete=models.CASCADE, related_name='post_hashtags')
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['hashtag', '-created_at'], name='blog_posthashtag_tag_created'),
+            models.Index(fields=['created_at'], name='blog_posthashtag_created'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'hashtag'], name='blog_posthashtag_unique'),
+        ]
+
+class ArchivedPost(models.Model):
+    """
+    Modelo para las publicaciones antiguas movidas al nivel frío (blog/archive.py).
 
+    Conserva el id y los campos de la publicación original, así las vistas
+    la sirven igual que una publicación normal. Las publicaciones archivadas
+    son de solo lectura.
+
+    Atributos:
+        id (int): Id de la publicación original.
+        user (User): Usuario que creó la publicación.
+        content (str): Contenido de la publicación.
+        image (ImageField): Imagen asociada a la publicación (opcional).
+        image_variants (dict): Variantes redimensionadas (WebP/JPEG) de la imagen.
+        likes_count (int): Cantidad de "me gusta" al archivarla.
+        shareds_count (int): Cantidad de veces que se compartió al archivarla.
+        comments_count (int): Cantidad de comentarios al archivarla.
+        version (int): Sello de versión al archivarla.
+        created_at (DateTimeField): Fecha y hora de creación de la publicación.
+        updated_at (DateTimeField): Fecha y hora del último cambio de la publicación.
+        archived_at (DateTimeField): Fecha y hora en que se archivó.
+
+    Métodos:
+        liked: Usuarios que dieron "me gusta" a la publicación (como Post.liked).
+        shared: Usuarios que compartieron la publicación (como Post.shared).
+
+    Meta:
+        ordering: Orden de las publicaciones por fecha de creación descendente.
+        indexes: Los mismos índices de Post para continuar el feed y el perfil.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_posts')
+    content = models.CharField(max_length=140)
+    image = models.ImageField(blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True)
+    likes_count = models.PositiveIntegerField(default=0)
+    shareds_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+    version = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='blog_archpost_created_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='blog_archpost_user_created_idx'),
+        ]
+
+    @property
+    def liked(self):
+        return User.objects.filter(archived_reactions__post=self, archived_reactions__kind='like')
+
+    @property
+    def shared(self):
+        return User.objects.filter(archived_reactions__post=self, archived_reactions__kind='shared')
+
+class ArchivedComment(models.Model):
+    """
+    Modelo para los comentarios de las publicaciones archivadas.
+
+    Atributos:
+        id (int): Id del comentario original.
+        user (User): Usuario que creó el comentario.
+        post (ArchivedPost): Publicación archivada a la que pertenece el comentario.
+        body (str): Contenido del comentario.
+        created_at (DateTimeField): Fecha y hora de creación del comentario.
+
+    Meta:
+        ordering: Orden de los comentarios por fecha de creación descendente.
+        indexes: Índice (post, created_at, id) para paginar los comentarios de una publicación.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_comments')
+    post = models.ForeignKey(ArchivedPost, on_delete=models.CASCADE, related_name='comments')
+    body = models.CharField(max_length=140)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['post', '-created_at', '-id'], name='blog_archcomment_post_idx'),
+        ]
+
+class ArchivedReaction(models.Model):
+    """
+    Modelo para los "me gusta" y compartidos de las publicaciones archivadas.
+
+    Atributos:
+        post (ArchivedPost): Publicación archivada.
+        user (User): Usuario que reaccionó.
+        kind (str): Tipo de reacción ('like' o 'shared').
+        created_at (DateTimeField): Fecha y hora de la reacción.
+
+    Meta:
+        indexes: Índices (user, kind, post) para el estado del usuario y
+            (user, kind, created_at, id) para las pestañas del perfil.
+    """
+    post = models.ForeignKey(ArchivedPost, on_delete=models.CASCADE, related_name='reactions')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_reactions')
+    kind = models.CharField(max_length=10, choices=[('like', 'like'), ('shared', 'shared')])
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'kind', 'post'], name='blog_archreaction_user_idx'),
+            models.Index(fields=['user', 'kind', '-created_at', '-id'], name='blog_archreaction_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'user', 'kind'], name='blog_archreaction_unique'),
+        ]
@@ -0,0 +1,120 @@
+from django.db import transaction
+from django.db.models import F
+
+from backend.versioning import version_bump
+from noti.models import Noti
+from .models import Post
+
+# tipo de reacción -> (relación en Post, contador desnormalizado, tipo de notificación)
+REACTIONS = {
+    'like': ('liked', 'likes_count', 'le gusto tu publicación'),
+    'shared': ('shared', 'shareds_count', 'compartió tu publicación'),
+}
+
+
+def has_reaction(user, post, kind):
+    """
+    Indica si el usuario tiene la reacción sobre la publicación.
+
+    Es una comprobación de existencia sobre el índice único (post, user) de
+    la tabla intermedia, sin cargar a los demás usuarios.
+
+    Args:
+        user (User): Usuario que reacciona.
+        post (Post): Publicación.
+        kind (str): Tipo de reacción ('like' o 'shared').
+
+    Returns:
+        bool: True si la reacción existe.
+    """
+    relation = REACTIONS[kind][0]
+    through = getattr(Post, relation).through
+    return through.objects.filter(post_id=post.pk, user_id=user.pk).exists()
+
+
+def set_reaction(user, post, kind, value):
+    """
+    Pone (value=True) o quita (value=False) una reacción de forma idempotente.
+
+    Repetir la misma llamada no cambia nada; el contador y la notificación
+    solo se actualizan cuando la reacción cambia de verdad.
+
+    Args:
+        user (User): Usuario que reacciona.
+        post (Post): Publicación.
+        kind (str): Tipo de reacción ('like' o 'shared').
+        value (bool): Estado deseado de la reacción.
+
+    Returns:
+        bool: True si la reacción cambió.
+    """
+    relation, counter, noti_type = REACTIONS[kind]
+    through = getattr(Post, relation).through
+
+    with transaction.atomic():
+        if value:
+            _, created = through.objects.get_or_create(post_id=post.pk, user_id=user.pk)
+            if not created:
+                return False
+            Post.objects.filter(pk=post.pk).update(**{counter: F(counter) + 1}, **version_bump())
+            if user.pk != post.user_id:
+                Noti.objects.get_or_create(type=noti_type, post_id=post.pk, to_user_id=post.user_id, from_user=user)
+            return True
+
+        deleted, _ = through.objects.filter(post_id=post.pk, user_id=user.pk).delete()
+        if not deleted:
+            return False
+        Post.objects.filter(pk=post.pk, **{f'{counter}__gt': 0}).update(
+            **{counter: F(counter) - 1}, **version_bump()
+        )
+        return True
+
+
+def toggle_reaction(user, post, kind):
+    """
+    Invierte el estado de una reacción.
+
+    Args:
+        user (User): Usuario que reacciona.
+        post (Post): Publicación.
+        kind (str): Tipo de reacción ('like' o 'shared').
+
+    Returns:
+        bool: Nuevo estado de la reacción.
+    """
+    value = not has_reaction(user, post, kind)
+    set_reaction(user, post, kind, value)
+    return value
+
+
+def apply_reactions(user, reactions):
+    """
+    Aplica un lote de reacciones del usuario en una sola transacción.
+
+    Las reacciones repetidas sobre la misma publicación y tipo se combinan:
+    solo cuenta la última, porque set_reaction es idempotente.
+
+    Args:
+        user (User): Usuario que reacciona.
+        reactions (list): Diccionarios con las claves 'post', 'type' y 'value'.
+
+    Returns:
+        tuple: (resultados, ids de publicaciones inexistentes).
+    """
+    final = {}
+    for reaction in reactions:
+        final[(reaction['post'], reaction['type'])] = reaction['value']
+
+    posts = Post.objects.only('id', 'user_id').in_bulk({post_id for post_id, _ in final})
+    results = []
+    missing = []
+    with transaction.atomic():
+        for (post_id, kind), value in final.items():
+            post = posts.get(post_id)
+            if post is None:
+                if post_id not in missing:
+                    missing.append(post_id)
+                continue
+            changed = set_reaction(user, post, kind, value)
+            results.append({'post': post_id, 'type': kind, 'value': value, 'changed': changed})
+    return results, missing
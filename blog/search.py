@@ -0,0 +1,184 @@
+import re
+
+from django.db import connection
+
+from .models import Post
+
+# Tabla del índice de búsqueda: tabla virtual FTS5 en SQLite y tabla con
+# columna tsvector (índice GIN) en PostgreSQL. Se mantiene con las señales
+# de blog/signals.py y se reconstruye con el comando rebuild_post_search.
+# Con otros motores no hay índice (la migración 0007 no crea la tabla) y la
+# búsqueda recorre las publicaciones con icontains, de la más nueva a la más vieja.
+SEARCH_VENDORS = ('postgresql', 'sqlite')
+SEARCH_TABLE = 'blog_post_search'
+SEARCH_CONFIG = 'spanish'
+MAX_TERMS = 10
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_terms(query):
+    """
+    Extrae las palabras de la búsqueda del usuario.
+
+    Se descarta todo lo que no sea una palabra para que los operadores de
+    FTS5 o de tsquery escritos por el usuario no provoquen errores de sintaxis.
+
+    Args:
+        query (str): Texto buscado.
+
+    Returns:
+        list: Palabras de la búsqueda (como máximo MAX_TERMS).
+    """
+    return WORD_RE.findall(query or '')[:MAX_TERMS]
+
+
+def has_index():
+    """
+    Indica si el motor de base de datos actual tiene índice de búsqueda.
+
+    Returns:
+        bool: True en PostgreSQL y SQLite.
+    """
+    return connection.vendor in SEARCH_VENDORS
+
+
+def index_post(post_id, content):
+    """
+    Añade o actualiza una publicación en el índice de búsqueda.
+
+    Args:
+        post_id (int): Clave primaria de la publicación.
+        content (str): Contenido de la publicación.
+    """
+    if not has_index():
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                f'INSERT INTO {SEARCH_TABLE} (post_id, document) VALUES (%s, to_tsvector(%s, %s)) '
+                'ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document',
+                [post_id, SEARCH_CONFIG, content],
+            )
+        else:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [post_id])
+            cursor.execute(f'INSERT INTO {SEARCH_TABLE} (rowid, content) VALUES (%s, %s)', [post_id, content])
+
+
+def unindex_post(post_id):
+    """
+    Quita una publicación del índice de búsqueda.
+
+    Args:
+        post_id (int): Clave primaria de la publicación.
+    """
+    if not has_index():
+        return
+    column = 'post_id' if connection.vendor == 'postgresql' else 'rowid'
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE {column} = %s', [post_id])
+
+
+def rebuild_index(batch_size=1000):
+    """
+    Vacía el índice de búsqueda y lo vuelve a llenar con todas las publicaciones.
+
+    Args:
+        batch_size (int): Cantidad de publicaciones leídas por lote.
+
+    Returns:
+        int: Cantidad de publicaciones indexadas.
+    """
+    if not has_index():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+    indexed = 0
+    for post_id, content in Post.objects.order_by('id').values_list('id', 'content').iterator(chunk_size=batch_size):
+        index_post(post_id, content)
+        indexed += 1
+    return indexed
+
+
+class PostSearchResults:
+    """
+    Resultados de una búsqueda de publicaciones, ordenados por relevancia.
+
+    Es un objeto perezoso que se puede cortar como un QuerySet: cada corte
+    ejecuta una consulta con LIMIT/OFFSET sobre el índice y trae las
+    publicaciones de esa página en una sola consulta. Así se puede pasar
+    directamente a la paginación del proyecto.
+
+    Atributos:
+        terms (list): Palabras buscadas.
+    """
+
+    def __init__(self, query):
+        self.terms = search_terms(query)
+
+    def _fallback(self):
+        posts = Post.objects.all()
+        for term in self.terms:
+            posts = posts.filter(content__icontains=term)
+        return posts.order_by('-id')
+
+    def _match(self):
+        if connection.vendor == 'postgresql':
+            return (
+                f'FROM {SEARCH_TABLE}, plainto_tsquery(%s, %s) AS query WHERE document @@ query',
+                [SEARCH_CONFIG, ' '.join(self.terms)],
+            )
+        # Cada palabra entre comillas: FTS5 las trata como términos (AND implícito).
+        return f'FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s', [' '.join(f'"{term}"' for term in self.terms)]
+
+    def count(self):
+        """
+        Devuelve la cantidad total de publicaciones que coinciden.
+
+        Returns:
+            int: Total de resultados.
+        """
+        if not self.terms:
+            return 0
+        if not has_index():
+            return self._fallback().count()
+        match_sql, params = self._match()
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) {match_sql}', params)
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def ranked_ids(self, offset, limit):
+        """
+        Devuelve los ids de una página de resultados, de más a menos relevante.
+
+        Args:
+            offset (int): Cantidad de resultados a saltar.
+            limit (int): Cantidad máxima de resultados.
+
+        Returns:
+            list: Ids de las publicaciones.
+        """
+        if not self.terms or limit <= 0:
+            return []
+        if not has_index():
+            return list(self._fallback().values_list('id', flat=True)[offset:offset + limit])
+        match_sql, params = self._match()
+        if connection.vendor == 'postgresql':
+            select = f'SELECT post_id {match_sql} ORDER BY ts_rank(document, query) DESC, post_id DESC'
+        else:
+            # bm25() es menor cuanto más relevante es el resultado.
+            select = f'SELECT rowid {match_sql} ORDER BY bm25({SEARCH_TABLE}), rowid DESC'
+        with connection.cursor() as cursor:
+            cursor.execute(f'{select} LIMIT %s OFFSET %s', params + [limit, offset])
+            return [row[0] for row in cursor.fetchall()]
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice) or item.step is not None:
+            raise TypeError('PostSearchResults solo admite cortes sin paso')
+        start = item.start or 0
+        ids = self.ranked_ids(start, item.stop - start)
+        posts = Post.objects.select_related('user').in_bulk(ids)
+        return [posts[post_id] for post_id in ids if post_id in posts]
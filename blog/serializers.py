@@ -1,5 +1,10 @@
-from rest_framework import serializers
-from . models import Post, Comment
+from django.db import models
+from rest_framework import permissions, serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from backend.images import ImageVariantsField, VariantImageField
+from . fragments import get_fragment_cache
+from . models import ArchivedPost, ArchivedReaction, Post, Comment
 
 class CommentSerializer(serializers.ModelSerializer):
     """
@@ -7,7 +12,7 @@ class CommentSerializer(serializers.ModelSerializer):
 
     Atributos:
         user (str): Nombre de usuario del creador del comentario.
-        avatar (str): URL del avatar del creador del comentario.
+        avatar (str): URL del avatar (variante pequeña si existe) del creador del comentario.
 
     Meta:
         model: Modelo Comment.
@@ -15,7 +20,8 @@ class CommentSerializer(serializers.ModelSerializer):
     """
 
     user = serializers.ReadOnlyField(source='user.username')
-    avatar = serializers.ReadOnlyField(source='user.avatar.url')
+    avatar = VariantImageField(source='user.avatar', variants_field='avatar_variants', size='small',
+                               absolute=False, read_only=True)
 
     class Meta:
         model = Comment
@@ -33,34 +39,206 @@ class CommentSerializer(serializers.ModelSerializer):
         """
         return obj.user.avatar.url
 
-class MyPostSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """
+    Mixin para serializadores que permite pedir solo algunos campos con
+    ?fields=campo1,campo2 (el campo id se incluye siempre).
+
+    Solo se aplica en lecturas y en el serializador raíz (o en los elementos
+    de una lista raíz), nunca en serializadores anidados.
+
+    Atributos:
+        fields_query_param (str): Nombre del parámetro de la solicitud.
+    """
+    fields_query_param = 'fields'
+
+    def get_fields(self):
+        """
+        Obtiene los campos del serializador filtrados según ?fields=.
+
+        Returns:
+            dict: Campos del serializador.
+        """
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method not in permissions.SAFE_METHODS:
+            return fields
+        if self.parent is not None and not (isinstance(self.parent, serializers.ListSerializer) and self.parent.parent is None):
+            return fields
+        requested = request.query_params.get(self.fields_query_param)
+        if not requested:
+            return fields
+        requested = {name.strip() for name in requested.split(',')} | {'id'}
+        return {name: field for name, field in fields.items() if name in requested}
+
+class FragmentCacheMixin:
+    """
+    Mixin para serializadores de Post que reutiliza fragmentos ya serializados.
+
+    En las lecturas, los campos que solo dependen de la fila de la publicación
+    se guardan en la caché de fragmentos con la clave (serializador, id,
+    fecha de creación, versión, campos); la fecha evita choques si se
+    reutiliza un id, por ejemplo tras restaurar una copia de la base de
+    datos. Post.version aumenta con cada cambio de la fila (Post.save() o
+    version_bump()), así que un fragmento nunca queda desactualizado:
+    simplemente deja de pedirse y termina descartado por el LRU.
+
+    Los campos de live_fields se calculan siempre: dependen del usuario actual
+    (iliked, ishared), del autor (user, avatar) o de la solicitud (image, que
+    se devuelve como URL absoluta).
+
+    Atributos:
+        live_fields (tuple): Campos que no se guardan en la caché.
+    """
+    live_fields = ('user', 'avatar', 'image', 'iliked', 'ishared')
+
+    def represent_fields(self, instance, fields):
+        """
+        Serializa los campos indicados igual que Serializer.to_representation.
+
+        Args:
+            instance (Post): Publicación a serializar.
+            fields (list): Campos legibles del serializador.
+
+        Returns:
+            dict: Campos serializados.
+        """
+        ret = {}
+        for field in fields:
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                continue
+            check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            ret[field.field_name] = None if check_for_none is None else field.to_representation(attribute)
+        return ret
+
+    def to_representation(self, instance):
+        """
+        Serializa la publicación reutilizando el fragmento de su versión actual.
+
+        Args:
+            instance (Post): Publicación a serializar.
+
+        Returns:
+            dict: Publicación serializada.
+        """
+        request = self.context.get('request')
+        if request is None or request.method not in permissions.SAFE_METHODS or instance.pk is None:
+            return super().to_representation(instance)
+
+        fields = list(self._readable_fields)
+        cached = [field for field in fields if field.field_name not in self.live_fields]
+        live = [field for field in fields if field.field_name in self.live_fields]
+
+        cache = get_fragment_cache()
+        key = (
+            type(self).__name__, instance.pk, instance.created_at, instance.version,
+            tuple(field.field_name for field in cached),
+        )
+        fragment = cache.get(key)
+        if fragment is None:
+            fragment = self.represent_fields(instance, cached)
+            cache.set(key, fragment)
+
+        values = {**fragment, **self.represent_fields(instance, live)}
+        return {field.field_name: values[field.field_name] for field in fields if field.field_name in values}
+
+class PostListSerializer(serializers.ListSerializer):
+    """
+    Serializador de listas de Post que resuelve por lotes el estado del usuario actual.
+
+    Antes de serializar la página consulta, con una sola consulta por relación,
+    a cuáles de esas publicaciones dio "me gusta" o compartió el usuario actual,
+    y deja los conjuntos de ids en el contexto para que los serializadores de
+    Post los lean.
+
+    Métodos:
+        to_representation(data): Precarga el estado del usuario y serializa la lista.
+    """
+
+    def to_representation(self, data):
+        """
+        Precarga el estado del usuario actual y serializa la lista de publicaciones.
+
+        Args:
+            data: QuerySet, Manager o lista de objetos Post.
+
+        Returns:
+            list: Lista de publicaciones serializadas.
+        """
+        posts = list(data.all() if isinstance(data, models.Manager) else data)
+        ids = [post.pk for post in posts if not isinstance(post, ArchivedPost)]
+        archived_ids = [post.pk for post in posts if isinstance(post, ArchivedPost)]
+        fields = self.child.fields
+
+        request = self.context.get('request')
+        if request is not None and request.user.is_authenticated:
+            if 'iliked' in fields:
+                self.context['liked_ids'] = self.reacted_ids(request.user, 'like', ids, archived_ids)
+            if 'ishared' in fields:
+                self.context['shared_ids'] = self.reacted_ids(request.user, 'shared', ids, archived_ids)
+        return super().to_representation(posts)
+
+    def reacted_ids(self, user, kind, ids, archived_ids):
+        """
+        Obtiene los ids de las publicaciones de la página con la reacción del usuario.
+
+        Las publicaciones archivadas (blog/archive.py) se consultan en su
+        propia tabla, y solo si la página incluye alguna.
+
+        Args:
+            user (User): Usuario actual.
+            kind (str): 'like' o 'shared'.
+            ids (list): Ids de las publicaciones del nivel caliente.
+            archived_ids (list): Ids de las publicaciones archivadas.
+
+        Returns:
+            set: Ids de las publicaciones con la reacción.
+        """
+        through = Post.liked.through if kind == 'like' else Post.shared.through
+        reacted = set(through.objects.filter(user=user, post_id__in=ids).values_list('post_id', flat=True))
+        if archived_ids:
+            reacted.update(
+                ArchivedReaction.objects.filter(user=user, kind=kind, post_id__in=archived_ids).values_list('post_id', flat=True)
+            )
+        return reacted
+
+class MyPostSerializer(FragmentCacheMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo Post (personalizado).
 
     Atributos:
         likes_count (int): Cantidad de "me gusta" recibidos por la publicación.
         shareds_count (int): Cantidad de veces que la publicación fue compartida.
+        comments_count (int): Cantidad de comentarios de la publicación.
         user (str): Nombre de usuario del creador de la publicación.
-        avatar (str): URL del avatar del creador de la publicación.
+        avatar (str): URL del avatar (variante pequeña si existe) del creador de la publicación.
+        image (str): URL de la imagen; con ahorro de datos, la de su variante más liviana.
+        image_variants (dict): URLs y tamaños de las variantes WebP/JPEG de la imagen.
 
     Meta:
         model: Modelo Post.
         fields: Lista de campos personalizada para el serializador.
     """
     
-    likes_count = serializers.SerializerMethodField(read_only=True)
-    shareds_count = serializers.SerializerMethodField(read_only=True)
+    likes_count = serializers.ReadOnlyField()
+    shareds_count = serializers.ReadOnlyField()
+    comments_count = serializers.ReadOnlyField()
     user = serializers.ReadOnlyField(source='user.username')
-    avatar = serializers.ReadOnlyField(source='user.avatar.url')
+    avatar = VariantImageField(source='user.avatar', variants_field='avatar_variants', size='small',
+                               absolute=False, read_only=True)
+    image = VariantImageField(variants_field='image_variants', required=False, allow_null=True)
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Post
+        list_serializer_class = PostListSerializer
         fields = ['id', 'user', 
                   'avatar', 
                   'content', 
-                  'image', 'liked', 
-                  'shared', 'created_at', 
-                  'likes_count', 'shareds_count','parent']
+                  'image', 'image_variants', 'created_at', 
+                  'likes_count', 'shareds_count', 'comments_count']
 
     def get_avatar(self, obj):
         """
@@ -74,41 +252,20 @@ class MyPostSerializer(serializers.ModelSerializer):
         """
         return obj.user.avatar.url
 
-    def get_likes_count(self, obj):
-        """
-        Obtiene la cantidad de "me gusta" recibidos por la publicación.
-
-        Args:
-            obj: Objeto Post.
-
-        Returns:
-            int: Cantidad de "me gusta" recibidos por la publicación.
-        """
-        return obj.liked.all().count()
-
-    def get_shareds_count(self, obj):
-        """
-        Obtiene la cantidad de veces que la publicación fue compartida.
-
-        Args:
-            obj: Objeto Post.
-
-        Returns:
-            int: Cantidad de veces que la publicación fue compartida.
-        """
-        return obj.shared.all().count()
-
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(FragmentCacheMixin, SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo Post.
 
     Atributos:
         likes_count (int): Cantidad de "me gusta" recibidos por la publicación.
         shareds_count (int): Cantidad de veces que la publicación fue compartida.
+        comments_count (int): Cantidad de comentarios de la publicación.
         iliked (bool): Indica si el usuario actual dio "me gusta" a la publicación.
         ishared (bool): Indica si el usuario actual compartió la publicación.
         user (str): Nombre de usuario del creador de la publicación.
-        avatar (str): URL del avatar del creador de la publicación.
+        avatar (str): URL del avatar (variante pequeña si existe) del creador de la publicación.
+        image (str): URL de la imagen; con ahorro de datos, la de su variante más liviana.
+        image_variants (dict): URLs y tamaños de las variantes WebP/JPEG de la imagen.
 
     Meta:
         model: Modelo Post.
@@ -116,20 +273,26 @@ class PostSerializer(serializers.ModelSerializer):
     """
 
     user = serializers.ReadOnlyField(source='user.username')
-    avatar = serializers.ReadOnlyField(source='user.avatar.url')
+    avatar = VariantImageField(source='user.avatar', variants_field='avatar_variants', size='small',
+                               absolute=False, read_only=True)
+    image = VariantImageField(variants_field='image_variants', required=False, allow_null=True)
+    image_variants = ImageVariantsField()
 
-    likes_count = serializers.SerializerMethodField(read_only=True)
-    shareds_count = serializers.SerializerMethodField(read_only=True)
+    likes_count = serializers.ReadOnlyField()
+    shareds_count = serializers.ReadOnlyField()
+    comments_count = serializers.ReadOnlyField()
 
     iliked = serializers.SerializerMethodField(read_only=True)
     ishared = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = Post
+        list_serializer_class = PostListSerializer
         fields = ['id', 'user', 
                   'avatar', 
                   'content', 
-                  'image', 'liked', 'shared', 'created_at', 'likes_count', 'shareds_count', 'iliked', 'ishared', 'parent']
+                  'image', 'image_variants', 'created_at', 'likes_count', 'shareds_count', 'comments_count',
+                  'iliked', 'ishared']
 
 
 
@@ -145,50 +308,51 @@ class PostSerializer(serializers.ModelSerializer):
         """
         return obj.user.avatar.url
 
-    def get_likes_count(self, obj):
-        """
-        Obtiene la cantidad de "me gusta" recibidos por la publicación.
-
-        Args:
-            obj: Objeto Post.
-
-        Returns:
-            int: Cantidad de "me gusta" recibidos por la publicación.
-        """
-        return obj.liked.all().count()
-
-    def get_shareds_count(self, obj):
-        """
-        Obtiene la cantidad de veces que la publicación fue compartida.
-
-        Args:
-            obj: Objeto Post.
-
-        Returns:
-            int: Cantidad de veces que la publicación fue compartida.
-        """
-        return obj.shared.all().count()
-
     def get_iliked(self, obj):
         """
         Indica si el usuario actual dio "me gusta" a la publicación.
 
+        Usa los ids precargados por PostListSerializer cuando existen; si no,
+        hace una comprobación de existencia sobre la tabla de "me gusta".
+
         Args:
             obj: Objeto Post.
 
         Returns:
             bool: True si el usuario actual dio "me gusta", False de lo contrario.
         """
-        return True if self.context['request'].user in obj.liked.all() else False
+        liked_ids = self.context.get('liked_ids')
+        if liked_ids is not None:
+            return obj.pk in liked_ids
+        return obj.liked.filter(pk=self.context['request'].user.pk).exists()
 
     def get_ishared(self, obj):
         """
         Indica si el usuario actual compartió la publicación.
 
+        Usa los ids precargados por PostListSerializer cuando existen; si no,
+        hace una comprobación de existencia sobre la tabla de compartidos.
+
         Args:
             obj: Objeto Post.
 
         Returns:
             bool: True si el usuario actual compartió la publicación, False de lo contrario.
         """
-        return True if self.context['request'].user in obj.shared.all() else False
+        shared_ids = self.context.get('shared_ids')
+        if shared_ids is not None:
+            return obj.pk in shared_ids
+        return obj.shared.filter(pk=self.context['request'].user.pk).exists()
+
+class ReactionSerializer(serializers.Serializer):
+    """
+    Serializador para una reacción del endpoint de reacciones por lotes.
+
+    Atributos:
+        post (int): Clave primaria de la publicación.
+        type (str): Tipo de reacción ('like' o 'shared').
+        value (bool): True para poner la reacción, False para quitarla.
+    """
+    post = serializers.IntegerField()
+    type = serializers.ChoiceField(choices=['like', 'shared'])
+    value = serializers.BooleanField()
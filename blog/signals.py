@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Post
+from .search import index_post, unindex_post
+
+
+@receiver(post_save, sender=Post)
+def sync_post_search_on_save(sender, instance, update_fields=None, **kwargs):
+    """
+    Indexa la publicación al crearla o editarla.
+
+    Los guardados que no tocan el contenido (update_fields sin 'content') no
+    reindexan. Los contadores se actualizan con QuerySet.update() y no pasan
+    por aquí.
+    """
+    if update_fields is not None and 'content' not in update_fields:
+        return
+    index_post(instance.pk, instance.content)
+
+
+@receiver(post_delete, sender=Post)
+def sync_post_search_on_delete(sender, instance, **kwargs):
+    """
+    Quita la publicación del índice de búsqueda al eliminarla.
+    """
+    unindex_post(instance.pk)
@@ -1,6 +1,30 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import BytesIO, StringIO
+import os
+import tempfile
+import threading
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from unittest import mock
+from PIL import Image
+from rest_framework.test import APIClient
+from testutils.queryplan import QueryPlanMixin
+from backend.uploads import get_image_pool
 from users.models import User
-from blog.models import Post, Comment
+from blog import trending
+from blog.buffer import ReactionBuffer
+from blog.fragments import FragmentCache, get_fragment_cache
+from blog.hashtags import extract_hashtags
+from blog.trending import TrendingTracker
+from blog.models import (
+    ArchivedComment, ArchivedPost, ArchivedReaction, Post, PostLike, Comment, TimelineEntry, PostHashtag,
+)
+from noti.models import Noti
 
 class PostModelTests(TestCase):
     """
@@ -61,3 +85,1458 @@ class CommentModelTests(TestCase):
         self.assertEqual(comment.user, self.user2)
         self.assertEqual(comment.post, self.post)
         self.assertEqual(comment.body, 'Buena publicación!')
+
+class PostCountersTests(TestCase):
+    """
+    Pruebas para los contadores desnormalizados de Post.
+
+    Métodos:
+        test_like_and_shared_update_counters(): Verifica que like/shared mantienen los contadores.
+        test_recount_posts_command(): Verifica que el comando reconcilia contadores desfasados.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+        cls.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpass123')
+        cls.post = Post.objects.create(content='Que hay, world!', user=cls.user1)
+
+    def setUp(self):
+        """
+        Autentica al segundo usuario en el cliente de la API.
+        """
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user2)
+
+    def test_like_and_shared_update_counters(self):
+        """
+        Verifica que like/shared mantienen los contadores.
+        """
+        self.client.post(f'/blog/like/{self.post.pk}/')
+        self.client.post(f'/blog/shared/{self.post.pk}/')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(self.post.shareds_count, 1)
+
+        self.client.post(f'/blog/like/{self.post.pk}/')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+        self.assertEqual(self.post.shareds_count, 1)
+
+    def test_recount_posts_command(self):
+        """
+        Verifica que el comando reconcilia contadores desfasados.
+        """
+        self.post.liked.add(self.user1, self.user2)
+        Post.objects.filter(pk=self.post.pk).update(likes_count=7, shareds_count=3)
+
+        call_command('recount_posts', stdout=StringIO())
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 2)
+        self.assertEqual(self.post.shareds_count, 0)
+
+class PostViewerStateTests(TestCase):
+    """
+    Pruebas para el estado del usuario actual (iliked/ishared) en el feed.
+
+    Métodos:
+        test_feed_viewer_state(): Verifica iliked/ishared en la lista de publicaciones.
+        test_feed_queries_do_not_grow_with_page(): Verifica que las consultas no crecen con la página.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+        cls.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpass123')
+        cls.liked_post = Post.objects.create(content='Me gusta', user=cls.user1)
+        cls.shared_post = Post.objects.create(content='Compartida', user=cls.user1)
+        cls.liked_post.liked.add(cls.user2)
+        cls.shared_post.shared.add(cls.user2)
+
+    def setUp(self):
+        """
+        Autentica al segundo usuario en el cliente de la API.
+        """
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user2)
+
+    def test_feed_viewer_state(self):
+        """
+        Verifica iliked/ishared en la lista de publicaciones.
+        """
+        response = self.client.get('/blog/')
+        posts = {post['id']: post for post in response.data['data']}
+        self.assertTrue(posts[self.liked_post.pk]['iliked'])
+        self.assertFalse(posts[self.liked_post.pk]['ishared'])
+        self.assertFalse(posts[self.shared_post.pk]['iliked'])
+        self.assertTrue(posts[self.shared_post.pk]['ishared'])
+
+    def test_feed_queries_do_not_grow_with_page(self):
+        """
+        Verifica que las consultas del estado del usuario no crecen con la página.
+        """
+        with CaptureQueriesContext(connection) as small_page:
+            self.client.get('/blog/')
+        for i in range(5):
+            Post.objects.create(content=f'Post {i}', user=self.user1).liked.add(self.user1)
+        with CaptureQueriesContext(connection) as big_page:
+            self.client.get('/blog/')
+        viewer_queries = lambda ctx: [q for q in ctx.captured_queries if q['sql'].startswith('SELECT "blog_post_liked"."post_id"')]
+        self.assertEqual(len(viewer_queries(small_page)), 1)
+        self.assertEqual(len(viewer_queries(big_page)), 1)
+
+@override_settings(BACKGROUND_TASKS_ASYNC=False)
+class HomeTimelineTests(QueryPlanMixin, TestCase):
+    """
+    Pruebas para el timeline de inicio materializado.
+
+    Métodos:
+        test_post_fans_out_to_followers(): Verifica el reparto al publicar.
+        test_celebrity_posts_are_pulled(): Verifica el camino híbrido de lectura.
+        test_timeline_is_a_range_scan(): Verifica que las páginas se leen por rango del índice.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.author = User.objects.create_user(username='author', email='author@example.com', password='testpass123')
+        cls.follower = User.objects.create_user(username='follower', email='follower@example.com', password='testpass123')
+        cls.stranger = User.objects.create_user(username='stranger', email='stranger@example.com', password='testpass123')
+        cls.follower.following.add(cls.author)
+        User.objects.filter(pk=cls.author.pk).update(followers_count=1)
+        User.objects.filter(pk=cls.follower.pk).update(following_count=1)
+
+    def setUp(self):
+        """
+        Limpia la caché usada por el timeline.
+        """
+        cache.clear()
+        self.client = APIClient()
+
+    def test_post_fans_out_to_followers(self):
+        """
+        Verifica que publicar reparte la publicación a los seguidores y al autor.
+        """
+        self.client.force_authenticate(user=self.author)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/blog/', {'content': 'Hola seguidores'})
+
+        self.client.force_authenticate(user=self.follower)
+        response = self.client.get('/blog/home/')
+        self.assertEqual([p['content'] for p in response.data['data']], ['Hola seguidores'])
+        self.assertEqual(TimelineEntry.objects.filter(user=self.author).count(), 1)
+        self.assertFalse(TimelineEntry.objects.filter(user=self.stranger).exists())
+
+    @override_settings(TIMELINE_FANOUT_THRESHOLD=0)
+    def test_celebrity_posts_are_pulled(self):
+        """
+        Verifica que las publicaciones de cuentas muy seguidas se traen al leer.
+        """
+        self.client.force_authenticate(user=self.author)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/blog/', {'content': 'Hola fans'})
+        self.assertFalse(TimelineEntry.objects.filter(user=self.follower).exists())
+
+        self.client.force_authenticate(user=self.follower)
+        response = self.client.get('/blog/home/')
+        self.assertEqual([p['content'] for p in response.data['data']], ['Hola fans'])
+
+    def test_timeline_is_a_range_scan(self):
+        """
+        Verifica que el timeline se pagina por cursor, sin COUNT(*) ni OFFSET, y por rango del índice.
+        """
+        self.client.force_authenticate(user=self.author)
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(12):
+                self.client.post('/blog/', {'content': f'Entrada {i}'})
+
+        self.client.force_authenticate(user=self.follower)
+        with CaptureQueriesContext(connection) as queries:
+            first = self.assertQueriesUseIndexes(lambda: self.client.get('/blog/home/'))
+        sql = [query['sql'] for query in queries.captured_queries]
+        self.assertFalse([q for q in sql if q.startswith('SELECT COUNT(*)') or ' OFFSET ' in q])
+        second = self.assertQueriesUseIndexes(lambda: self.client.get('/blog/home/', {'cursor': first.data['meta']['next']}))
+        contents = [p['content'] for p in first.data['data'] + second.data['data']]
+        self.assertEqual(contents, [f'Entrada {i}' for i in reversed(range(12))])
+
+class CursorPaginationTests(TestCase):
+    """
+    Pruebas para el modo cursor de CustomPagination.
+
+    Métodos:
+        test_cursor_walks_feed(): Verifica que el cursor recorre el feed sin repetir ni saltar publicaciones.
+        test_count_is_optional(): Verifica que el total se puede omitir o pedir.
+        test_invalid_cursor(): Verifica la respuesta ante un cursor inválido.
+        test_comments_are_paginated(): Verifica la paginación por cursor de los comentarios.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+        cls.posts = [Post.objects.create(content=f'Post {i}', user=cls.user1) for i in range(25)]
+        # Fechas repetidas para comprobar el desempate por id.
+        Post.objects.update(created_at=cls.posts[0].created_at)
+        for i in range(15):
+            Comment.objects.create(body=f'Comentario {i}', user=cls.user1, post=cls.posts[0])
+
+    def setUp(self):
+        """
+        Autentica al usuario en el cliente de la API.
+        """
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user1)
+
+    def test_cursor_walks_feed(self):
+        """
+        Verifica que el cursor recorre el feed sin repetir ni saltar publicaciones.
+        """
+        seen = []
+        cursor = ''
+        while cursor is not None:
+            response = self.client.get('/blog/', {'cursor': cursor})
+            seen += [post['id'] for post in response.data['data']]
+            cursor = response.data['meta']['next']
+        self.assertEqual(seen, sorted((post.pk for post in self.posts), reverse=True))
+
+    def test_count_is_optional(self):
+        """
+        Verifica que el total se puede omitir o pedir.
+        """
+        self.assertIsNone(self.client.get('/blog/', {'cursor': ''}).data['meta']['count'])
+        self.assertEqual(self.client.get('/blog/', {'cursor': '', 'count': 'true'}).data['meta']['count'], 25)
+
+        response = self.client.get('/blog/', {'page': 2, 'count': 'false'})
+        self.assertIsNone(response.data['meta']['count'])
+        self.assertEqual(response.data['meta']['next'], 3)
+        self.assertEqual(response.data['meta']['previous'], 1)
+
+    def test_invalid_cursor(self):
+        """
+        Verifica la respuesta ante un cursor inválido.
+        """
+        self.assertEqual(self.client.get('/blog/', {'cursor': 'no-es-un-cursor'}).status_code, 404)
+
+    def test_comments_are_paginated(self):
+        """
+        Verifica la paginación por cursor de los comentarios.
+        """
+        first = self.client.get(f'/blog/comments/{self.posts[0].pk}/', {'cursor': ''})
+        second = self.client.get(f'/blog/comments/{self.posts[0].pk}/', {'cursor': first.data['meta']['next']})
+        self.assertEqual(len(first.data['data']), 10)
+        self.assertEqual(len(second.data['data']), 5)
+        self.assertIsNone(second.data['meta']['next'])
+
+class CommentCountersTests(TestCase):
+    """
+    Pruebas para el contador desnormalizado de comentarios.
+
+    Métodos:
+        test_create_and_delete_update_counter(): Verifica que crear y borrar comentarios actualiza comments_count.
+        test_comment_queries_do_not_grow(): Verifica que las consultas de la lista no crecen con los comentarios.
+        test_recount_fixes_comments_count(): Verifica que recount_posts corrige comments_count.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+        cls.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpass123')
+        cls.post = Post.objects.create(content='Hilo', user=cls.user1)
+
+    def setUp(self):
+        """
+        Autentica al segundo usuario en el cliente de la API.
+        """
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user2)
+
+    def test_create_and_delete_update_counter(self):
+        """
+        Verifica que crear y borrar comentarios actualiza comments_count.
+        """
+        for i in range(2):
+            response = self.client.post(f'/blog/comments/{self.post.pk}/', {'body': f'Comentario {i}'})
+            self.assertEqual(response.status_code, 200)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 2)
+
+        comment = Comment.objects.filter(post=self.post).first()
+        self.assertEqual(self.client.delete(f'/blog/comment/{comment.pk}/').status_code, 204)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+
+    def test_comment_queries_do_not_grow(self):
+        """
+        Verifica que las consultas de la lista de comentarios no crecen con los comentarios.
+        """
+        Comment.objects.create(body='Primero', user=self.user1, post=self.post)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(f'/blog/comments/{self.post.pk}/')
+        for i in range(5):
+            Comment.objects.create(body=f'Otro {i}', user=self.user2, post=self.post)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(f'/blog/comments/{self.post.pk}/')
+        self.assertEqual(len(response.data['data']), 6)
+        self.assertEqual(len(few.captured_queries), len(many.captured_queries))
+
+    def test_recount_fixes_comments_count(self):
+        """
+        Verifica que recount_posts corrige comments_count.
+        """
+        Comment.objects.create(body='Sin contador', user=self.user2, post=self.post)
+        call_command('recount_posts', stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+
+class QueryPlanTests(QueryPlanMixin, TestCase):
+    """
+    Pruebas de regresión del plan de consultas de las vistas del blog.
+
+    Métodos:
+        test_user_posts_use_indexes(): Verifica que get_user_posts no recorre tablas completas.
+        test_comment_list_uses_indexes(): Verifica que CommentList.get no recorre tablas completas.
+        test_user_likes_use_indexes(): Verifica que la pestaña "Me gusta" se lee por rango del índice.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+        cls.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpass123')
+        cls.posts = [Post.objects.create(content=f'Post {i}', user=cls.user1) for i in range(12)]
+        Post.objects.create(content='Ajena', user=cls.user2)
+        for i in range(12):
+            Comment.objects.create(body=f'Comentario {i}', user=cls.user2, post=cls.posts[0])
+        for post in cls.posts:
+            post.liked.add(cls.user2)
+
+    def setUp(self):
+        """
+        Autentica al usuario en el cliente de la API.
+        """
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user1)
+
+    def test_user_posts_use_indexes(self):
+        """
+        Verifica que get_user_posts no recorre tablas completas ni ordena sin índice.
+        """
+        first = self.assertQueriesUseIndexes(lambda: self.client.get('/blog/my/user1/'))
+        self.assertQueriesUseIndexes(lambda: self.client.get('/blog/my/user1/', {'cursor': first.data['meta']['next']}))
+
+    def test_comment_list_uses_indexes(self):
+        """
+        Verifica que CommentList.get no recorre tablas completas ni ordena sin índice.
+        """
+        url = f'/blog/comments/{self.posts[0].pk}/'
+        first = self.assertQueriesUseIndexes(lambda: self.client.get(url))
+        self.assertQueriesUseIndexes(lambda: self.client.get(url, {'cursor': first.data['meta']['next']}))
+
+    def test_user_likes_use_indexes(self):
+        """
+        Verifica que la pestaña "Me gusta" se lee por rango del índice (user, created_at, id).
+        """
+        first = self.assertQueriesUseIndexes(lambda: self.client.get('/blog/likes/user2/'))
+        self.assertQueriesUseIndexes(lambda: self.client.get('/blog/likes/user2/', {'cursor': first.data['meta']['next']}))
+
+class PostSearchTests(TestCase):
+    """
+    Pruebas para la búsqueda de texto completo de publicaciones.
+
+    Métodos:
+        test_search_is_ranked(): Verifica que los resultados se ordenan por relevancia.
+        test_index_follows_edit_and_delete(): Verifica que el índice se actualiza al editar y borrar.
+        test_search_is_paginated(): Verifica la paginación de los resultados.
+        test_operators_are_ignored(): Verifica que la sintaxis de búsqueda del usuario no provoca errores.
+        test_rebuild_command(): Verifica que rebuild_post_search rellena el índice.
+        test_other_vendors_use_icontains(): Verifica la búsqueda con icontains en motores sin índice.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+        cls.weak = Post.objects.create(content='Hoy vi un gato en la calle con mi perro y mi vecino', user=cls.user1)
+        cls.strong = Post.objects.create(content='Gato, gato y más gato', user=cls.user1)
+        Post.objects.create(content='Nada que ver', user=cls.user1)
+
+    def setUp(self):
+        """
+        Autentica al usuario en el cliente de la API.
+        """
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user1)
+
+    def search(self, query, **params):
+        return self.client.get('/blog/search/', {'q': query, **params}).data
+
+    def test_search_is_ranked(self):
+        """
+        Verifica que los resultados se ordenan por relevancia e ignoran las tildes.
+        """
+        ids = [post['id'] for post in self.search('GATO')['data']]
+        self.assertEqual(ids, [self.strong.pk, self.weak.pk])
+        self.assertEqual([post['id'] for post in self.search('mas gato')['data']], [self.strong.pk])
+
+    def test_index_follows_edit_and_delete(self):
+        """
+        Verifica que el índice se actualiza al editar y borrar publicaciones.
+        """
+        response = self.client.patch(f'/blog/{self.weak.pk}/', {'content': 'Ahora hablo de loros'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([post['id'] for post in self.search('gato')['data']], [self.strong.pk])
+        self.assertEqual([post['id'] for post in self.search('loros')['data']], [self.weak.pk])
+
+        self.client.delete(f'/blog/{self.strong.pk}/')
+        self.assertEqual(self.search('gato')['data'], [])
+
+    def test_search_is_paginated(self):
+        """
+        Verifica la paginación de los resultados.
+        """
+        for i in range(12):
+            Post.objects.create(content=f'Loro número {i}', user=self.user1)
+        first = self.search('loro', count='true')
+        self.assertEqual(len(first['data']), 10)
+        self.assertEqual(first['meta']['count'], 12)
+        self.assertEqual(first['meta']['next'], 2)
+        second = self.search('loro', page=2)
+        self.assertEqual(len(second['data']), 2)
+        self.assertIsNone(second['meta']['next'])
+
+    def test_operators_are_ignored(self):
+        """
+        Verifica que la sintaxis de búsqueda del usuario no provoca errores.
+        """
+        self.assertEqual(len(self.search('gato" (*')['data']), 2)
+        self.assertEqual(self.search('')['data'], [])
+
+    def test_rebuild_command(self):
+        """
+        Verifica que rebuild_post_search rellena el índice.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM blog_post_search')
+        self.assertEqual(self.search('gato')['data'], [])
+        out = StringIO()
+        call_command('rebuild_post_search', stdout=out)
+        self.assertIn('3', out.getvalue())
+        self.assertEqual(len(self.search('gato')['data']), 2)
+
+    def test_other_vendors_use_icontains(self):
+        """
+        Verifica que con un motor sin índice se busca con icontains, sin tocar la tabla del índice.
+        """
+        with mock.patch.object(connection, 'vendor', 'mysql'):
+            ids = [post['id'] for post in self.search('GATO', count='true')['data']]
+            self.assertEqual(ids, [self.strong.pk, self.weak.pk])
+            self.assertEqual(self.search('gato vecino')['data'][0]['id'], self.weak.pk)
+
+class HashtagTests(TestCase):
+    """
+    Pruebas para la extracción de etiquetas y las tendencias.
+
+    Métodos:
+        test_extract_hashtags(): Verifica la extracción de etiquetas del contenido.
+        test_create_saves_hashtags(): Verifica que crear una publicación guarda sus etiquetas.
+        test_edit_updates_hashtags(): Verifica que editar una publicación sincroniza sus etiquetas y las tendencias.
+        test_trending_endpoint(): Verifica que el endpoint de tendencias lee los usos nuevos.
+        test_decay_and_window(): Verifica el decaimiento temporal y la salida de la ventana.
+        test_top_k_is_bounded(): Verifica que el top-K mantiene solo las etiquetas más usadas.
+        test_refresh_late_and_deleted_rows(): Verifica las filas que confirmaron tarde y las borradas.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+
+    def setUp(self):
+        """
+        Autentica al usuario y reinicia el rastreador de tendencias del proceso.
+        """
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user1)
+        trending._tracker = None
+
+    def test_extract_hashtags(self):
+        """
+        Verifica la extracción de etiquetas del contenido.
+        """
+        self.assertEqual(extract_hashtags('#Cuba y #cuba en la #Habana, no mi#correo'), ['cuba', 'habana'])
+        self.assertEqual(extract_hashtags('sin etiquetas'), [])
+
+    def test_create_saves_hashtags(self):
+        """
+        Verifica que crear una publicación guarda sus etiquetas.
+        """
+        response = self.client.post('/blog/', {'content': 'Hola #Cuba #playa'})
+        self.assertEqual(response.status_code, 201)
+        tags = PostHashtag.objects.filter(post_id=response.data['id']).values_list('hashtag__name', flat=True)
+        self.assertEqual(sorted(tags), ['cuba', 'playa'])
+
+    def test_edit_updates_hashtags(self):
+        """
+        Verifica que editar una publicación quita las etiquetas borradas, agrega las nuevas y actualiza las tendencias.
+        """
+        post_id = self.client.post('/blog/', {'content': 'Hola #cuba #playa'}).data['id']
+        kept = PostHashtag.objects.get(post_id=post_id, hashtag__name='cuba').pk
+        self.client.get('/blog/trending/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f'/blog/{post_id}/', {'content': 'Hola #cuba #musica'})
+        self.assertEqual(response.status_code, 200)
+        rows = dict(PostHashtag.objects.filter(post_id=post_id).values_list('hashtag__name', 'id'))
+        self.assertEqual(sorted(rows), ['cuba', 'musica'])
+        self.assertEqual(rows['cuba'], kept)
+
+        trending.get_tracker().refresh()
+        data = {item['tag']: item['count'] for item in self.client.get('/blog/trending/').data}
+        self.assertEqual(data, {'cuba': 1, 'musica': 1})
+
+    def test_trending_endpoint(self):
+        """
+        Verifica que el endpoint de tendencias lee los usos nuevos de forma incremental.
+        """
+        for content in ('#cuba #playa', '#cuba', '#cuba #musica'):
+            self.client.post('/blog/', {'content': content})
+        data = self.client.get('/blog/trending/').data
+        self.assertEqual(data[0]['tag'], 'cuba')
+        self.assertEqual(data[0]['count'], 3)
+        self.assertEqual({item['tag'] for item in data}, {'cuba', 'playa', 'musica'})
+
+        self.client.post('/blog/', {'content': '#nueva'})
+        trending.get_tracker().refresh()
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get('/blog/trending/').data
+        self.assertIn('nueva', [item['tag'] for item in data])
+        self.assertFalse([q for q in queries.captured_queries if 'blog_posthashtag' in q['sql']])
+
+    def test_decay_and_window(self):
+        """
+        Verifica que los usos recientes pesan más y que los viejos salen de la ventana.
+        """
+        tracker = TrendingTracker(window=3600, half_life=600, bucket_size=60)
+        now = 100000.0
+        for _ in range(3):
+            tracker.record('vieja', now - 3000, now=now)
+        tracker.record('reciente', now - 10, now=now)
+        tracker.record('reciente', now - 5, now=now)
+        self.assertEqual([item['tag'] for item in tracker.top(now=now)], ['reciente', 'vieja'])
+
+        top = tracker.top(now=now + 700)
+        self.assertEqual([item['tag'] for item in top], ['reciente'])
+        self.assertEqual(top[0]['count'], 2)
+
+    def test_top_k_is_bounded(self):
+        """
+        Verifica que el top-K mantiene solo las etiquetas más usadas.
+        """
+        tracker = TrendingTracker(size=2)
+        now = 100000.0
+        for tag, uses in (('a', 1), ('b', 3), ('c', 2), ('d', 4)):
+            for _ in range(uses):
+                tracker.record(tag, now, now=now)
+        self.assertEqual([item['tag'] for item in tracker.top(now=now)], ['d', 'b'])
+
+    def test_refresh_late_and_deleted_rows(self):
+        """
+        Verifica que refresh() recoge filas que confirmaron tarde sin contarlas dos veces y resta las borradas.
+        """
+        tracker = TrendingTracker()
+        first = self.client.post('/blog/', {'content': '#cuba'}).data['id']
+        tracker.refresh()
+        # Fila de una transacción que empezó antes de la lectura y confirmó después.
+        late = self.client.post('/blog/', {'content': '#cuba'}).data['id']
+        PostHashtag.objects.filter(post_id=late).update(created_at=timezone.now() - timedelta(seconds=30))
+        self.assertEqual(tracker.refresh(), 1)
+        self.assertEqual(tracker.top()[0]['count'], 2)
+
+        Post.objects.filter(pk=first).delete()
+        tracker.refresh()
+        self.assertEqual(tracker.top()[0]['count'], 2)
+        tracker.reconciled_at = None
+        tracker.refresh()
+        self.assertEqual(tracker.top()[0]['count'], 1)
+        Post.objects.filter(pk=late).delete()
+        self.assertEqual(tracker.reconcile(), 1)
+        self.assertEqual(tracker.top(), [])
+
+class FragmentCacheTests(TestCase):
+    """
+    Pruebas para la caché de fragmentos serializados de publicaciones.
+
+    Métodos:
+        test_feed_reuses_fragments(): Verifica que el feed reutiliza los fragmentos guardados.
+        test_changes_bump_version(): Verifica que reacciones, comentarios y ediciones cambian la versión.
+        test_model_save_bumps_version(): Verifica que Post.save() fuera de las vistas cambia la versión.
+        test_viewer_fields_are_live(): Verifica que iliked/ishared se calculan para cada usuario.
+        test_lru_eviction_and_counters(): Verifica el descarte LRU y los contadores.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+        cls.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpass123')
+        cls.post = Post.objects.create(content='Cacheada', user=cls.user1)
+
+    def setUp(self):
+        """
+        Vacía la caché y autentica al primer usuario en el cliente de la API.
+        """
+        get_fragment_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user1)
+
+    def test_feed_reuses_fragments(self):
+        """
+        Verifica que el feed reutiliza los fragmentos guardados.
+        """
+        first = self.client.get('/blog/').data['data']
+        second = self.client.get('/blog/').data['data']
+        self.assertEqual(first, second)
+        stats = get_fragment_cache().stats()
+        self.assertEqual((stats['misses'], stats['hits']), (1, 1))
+
+    def test_changes_bump_version(self):
+        """
+        Verifica que reacciones, comentarios y ediciones cambian la versión y el contenido servido.
+        """
+        self.client.get(f'/blog/{self.post.pk}/')
+        self.client.post(f'/blog/like/{self.post.pk}/')
+        self.assertEqual(self.client.get(f'/blog/{self.post.pk}/').data['likes_count'], 1)
+        self.client.post(f'/blog/shared/{self.post.pk}/')
+        self.assertEqual(self.client.get(f'/blog/{self.post.pk}/').data['shareds_count'], 1)
+        self.client.post(f'/blog/comments/{self.post.pk}/', {'body': 'Hola'})
+        self.assertEqual(self.client.get(f'/blog/{self.post.pk}/').data['comments_count'], 1)
+        self.client.patch(f'/blog/{self.post.pk}/', {'content': 'Editada'})
+        self.assertEqual(self.client.get('/blog/').data['data'][0]['content'], 'Editada')
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.version, 4)
+
+    def test_model_save_bumps_version(self):
+        """
+        Verifica que guardar la publicación fuera de las vistas (admin, shell) también cambia la versión.
+        """
+        self.client.get('/blog/')
+        post = Post.objects.get(pk=self.post.pk)
+        updated_at = post.updated_at
+        post.content = 'Desde el admin'
+        post.save()
+        self.assertEqual(post.version, 1)
+        self.assertGreater(post.updated_at, updated_at)
+        self.assertEqual(self.client.get('/blog/').data['data'][0]['content'], 'Desde el admin')
+
+        post.content = 'Solo el contenido'
+        post.save(update_fields=['content'])
+        post.refresh_from_db()
+        self.assertEqual((post.version, post.content), (2, 'Solo el contenido'))
+
+    def test_viewer_fields_are_live(self):
+        """
+        Verifica que iliked/ishared se calculan para cada usuario sobre el mismo fragmento.
+        """
+        self.post.liked.add(self.user1)
+        self.assertTrue(self.client.get('/blog/').data['data'][0]['iliked'])
+        self.client.force_authenticate(user=self.user2)
+        self.assertFalse(self.client.get('/blog/').data['data'][0]['iliked'])
+        self.assertEqual(get_fragment_cache().stats()['hits'], 1)
+
+    def test_lru_eviction_and_counters(self):
+        """
+        Verifica el descarte LRU y los contadores de la caché.
+        """
+        cache = FragmentCache(max_size=2)
+        cache.set('a', {'id': 1})
+        cache.set('b', {'id': 2})
+        cache.get('a')
+        cache.set('c', {'id': 3})
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), {'id': 1})
+        stats = cache.stats()
+        self.assertEqual((stats['size'], stats['hits'], stats['misses'], stats['evictions']), (2, 2, 1, 1))
+
+class ConditionalGetTests(TestCase):
+    """
+    Pruebas para los GET condicionales (ETag) de publicaciones.
+
+    Métodos:
+        test_post_detail_not_modified(): Verifica el 304 del detalle y que cambia tras una reacción.
+        test_post_list_not_modified(): Verifica el 304 del feed y que cambia con una publicación nueva.
+        test_etag_depends_on_viewer(): Verifica que el ETag es distinto para cada usuario.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+        cls.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpass123')
+        cls.post = Post.objects.create(content='Condicional', user=cls.user1)
+
+    def setUp(self):
+        """
+        Autentica al primer usuario en el cliente de la API.
+        """
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user1)
+
+    def test_post_detail_not_modified(self):
+        """
+        Verifica el 304 del detalle, sin serializar, y que el ETag cambia tras una reacción.
+        """
+        url = f'/blog/{self.post.pk}/'
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertNotIn('Last-Modified', response)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(len(queries.captured_queries), 1)
+
+        # Sin Last-Modified, If-Modified-Since no puede dar un 304 falso.
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+
+        self.client.post(f'/blog/like/{self.post.pk}/')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['iliked'])
+
+    def test_post_list_not_modified(self):
+        """
+        Verifica el 304 del feed y que el ETag cambia con una publicación nueva.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            etag = self.client.get('/blog/')['ETag']
+        # La página del ETag se reutiliza y el modo cursor no cuenta el total.
+        sql = [q['sql'] for q in queries.captured_queries]
+        self.assertFalse([q for q in sql if q.startswith('SELECT COUNT(*)')])
+        self.assertEqual(len([q for q in sql if q.startswith('SELECT "blog_post"."id"')]), 1)
+        self.assertEqual(self.client.get('/blog/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        Post.objects.create(content='Nueva', user=self.user2)
+        response = self.client.get('/blog/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['data']), 2)
+
+    def test_etag_depends_on_viewer(self):
+        """
+        Verifica que el ETag es distinto para cada usuario.
+        """
+        etag = self.client.get(f'/blog/{self.post.pk}/')['ETag']
+        self.client.force_authenticate(user=self.user2)
+        self.assertEqual(self.client.get(f'/blog/{self.post.pk}/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+def make_image(size=(2000, 1500), name='foto.png'):
+    """
+    Crea una imagen PNG en memoria para subirla en las pruebas.
+    """
+    buffer = BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+@override_settings(BACKGROUND_TASKS_ASYNC=False)
+class ImageVariantsTests(TestCase):
+    """
+    Pruebas para las variantes de imágenes generadas en segundo plano.
+
+    Métodos:
+        test_upload_generates_variants(): Verifica que subir una imagen genera sus variantes.
+        test_data_saver_selects_smallest(): Verifica que el ahorro de datos sirve la variante más liviana.
+        test_build_command(): Verifica que build_image_variants genera las variantes pendientes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+
+    def setUp(self):
+        """
+        Usa un MEDIA_ROOT temporal y autentica al usuario en el cliente de la API.
+        """
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user1)
+
+    def create_post(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/blog/', {'content': 'Con foto', 'image': make_image()}, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def test_upload_generates_variants(self):
+        """
+        Verifica que subir una imagen genera variantes WebP y JPEG redimensionadas.
+        """
+        post_id = self.create_post()
+        data = self.client.get(f'/blog/{post_id}/').data
+        self.assertEqual(set(data['image_variants']), {'small', 'medium'})
+        small = data['image_variants']['small']
+        self.assertEqual(set(small), {'webp', 'jpeg'})
+        self.assertEqual((small['webp']['width'], small['webp']['height']), (480, 360))
+        self.assertRegex(data['image'], r'/media/foto\.[0-9a-f]{16}\.png$')
+
+    def test_data_saver_selects_smallest(self):
+        """
+        Verifica que el ahorro de datos sirve la variante más liviana.
+        """
+        post_id = self.create_post()
+        variants = Post.objects.get(pk=post_id).image_variants
+        smallest = min((v for formats in variants.values() for v in formats.values()), key=lambda v: v['bytes'])
+        data = self.client.get(f'/blog/{post_id}/', HTTP_SAVE_DATA='on').data
+        self.assertTrue(data['image'].endswith(smallest['name']))
+        data = self.client.get('/blog/', {'data_saver': '1'}).data['data'][0]
+        self.assertTrue(data['image'].endswith(smallest['name']))
+
+    def test_build_command(self):
+        """
+        Verifica que build_image_variants genera las variantes pendientes.
+        """
+        post = Post.objects.create(content='Vieja', user=self.user1)
+        post.image.save('vieja.png', make_image((800, 600)))
+        call_command('build_image_variants', stdout=StringIO())
+        post.refresh_from_db()
+        self.assertEqual(post.image_variants['medium']['jpeg']['width'], 800)
+        self.assertEqual(post.image_variants['small']['jpeg']['width'], 480)
+
+@override_settings(BACKGROUND_TASKS_ASYNC=False)
+class ImageUploadTests(TestCase):
+    """
+    Pruebas para la recepción por bloques y la limpieza de imágenes subidas.
+
+    Métodos:
+        test_request_too_large(): Verifica que se rechaza una solicitud con Content-Length excesivo.
+        test_file_too_large(): Verifica que se corta la subida de un fichero demasiado grande.
+        test_dimensions_rejected_from_header(): Verifica que las dimensiones se rechazan con la cabecera.
+        test_invalid_image(): Verifica que se rechaza un fichero que no es una imagen.
+        test_exif_stripped(): Verifica que se aplica la orientación y se quitan los metadatos EXIF.
+        test_busy_pool(): Verifica que con el pool saturado se responde 503.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+
+    def setUp(self):
+        """
+        Usa un MEDIA_ROOT temporal y autentica al usuario en el cliente de la API.
+        """
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_settings = override_settings(MEDIA_ROOT=media.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user1)
+
+    def upload(self, image):
+        return self.client.post('/blog/', {'content': 'Con foto', 'image': image}, format='multipart')
+
+    @override_settings(MAX_UPLOAD_REQUEST_SIZE=1000)
+    def test_request_too_large(self):
+        """
+        Verifica que se rechaza una solicitud con Content-Length excesivo.
+        """
+        response = self.upload(make_image())
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Post.objects.exists())
+
+    @override_settings(MAX_IMAGE_UPLOAD_SIZE=100 * 1024)
+    def test_file_too_large(self):
+        """
+        Verifica que se corta la subida de un fichero demasiado grande.
+        """
+        buffer = BytesIO()
+        Image.frombytes('L', (600, 600), os.urandom(600 * 600)).save(buffer, 'PNG')
+        response = self.upload(SimpleUploadedFile('ruido.png', buffer.getvalue(), content_type='image/png'))
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Post.objects.exists())
+
+    @override_settings(MAX_IMAGE_PIXELS=1000 * 1000)
+    def test_dimensions_rejected_from_header(self):
+        """
+        Verifica que las dimensiones se rechazan con la cabecera, sin decodificar la imagen.
+        """
+        with mock.patch('backend.uploads.run_sanitize') as run_sanitize:
+            response = self.upload(make_image((2000, 1500)))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('image', response.data)
+        run_sanitize.assert_not_called()
+
+    def test_invalid_image(self):
+        """
+        Verifica que se rechaza un fichero que no es una imagen.
+        """
+        response = self.upload(SimpleUploadedFile('falsa.png', b'no soy una imagen', content_type='image/png'))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('image', response.data)
+
+    def test_exif_stripped(self):
+        """
+        Verifica que se aplica la orientación y se quitan los metadatos EXIF.
+        """
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        exif[0x010F] = 'Camara'
+        buffer = BytesIO()
+        Image.new('RGB', (40, 20), (10, 120, 10)).save(buffer, 'JPEG', exif=exif)
+        response = self.upload(SimpleUploadedFile('girada.jpg', buffer.getvalue(), content_type='image/jpeg'))
+        self.assertEqual(response.status_code, 201)
+
+        post = Post.objects.get(pk=response.data['id'])
+        with Image.open(post.image.path) as image:
+            self.assertEqual(image.size, (20, 40))
+            self.assertEqual(len(image.getexif()), 0)
+
+    @override_settings(IMAGE_PROCESS_WAIT=0)
+    def test_busy_pool(self):
+        """
+        Verifica que con el pool saturado se responde 503 con Retry-After.
+        """
+        _, slots = get_image_pool()
+        taken = 0
+        while slots.acquire(blocking=False):
+            taken += 1
+        try:
+            response = self.upload(make_image((100, 100)))
+        finally:
+            for _ in range(taken):
+                slots.release()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertFalse(Post.objects.exists())
+
+class BatchPostsTests(TestCase):
+    """
+    Pruebas para el endpoint de publicaciones por lotes.
+
+    Métodos:
+        test_batch_order_and_missing(): Verifica el orden pedido y los ids inexistentes.
+        test_batch_queries(): Verifica que la cantidad de consultas no depende de la cantidad de ids.
+        test_batch_invalid(): Verifica el rechazo de ids no válidos y de lotes demasiado grandes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+        cls.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpass123')
+        cls.posts = [Post.objects.create(content=f'Post {i}', user=cls.user1 if i % 2 else cls.user2) for i in range(6)]
+        cls.posts[1].liked.add(cls.user2)
+        cls.posts[3].shared.add(cls.user2)
+
+    def setUp(self):
+        """
+        Autentica al segundo usuario en el cliente de la API.
+        """
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user2)
+
+    def test_batch_order_and_missing(self):
+        """
+        Verifica el orden pedido, los repetidos, el estado del usuario y los ids inexistentes.
+        """
+        ids = [self.posts[3].pk, 999999, self.posts[1].pk, self.posts[3].pk]
+        response = self.client.get('/blog/batch/', {'ids': ','.join(map(str, ids))})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([post['id'] for post in response.data['posts']], [self.posts[3].pk, self.posts[1].pk])
+        self.assertEqual(response.data['missing'], [999999])
+        first, second = response.data['posts']
+        self.assertTrue(first['ishared'])
+        self.assertFalse(first['iliked'])
+        self.assertTrue(second['iliked'])
+
+    def test_batch_queries(self):
+        """
+        Verifica que la cantidad de consultas no depende de la cantidad de ids.
+        """
+        get_fragment_cache().clear()
+        with CaptureQueriesContext(connection) as few:
+            self.client.get('/blog/batch/', {'ids': f'{self.posts[0].pk},{self.posts[1].pk}'})
+        get_fragment_cache().clear()
+        with CaptureQueriesContext(connection) as many:
+            self.client.get('/blog/batch/', {'ids': ','.join(str(post.pk) for post in self.posts)})
+        self.assertEqual(len(few), len(many))
+
+    def test_batch_invalid(self):
+        """
+        Verifica el rechazo de ids no válidos y de lotes demasiado grandes.
+        """
+        self.assertEqual(self.client.get('/blog/batch/', {'ids': '1,abc'}).status_code, 400)
+        self.assertEqual(self.client.get('/blog/batch/', {'ids': '1,²'}).status_code, 400)
+        # Se rechaza al pasar el máximo, sin validar el resto de la cadena.
+        ids = ','.join(str(i) for i in range(1, 102)) + ',abc'
+        self.assertIn('Máximo', self.client.get('/blog/batch/', {'ids': ids}).data['detail'])
+        ids = ','.join(str(i) for i in range(1, 102))
+        self.assertEqual(self.client.get('/blog/batch/', {'ids': ids}).status_code, 400)
+        response = self.client.get('/blog/batch/')
+        self.assertEqual(response.data, {'posts': [], 'missing': []})
+
+class ArchiveTests(TestCase):
+    """
+    Pruebas para el archivo de publicaciones antiguas en el nivel frío.
+
+    Métodos:
+        test_archive_moves_rows(): Verifica que se mueven publicaciones, comentarios y reacciones.
+        test_fetch_archived_by_id(): Verifica la lectura transparente por id.
+        test_deep_pagination(): Verifica que la paginación continúa en el nivel frío.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+        cls.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpass123')
+        old = timezone.now() - timedelta(days=400)
+        cls.old_posts = []
+        for i in range(3):
+            post = Post.objects.create(content=f'Vieja {i}', user=cls.user1)
+            Post.objects.filter(pk=post.pk).update(created_at=old + timedelta(minutes=i))
+            cls.old_posts.append(post)
+        cls.new_posts = [Post.objects.create(content=f'Nueva {i}', user=cls.user1) for i in range(12)]
+        cls.old_posts[0].liked.add(cls.user2)
+        comment = Comment.objects.create(user=cls.user2, post=cls.old_posts[0], body='Comentario viejo')
+        cls.noti = Noti.objects.create(type='Comentó tu publicación', to_user=cls.user1, from_user=cls.user2,
+                                       post=cls.old_posts[0], comment=comment)
+
+    def setUp(self):
+        """
+        Archiva las publicaciones antiguas y autentica al segundo usuario.
+        """
+        call_command('archive_posts', stdout=StringIO())
+        get_fragment_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user2)
+
+    def test_archive_moves_rows(self):
+        """
+        Verifica que se mueven publicaciones, comentarios y reacciones, y que la notificación sigue mostrándolas.
+        """
+        self.assertEqual(Post.objects.count(), 12)
+        self.assertEqual(ArchivedPost.objects.count(), 3)
+        self.assertEqual(ArchivedComment.objects.get().post_id, self.old_posts[0].pk)
+        self.assertEqual(ArchivedReaction.objects.get().kind, 'like')
+        self.noti.refresh_from_db()
+        self.assertIsNone(self.noti.post)
+        self.assertEqual(self.noti.target_post.pk, self.old_posts[0].pk)
+
+        self.client.force_authenticate(user=self.user1)
+        noti = self.client.get('/noti/no/').data[0]
+        self.assertEqual(noti['post']['content'], 'Vieja 0')
+        self.assertEqual(noti['comment'], ArchivedComment.objects.get().pk)
+
+    def test_fetch_archived_by_id(self):
+        """
+        Verifica la lectura transparente por id y que las archivadas son de solo lectura.
+        """
+        old = self.old_posts[0]
+        response = self.client.get(f'/blog/{old.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['content'], 'Vieja 0')
+        self.assertTrue(response.data['iliked'])
+        self.assertEqual(self.client.patch(f'/blog/{old.pk}/', {'content': 'X'}).status_code, 404)
+
+        response = self.client.get('/blog/batch/', {'ids': f'{old.pk},{self.new_posts[0].pk}'})
+        self.assertEqual([post['id'] for post in response.data['posts']], [old.pk, self.new_posts[0].pk])
+        self.assertTrue(response.data['posts'][0]['iliked'])
+        self.assertEqual(response.data['missing'], [])
+
+        response = self.client.get(f'/blog/comments/{old.pk}/')
+        self.assertEqual([comment['body'] for comment in response.data['data']], ['Comentario viejo'])
+
+        response = self.client.get('/blog/likes/user2/')
+        self.assertEqual([post['id'] for post in response.data['data']], [old.pk])
+
+    def test_deep_pagination(self):
+        """
+        Verifica que la paginación continúa en el nivel frío sin tocarlo en la primera página.
+        """
+        expected = [post.pk for post in reversed(self.new_posts)] + [post.pk for post in reversed(self.old_posts)]
+        seen = []
+        params = {}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/blog/my/user1/', params)
+        self.assertFalse(any('blog_archivedpost' in query['sql'] for query in queries.captured_queries))
+        while True:
+            seen += [post['id'] for post in response.data['data']]
+            if not response.data['meta']['next']:
+                break
+            response = self.client.get('/blog/my/user1/', {'cursor': response.data['meta']['next']})
+        self.assertEqual(seen, expected)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/blog/')
+        self.assertFalse(any('blog_archivedpost' in query['sql'] for query in queries.captured_queries))
+        self.assertIsNone(response.data['meta']['count'])
+        seen = [post['id'] for post in response.data['data']]
+        seen += [post['id'] for post in self.client.get('/blog/', {'cursor': response.data['meta']['next']}).data['data']]
+        self.assertEqual(seen, expected)
+
+        response = self.client.get('/blog/', {'page': 2})
+        self.assertEqual(response.data['meta']['count'], 15)
+        self.assertEqual([post['id'] for post in response.data['data']], expected[10:])
+
+class ProfileTabsTests(TestCase):
+    """
+    Pruebas para las pestañas paginadas del perfil.
+
+    Métodos:
+        test_user_posts_are_paginated(): Verifica que las publicaciones del perfil se paginan por cursor.
+        test_user_likes_and_shared_are_paginated(): Verifica la paginación de "me gusta" y compartidos.
+        test_likes_ordered_by_reaction_time(): Verifica que "Me gusta" se ordena por la fecha de la reacción.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+        cls.posts = [Post.objects.create(content=f'Post {i}', user=cls.user1) for i in range(12)]
+        for post in cls.posts:
+            post.liked.add(cls.user1)
+        cls.posts[0].shared.add(cls.user1)
+
+    def setUp(self):
+        """
+        Autentica al usuario en el cliente de la API.
+        """
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user1)
+
+    def test_user_posts_are_paginated(self):
+        """
+        Verifica que las publicaciones del perfil se paginan por cursor con tamaño acotado.
+        """
+        first = self.client.get('/blog/my/user1/', {'page_size': 100})
+        self.assertEqual(len(first.data['data']), 10)
+        second = self.client.get('/blog/my/user1/', {'cursor': first.data['meta']['next']})
+        self.assertEqual(len(second.data['data']), 2)
+        self.assertIsNone(second.data['meta']['next'])
+
+    def test_user_likes_and_shared_are_paginated(self):
+        """
+        Verifica la paginación de "me gusta" y compartidos.
+        """
+        self.assertEqual(len(self.client.get('/blog/likes/user1/').data['data']), 10)
+        self.assertEqual(len(self.client.get('/blog/shared/user1/').data['data']), 1)
+
+    def test_likes_ordered_by_reaction_time(self):
+        """
+        Verifica que "Me gusta" se ordena por la fecha de la reacción y no por la de la publicación.
+        """
+        oldest = self.posts[0]
+        PostLike.objects.filter(post=oldest).update(created_at=timezone.now() + timedelta(minutes=1))
+        seen = []
+        response = self.client.get('/blog/likes/user1/')
+        while True:
+            seen += [post['id'] for post in response.data['data']]
+            if not response.data['meta']['next']:
+                break
+            response = self.client.get('/blog/likes/user1/', {'cursor': response.data['meta']['next']})
+        self.assertEqual(seen[0], oldest.pk)
+        self.assertEqual(len(seen), 12)
+        self.assertEqual(len(set(seen)), 12)
+
+class CompactPostRepresentationTests(TestCase):
+    """
+    Pruebas para la representación compacta y los campos dispersos de Post.
+
+    Métodos:
+        test_compact_representation(): Verifica que se devuelven conteos y no listas de ids.
+        test_sparse_fieldsets(): Verifica el parámetro ?fields=.
+        test_queries_do_not_grow_with_popularity(): Verifica que las consultas no crecen con la popularidad.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.users = [
+            User.objects.create_user(username=f'user{i}', email=f'user{i}@example.com', password='testpass123')
+            for i in range(4)
+        ]
+        cls.post = Post.objects.create(content='Popular', user=cls.users[0])
+        Comment.objects.create(body='Primero', user=cls.users[1], post=cls.post)
+        Post.objects.filter(pk=cls.post.pk).update(comments_count=1)
+
+    def setUp(self):
+        """
+        Autentica al primer usuario en el cliente de la API.
+        """
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.users[0])
+
+    def test_compact_representation(self):
+        """
+        Verifica que se devuelven conteos y no listas de ids.
+        """
+        post = self.client.get('/blog/').data['data'][0]
+        self.assertNotIn('liked', post)
+        self.assertNotIn('shared', post)
+        self.assertNotIn('parent', post)
+        self.assertEqual(post['comments_count'], 1)
+
+    def test_sparse_fieldsets(self):
+        """
+        Verifica el parámetro ?fields=.
+        """
+        post = self.client.get('/blog/', {'fields': 'content,likes_count'}).data['data'][0]
+        self.assertEqual(set(post), {'id', 'content', 'likes_count'})
+
+        post = self.client.get(f'/blog/{self.post.pk}/', {'fields': 'content'}).data
+        self.assertEqual(set(post), {'id', 'content'})
+
+    def test_queries_do_not_grow_with_popularity(self):
+        """
+        Verifica que las consultas por página no crecen con la popularidad de la publicación.
+        """
+        with CaptureQueriesContext(connection) as quiet:
+            self.client.get('/blog/')
+        for user in self.users[1:]:
+            self.post.liked.add(user)
+            self.post.shared.add(user)
+            self.client.post(f'/blog/comments/{self.post.pk}/', {'body': 'Otro'})
+        with CaptureQueriesContext(connection) as popular:
+            response = self.client.get('/blog/')
+        self.assertEqual(len(quiet.captured_queries), len(popular.captured_queries))
+        self.assertEqual(response.data['data'][0]['comments_count'], 4)
+
+class ReactionEndpointsTests(TestCase):
+    """
+    Pruebas para las reacciones idempotentes y por lotes.
+
+    Métodos:
+        test_set_and_unset_are_idempotent(): Verifica que PUT/DELETE se pueden repetir sin efecto.
+        test_bulk_reactions(): Verifica el endpoint de reacciones por lotes.
+        test_bulk_reactions_rejects_bad_bodies(): Verifica los cuerpos inválidos y el límite del lote.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+        cls.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpass123')
+        cls.post = Post.objects.create(content='Que hay, world!', user=cls.user1)
+        cls.other_post = Post.objects.create(content='Otra', user=cls.user1)
+
+    def setUp(self):
+        """
+        Autentica al segundo usuario en el cliente de la API.
+        """
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user2)
+
+    def test_set_and_unset_are_idempotent(self):
+        """
+        Verifica que PUT/DELETE se pueden repetir sin efecto.
+        """
+        for _ in range(2):
+            response = self.client.put(f'/blog/like/{self.post.pk}/')
+            self.assertTrue(response.data['liked'])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(Noti.objects.filter(post=self.post, from_user=self.user2).count(), 1)
+
+        for _ in range(2):
+            response = self.client.delete(f'/blog/like/{self.post.pk}/')
+            self.assertFalse(response.data['liked'])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+        self.assertFalse(self.post.liked.exists())
+
+    def test_bulk_reactions(self):
+        """
+        Verifica el endpoint de reacciones por lotes.
+        """
+        response = self.client.post('/blog/reactions/', {'reactions': [
+            {'post': self.post.pk, 'type': 'like', 'value': True},
+            {'post': self.post.pk, 'type': 'like', 'value': False},
+            {'post': self.post.pk, 'type': 'like', 'value': True},
+            {'post': self.other_post.pk, 'type': 'shared', 'value': True},
+            {'post': 999999, 'type': 'like', 'value': True},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['missing'], [999999])
+        self.assertEqual(len(response.data['results']), 2)
+
+        self.post.refresh_from_db()
+        self.other_post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(self.other_post.shareds_count, 1)
+        self.assertTrue(self.other_post.shared.filter(pk=self.user2.pk).exists())
+
+    def test_bulk_reactions_rejects_bad_bodies(self):
+        """
+        Verifica que un cuerpo que no es un objeto y un lote demasiado grande responden 400.
+        """
+        response = self.client.post('/blog/reactions/', [{'post': self.post.pk}], format='json')
+        self.assertEqual(response.status_code, 400)
+
+        item = {'post': 'no-es-un-id', 'type': 'like', 'value': True}
+        response = self.client.post('/blog/reactions/', {'reactions': [item] * 101}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Máximo', response.data['detail'])
+
+class ReactionBufferTests(TestCase):
+    """
+    Pruebas para el buffer de reacciones con escritura diferida.
+
+    Métodos:
+        test_concurrent_like_storm(): Simula miles de "me gusta" concurrentes sobre una publicación.
+        test_toggles_are_coalesced(): Verifica que los toggles repetidos se combinan.
+        test_journal_recovery(): Verifica que un buffer nuevo reaplica el diario de un proceso terminado.
+        test_live_journals_are_not_shared(): Verifica que un proceso no adopta ni borra el diario de otro vivo.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configuración de datos para las pruebas.
+        """
+        cls.author = User.objects.create_user(username='author', email='author@example.com', password='testpass123')
+        User.objects.bulk_create([
+            User(username=f'fan{i}', email=f'fan{i}@example.com') for i in range(2000)
+        ])
+        cls.fan_ids = list(User.objects.filter(username__startswith='fan').values_list('id', flat=True))
+        cls.post = Post.objects.create(content='Viral', user=cls.author)
+
+    def test_concurrent_like_storm(self):
+        """
+        Simula miles de "me gusta" concurrentes (con repeticiones) sobre una publicación.
+        """
+        buffer = ReactionBuffer()
+
+        def like_all(ids):
+            for user_id in ids:
+                buffer.set_reaction(user_id, self.post.pk, 'like', True)
+
+        chunks = [self.fan_ids[i::8] for i in range(8)]
+        threads = [threading.Thread(target=like_all, args=(chunk,)) for chunk in chunks + chunks]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(buffer.pending_count(), 2000)
+        with CaptureQueriesContext(connection) as ctx:
+            buffer.flush()
+        # Unas pocas consultas por lotes en vez de varias por cada "me gusta".
+        self.assertLess(len(ctx.captured_queries), 50)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 2000)
+        self.assertEqual(self.post.liked.count(), 2000)
+        self.assertEqual(Noti.objects.filter(post=self.post).count(), 2000)
+
+    def test_toggles_are_coalesced(self):
+        """
+        Verifica que los toggles repetidos del mismo usuario se combinan.
+        """
+        buffer = ReactionBuffer()
+        fan = User.objects.get(pk=self.fan_ids[0])
+        for _ in range(3):
+            buffer.toggle_reaction(fan, self.post, 'like')
+        self.assertEqual(buffer.pending_count(), 1)
+        buffer.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+        buffer.toggle_reaction(fan, self.post, 'like')
+        buffer.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_journal_recovery(self):
+        """
+        Verifica que un buffer nuevo reaplica el diario de un proceso terminado.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = os.path.join(tmp, 'reactions.journal')
+            crashed = ReactionBuffer(journal_path=journal, fsync=False, journal_id=1)
+            for user_id in self.fan_ids[:5]:
+                crashed.set_reaction(user_id, self.post.pk, 'shared', True)
+            crashed.set_reaction(self.fan_ids[0], self.post.pk, 'shared', False)
+            # La caída libera el bloqueo del diario.
+            crashed._journal.close()
+
+            restarted = ReactionBuffer(journal_path=journal, fsync=False, journal_id=2)
+            self.assertEqual(restarted.pending_count(), 5)
+            self.assertFalse(os.path.exists(crashed.journal_path))
+            restarted.flush()
+            restarted.stop()
+            self.assertEqual(os.listdir(tmp), [])
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.shareds_count, 4)
+
+    def test_live_journals_are_not_shared(self):
+        """
+        Verifica que un proceso no adopta ni borra el diario de otro proceso vivo.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = os.path.join(tmp, 'reactions.journal')
+            first = ReactionBuffer(journal_path=journal, fsync=False, journal_id=1)
+            second = ReactionBuffer(journal_path=journal, fsync=False, journal_id=2)
+            first.set_reaction(self.fan_ids[0], self.post.pk, 'like', True)
+            second.set_reaction(self.fan_ids[1], self.post.pk, 'like', True)
+            second.flush()
+
+            self.assertEqual(first.pending_count(), 1)
+            self.assertTrue(os.path.exists(first.journal_path))
+            self.assertEqual(ReactionBuffer(journal_path=journal, journal_id=3).pending_count(), 0)
+
+            # Terminado el primer proceso, el comando reaplica su diario.
+            first._journal.close()
+            out = StringIO()
+            with override_settings(REACTION_BUFFER_JOURNAL=journal, REACTION_BUFFER_FSYNC=False):
+                call_command('recover_reactions', stdout=out)
+            self.assertIn('Reacciones recuperadas: 1', out.getvalue())
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 2)
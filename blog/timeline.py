@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from users.models import User
+from .models import Post, TimelineEntry
+
+CELEBRITIES_CACHE_KEY = 'blog:timeline:celebrities'
+PULLED_CACHE_KEY = 'blog:timeline:pulled:{user_id}'
+FANOUT_BATCH_SIZE = 1000
+
+
+def get_celebrity_ids():
+    """
+    Devuelve los ids de las cuentas con más seguidores que TIMELINE_FANOUT_THRESHOLD.
+
+    Lee el contador followers_count por su índice. El resultado se guarda en
+    caché unos minutos para no consultarlo en cada lectura del timeline.
+
+    Returns:
+        set: Ids de las cuentas que usan el camino de lectura (pull).
+    """
+    def compute():
+        return set(
+            User.objects.filter(followers_count__gt=settings.TIMELINE_FANOUT_THRESHOLD).values_list('id', flat=True)
+        )
+    return cache.get_or_set(CELEBRITIES_CACHE_KEY, compute, 300)
+
+
+def fan_out_post(post_id):
+    """
+    Reparte una publicación en los timelines del autor y de sus seguidores.
+
+    Si el autor supera TIMELINE_FANOUT_THRESHOLD la publicación solo se añade
+    a su propio timeline; sus seguidores la traen al leer (pull_celebrity_posts).
+
+    Args:
+        post_id (int): Clave primaria de la publicación.
+    """
+    post = Post.objects.filter(pk=post_id).only('id', 'user_id', 'created_at').first()
+    if post is None:
+        return
+
+    TimelineEntry.objects.bulk_create(
+        [TimelineEntry(user_id=post.user_id, post_id=post.pk, created_at=post.created_at)],
+        ignore_conflicts=True,
+    )
+    if post.user_id in get_celebrity_ids():
+        return
+
+    follower_ids = User.objects.filter(following=post.user_id).values_list('id', flat=True)
+    batch = []
+    for follower_id in follower_ids.iterator(chunk_size=FANOUT_BATCH_SIZE):
+        batch.append(TimelineEntry(user_id=follower_id, post_id=post.pk, created_at=post.created_at))
+        if len(batch) >= FANOUT_BATCH_SIZE:
+            TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def pull_celebrity_posts(user):
+    """
+    Trae al timeline del usuario las publicaciones recientes de las cuentas
+    muy seguidas a las que sigue (camino híbrido de lectura).
+
+    Solo se consultan publicaciones posteriores a la última vez que se hizo
+    pull para este usuario, hasta TIMELINE_PULL_LIMIT.
+
+    Args:
+        user (User): Usuario dueño del timeline.
+    """
+    celebrity_ids = get_celebrity_ids()
+    if not celebrity_ids:
+        return
+    followed_ids = list(user.following.filter(id__in=celebrity_ids).values_list('id', flat=True))
+    if not followed_ids:
+        return
+
+    pulled_key = PULLED_CACHE_KEY.format(user_id=user.pk)
+    since = cache.get(pulled_key)
+    now = timezone.now()
+    posts = Post.objects.filter(user_id__in=followed_ids)
+    if since is not None:
+        posts = posts.filter(created_at__gte=since)
+    posts = posts.order_by('-created_at').values_list('id', 'created_at')[:settings.TIMELINE_PULL_LIMIT]
+
+    TimelineEntry.objects.bulk_create(
+        [TimelineEntry(user_id=user.pk, post_id=post_id, created_at=created_at) for post_id, created_at in posts],
+        ignore_conflicts=True,
+    )
+    cache.set(pulled_key, now, None)
@@ -0,0 +1,287 @@
+import heapq
+import math
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+
+from .models import PostHashtag
+
+REFRESH_BATCH_SIZE = 1000
+# Exponente a partir del cual se mueve el punto de referencia para que los
+# pesos no crezcan sin límite.
+MAX_EXPONENT = 30
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+class TrendingTracker:
+    """
+    Tendencias de etiquetas con conteos en ventana deslizante y decaimiento temporal.
+
+    Cada uso de una etiqueta suma un peso exp((t - referencia) / tau), es
+    decir, todos los puntajes se guardan respecto a un mismo instante de
+    referencia (forward decay). Como el paso del tiempo los reduce a todos
+    por igual, el orden entre etiquetas solo cambia cuando llega un uso
+    nuevo o cuando un bloque sale de la ventana, y el top-K se puede
+    mantener de forma incremental:
+
+    - record() actualiza una etiqueta y, si corresponde, la coloca en el top-K.
+    - Los usos se agrupan en bloques de bucket_size segundos; al salir un
+      bloque de la ventana se restan sus pesos y se recalcula el top-K una
+      sola vez por bloque.
+    - top() solo lee el top-K ya calculado.
+    - forget() resta los usos de filas borradas (publicaciones borradas,
+      archivadas o editadas).
+
+    Atributos:
+        window (int): Duración de la ventana en segundos.
+        half_life (int): Segundos en los que el peso de un uso se reduce a la mitad.
+        bucket_size (int): Duración de cada bloque de la ventana en segundos.
+        size (int): Cantidad de etiquetas del top-K.
+        overlap (int): Segundos que refresh() vuelve a leer antes de la última lectura.
+        reconcile_interval (int): Segundos entre comprobaciones de filas borradas.
+    """
+
+    def __init__(self, window=86400, half_life=21600, bucket_size=300, size=10, overlap=60, reconcile_interval=600):
+        self.window = window
+        self.half_life = half_life
+        self.bucket_size = bucket_size
+        self.size = size
+        self.overlap = overlap
+        self.reconcile_interval = reconcile_interval
+        self.tau = half_life / math.log(2)
+        self.refreshed_at = None
+        self.reconciled_at = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._landmark = None
+        self._buckets = {}   # índice de bloque -> {etiqueta: [usos, peso]}
+        self._seen = {}      # índice de bloque -> {id de PostHashtag: (etiqueta, momento)}
+        self._scores = {}    # etiqueta -> peso acumulado respecto a la referencia
+        self._counts = {}    # etiqueta -> usos dentro de la ventana
+        self._top = []       # [(peso, etiqueta)] de mayor a menor
+
+    def _oldest_bucket(self, now):
+        return int(now // self.bucket_size) - self.window // self.bucket_size + 1
+
+    def _rebase(self, now):
+        if self._landmark is None:
+            self._landmark = now
+            return
+        exponent = (now - self._landmark) / self.tau
+        if exponent < MAX_EXPONENT:
+            return
+        factor = math.exp(-exponent)
+        for tags in self._buckets.values():
+            for entry in tags.values():
+                entry[1] *= factor
+        self._scores = {tag: score * factor for tag, score in self._scores.items()}
+        self._top = [(score * factor, tag) for score, tag in self._top]
+        self._landmark = now
+
+    def _offer(self, tag):
+        score = self._scores[tag]
+        top = [(s, t) for s, t in self._top if t != tag]
+        if len(top) < self.size or score > top[-1][0]:
+            top.append((score, tag))
+            top.sort(reverse=True)
+        self._top = top[:self.size]
+
+    def _expire(self, now):
+        oldest = self._oldest_bucket(now)
+        expired = [index for index in self._buckets if index < oldest]
+        if not expired:
+            return
+        for index in expired:
+            self._seen.pop(index, None)
+            for tag, (uses, weight) in self._buckets.pop(index).items():
+                self._subtract(tag, uses, weight)
+        self._rank()
+
+    def _subtract(self, tag, uses, weight):
+        self._counts[tag] -= uses
+        self._scores[tag] -= weight
+        if self._counts[tag] <= 0:
+            del self._counts[tag]
+            del self._scores[tag]
+
+    def _rank(self):
+        self._top = heapq.nlargest(self.size, ((score, tag) for tag, score in self._scores.items()))
+
+    def record(self, tag, timestamp, now=None, row_id=None):
+        """
+        Registra un uso de la etiqueta.
+
+        Args:
+            tag (str): Nombre de la etiqueta.
+            timestamp (float): Momento del uso (segundos desde epoch).
+            now (float): Momento actual (por defecto, time.time()).
+            row_id (int): Id de la fila de PostHashtag; si ya se registró, se ignora.
+
+        Returns:
+            bool: True si el uso se registró.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._rebase(now)
+            self._expire(now)
+            index = int(timestamp // self.bucket_size)
+            if index < self._oldest_bucket(now):
+                return False
+            if row_id is not None:
+                seen = self._seen.setdefault(index, {})
+                if row_id in seen:
+                    return False
+                seen[row_id] = (tag, timestamp)
+            weight = math.exp((timestamp - self._landmark) / self.tau)
+            entry = self._buckets.setdefault(index, {}).setdefault(tag, [0, 0.0])
+            entry[0] += 1
+            entry[1] += weight
+            self._counts[tag] = self._counts.get(tag, 0) + 1
+            self._scores[tag] = self._scores.get(tag, 0.0) + weight
+            self._offer(tag)
+            return True
+
+    def forget(self, row_ids):
+        """
+        Resta los usos de filas de PostHashtag que ya no existen.
+
+        Args:
+            row_ids (iterable): Ids de las filas borradas.
+        """
+        row_ids = set(row_ids)
+        with self._lock:
+            for index, seen in self._seen.items():
+                for row_id in row_ids.intersection(seen):
+                    tag, timestamp = seen.pop(row_id)
+                    weight = math.exp((timestamp - self._landmark) / self.tau)
+                    entry = self._buckets[index][tag]
+                    entry[0] -= 1
+                    entry[1] -= weight
+                    if entry[0] <= 0:
+                        del self._buckets[index][tag]
+                    self._subtract(tag, 1, weight)
+            self._rank()
+
+    def top(self, now=None):
+        """
+        Devuelve las etiquetas en tendencia.
+
+        Args:
+            now (float): Momento actual (por defecto, time.time()).
+
+        Returns:
+            list: Diccionarios con 'tag', 'count' (usos en la ventana) y
+                'score' (usos con decaimiento al momento actual).
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._expire(now)
+            if self._landmark is None:
+                return []
+            decay = math.exp(-(now - self._landmark) / self.tau)
+            return [
+                {'tag': tag, 'count': self._counts[tag], 'score': round(score * decay, 4)}
+                for score, tag in self._top
+            ]
+
+    def refresh(self, now=None):
+        """
+        Incorpora los usos de etiquetas guardados desde la última lectura.
+
+        Lee las filas de PostHashtag creadas desde overlap segundos antes de
+        la lectura anterior (en la primera, las que caen dentro de la
+        ventana) y descarta las ya registradas. Volver a leer ese margen
+        recoge las filas de transacciones que confirmaron tarde, que un
+        filtro por id mayor que el último visto saltaría para siempre. Cada
+        reconcile_interval segundos también se restan las filas borradas.
+
+        Args:
+            now (float): Momento actual (por defecto, time.time()).
+
+        Returns:
+            int: Cantidad de usos incorporados.
+        """
+        now = time.time() if now is None else now
+        with self._refresh_lock:
+            since = self._oldest_bucket(now) * self.bucket_size
+            if self.refreshed_at is not None:
+                since = max(since, self.refreshed_at - self.overlap)
+            rows = (
+                PostHashtag.objects.filter(created_at__gte=datetime.fromtimestamp(since, tz=dt_timezone.utc))
+                .order_by('created_at', 'id')
+                .values_list('id', 'hashtag__name', 'created_at')
+            )
+
+            recorded = 0
+            after = None
+            while True:
+                page = rows
+                if after is not None:
+                    page = rows.filter(Q(created_at__gt=after[0]) | Q(created_at=after[0], id__gt=after[1]))
+                batch = list(page[:REFRESH_BATCH_SIZE])
+                for row_id, tag, created_at in batch:
+                    recorded += self.record(tag, created_at.timestamp(), now=now, row_id=row_id)
+                if len(batch) < REFRESH_BATCH_SIZE:
+                    break
+                after = (batch[-1][2], batch[-1][0])
+            self.refreshed_at = now
+            if self.reconciled_at is None or now - self.reconciled_at >= self.reconcile_interval:
+                self.reconcile()
+                self.reconciled_at = now
+            return recorded
+
+    def reconcile(self):
+        """
+        Resta los usos registrados cuyas filas de PostHashtag ya no existen.
+
+        Returns:
+            int: Cantidad de usos restados.
+        """
+        with self._lock:
+            seen = [row_id for rows in self._seen.values() for row_id in rows]
+        missing = []
+        for start in range(0, len(seen), REFRESH_BATCH_SIZE):
+            chunk = seen[start:start + REFRESH_BATCH_SIZE]
+            existing = set(PostHashtag.objects.filter(id__in=chunk).values_list('id', flat=True))
+            missing += [row_id for row_id in chunk if row_id not in existing]
+        if missing:
+            self.forget(missing)
+        return len(missing)
+
+    def refresh_if_stale(self, interval, now=None):
+        """
+        Llama a refresh() si pasaron más de interval segundos desde la última vez.
+
+        Args:
+            interval (float): Segundos entre lecturas de la base de datos.
+            now (float): Momento actual (por defecto, time.time()).
+        """
+        now = time.time() if now is None else now
+        if self.refreshed_at is None or now - self.refreshed_at >= interval:
+            self.refresh(now=now)
+
+
+def get_tracker():
+    """
+    Devuelve el rastreador de tendencias del proceso, creándolo la primera vez.
+
+    Returns:
+        TrendingTracker: Rastreador configurado con los ajustes TRENDING_*.
+    """
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = TrendingTracker(
+                window=getattr(settings, 'TRENDING_WINDOW', 86400),
+                half_life=getattr(settings, 'TRENDING_HALF_LIFE', 21600),
+                bucket_size=getattr(settings, 'TRENDING_BUCKET_SIZE', 300),
+                size=getattr(settings, 'TRENDING_SIZE', 10),
+                overlap=getattr(settings, 'TRENDING_REFRESH_OVERLAP', 60),
+                reconcile_interval=getattr(settings, 'TRENDING_RECONCILE_INTERVAL', 600),
+            )
+        return _tracker
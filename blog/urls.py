@@ -5,18 +5,33 @@ urlpatterns = [
     # Ruta para obtener la lista de publicaciones y crear nuevas
     path('', views.PostList.as_view(), name='post-list'),
 
+    # Ruta para obtener el timeline de inicio (publicaciones de las cuentas seguidas)
+    path('home/', views.HomeTimeline.as_view(), name='home-timeline'),
+
+    # Ruta para obtener varias publicaciones por sus ids (?ids=1,2,3)
+    path('batch/', views.batch_posts, name='post-batch'),
+
+    # Ruta para buscar publicaciones por su contenido (?q=)
+    path('search/', views.search_posts, name='post-search'),
+
+    # Ruta para obtener las etiquetas en tendencia
+    path('trending/', views.trending, name='trending'),
+
     # Ruta para obtener, actualizar y eliminar una publicación específica
     path('<int:pk>/', views.PostDetail.as_view(), name='post-detail'),
 
     # Ruta para obtener las publicaciones de un usuario específico
     path('my/<str:username>/', views.get_user_posts, name='user-posts'),
 
-    # Ruta para dar "me gusta" o quitar "me gusta" a una publicación
+    # Ruta para dar "me gusta" o quitar "me gusta" a una publicación (POST invierte, PUT pone, DELETE quita)
     path('like/<int:pk>/', views.like, name='like-post'),
 
-    # Ruta para compartir o dejar de compartir una publicación
+    # Ruta para compartir o dejar de compartir una publicación (POST invierte, PUT pone, DELETE quita)
     path('shared/<int:pk>/', views.shared, name='share-post'),
 
+    # Ruta para aplicar un lote de reacciones en una sola solicitud
+    path('reactions/', views.reactions, name='bulk-reactions'),
+
     # Ruta para obtener las publicaciones que le gustan a un usuario
     path('likes/<str:username>/', views.get_user_likes, name='user-likes'),
 
@@ -1,58 +1,139 @@
-from rest_framework import generics
+import re
+
+from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 
-from . models import Post, Comment
+from . models import ArchivedComment, ArchivedPost, ArchivedReaction, Post, PostLike, PostShare, Comment, TimelineEntry
 from users.models import User
-from . serializers import PostSerializer, MyPostSerializer, CommentSerializer
+from . serializers import PostSerializer, CommentSerializer, ReactionSerializer
+from .reactions import apply_reactions, set_reaction, toggle_reaction
+from .buffer import get_buffer
 from .permissions import IsUserOrReadOnly
-from backend.pagination import CustomPagination
+from .archive import TieredResults
+from .search import PostSearchResults
+from .hashtags import save_hashtags, update_hashtags
+from .trending import get_tracker
+from .timeline import fan_out_post, pull_celebrity_posts
+from backend.conditional import ConditionalGetMixin
+from backend.images import reset_variants, schedule_variants
+from backend.pagination import CommentPagination, FeedPagination, ProfilePagination, SearchPagination
+from backend.tasks import run_in_background
+from backend.uploads import StreamingUploadMixin
+from backend.versioning import version_bump
 from noti.models import Noti
 
+MAX_BULK_REACTIONS = 100
+MAX_BATCH_POSTS = 100
+BATCH_ID_RE = re.compile(r'[^,]+')
+
+def reaction_tab(request, username, kind):
+    """
+    Obtiene las publicaciones con una reacción del usuario, de la reacción más
+    reciente a la más antigua.
+
+    Pagina por keyset las filas de la reacción (PostLike/PostShare) con un
+    recorrido por rango del índice (user, created_at, id), mezcladas con las
+    reacciones archivadas de publicaciones del nivel frío.
+
+    Args:
+        request: Objeto de solicitud de Django.
+        username (str): Nombre de usuario.
+        kind (str): Tipo de reacción ('like' o 'shared').
+
+    Returns:
+        Response: Respuesta paginada con las publicaciones.
+    """
+    user = User.objects.get(username=username)
+    through = PostLike if kind == 'like' else PostShare
+    reactions = TieredResults(
+        through.objects.filter(user=user).select_related('post__user').order_by('-created_at', '-id'),
+        ArchivedReaction.objects.filter(user=user, kind=kind).select_related('post__user').order_by('-created_at', '-id'),
+        merge=True,
+    )
+    paginator = ProfilePagination()
+    page = paginator.paginate_queryset(reactions, request)
+    serializer = PostSerializer([reaction.post for reaction in page], many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_user_likes(request, username):
     """
-    Obtiene las publicaciones que le han gustado al usuario especificado.
+    Obtiene las publicaciones que le han gustado al usuario especificado,
+    ordenadas por la fecha del "me gusta".
 
     Args:
         request: Objeto de solicitud de Django.
         username (str): Nombre de usuario del usuario cuyas publicaciones le han gustado.
 
     Returns:
-        Response: Respuesta con las publicaciones que le han gustado al usuario.
+        Response: Respuesta paginada con las publicaciones que le han gustado al usuario.
     """
-    user = User.objects.get(username=username)
-    posts = Post.objects.filter(liked=user)
-    serializer = MyPostSerializer(posts, many=True)
-    return Response(serializer.data)
+    return reaction_tab(request, username, 'like')
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_user_shared(request, username):
     """
-    Obtiene las publicaciones compartidas por el usuario especificado.
+    Obtiene las publicaciones compartidas por el usuario especificado,
+    ordenadas por la fecha en que las compartió.
 
     Args:
         request: Objeto de solicitud de Django.
         username (str): Nombre de usuario del usuario que ha compartido publicaciones.
 
     Returns:
-        Response: Respuesta con las publicaciones compartidas por el usuario.
+        Response: Respuesta paginada con las publicaciones compartidas por el usuario.
     """
-    user = User.objects.get(username=username)
-    posts = Post.objects.filter(shared=user)
-    serializer = MyPostSerializer(posts, many=True)
-    return Response(serializer.data)
+    return reaction_tab(request, username, 'shared')
 
+def react(request, post, kind):
+    """
+    Aplica una reacción según el método HTTP de la solicitud.
 
-@api_view(['POST'])
+    Con REACTION_WRITE_BEHIND activo la reacción se acepta en el buffer de
+    escritura diferida y se escribe en el siguiente lote.
+
+    Args:
+        request: Objeto de solicitud de Django (POST invierte, PUT pone, DELETE quita).
+        post (Post): Publicación.
+        kind (str): Tipo de reacción ('like' o 'shared').
+
+    Returns:
+        bool: Estado de la reacción después de la acción.
+    """
+    write_behind = settings.REACTION_WRITE_BEHIND
+    if request.method == 'POST':
+        if write_behind:
+            return get_buffer().toggle_reaction(request.user, post, kind)
+        return toggle_reaction(request.user, post, kind)
+
+    value = request.method == 'PUT'
+    if write_behind:
+        get_buffer().set_reaction(request.user.pk, post.pk, kind, value)
+    else:
+        set_reaction(request.user, post, kind, value)
+    return value
+
+
+@api_view(['POST', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
 def like(request, pk):
     """
     Maneja la acción de dar o quitar "Me gusta" a una publicación.
 
+    Métodos HTTP admitidos:
+        - POST: Invierte el estado actual (da o quita "Me gusta").
+        - PUT: Da "Me gusta" (idempotente).
+        - DELETE: Quita el "Me gusta" (idempotente).
+
     Args:
         request: Objeto de solicitud de Django.
         pk (int): Clave primaria de la publicación.
@@ -60,22 +141,22 @@ def like(request, pk):
     Returns:
         Response: Respuesta indicando el estado de la acción.
     """
-    post = Post.objects.get(pk=pk)
-    if request.user in post.liked.all():
-        post.liked.remove(request.user)
-    else:
-        post.liked.add(request.user)
-        if request.user != post.user:
-            Noti.objects.get_or_create(type='le gusto tu publicación', post=post, to_user=post.user, from_user=request.user)
-    return Response({'status': 'ok'})
+    post = Post.objects.only('id', 'user_id').get(pk=pk)
+    liked = react(request, post, 'like')
+    return Response({'status': 'ok', 'liked': liked})
 
 
-@api_view(['POST'])
+@api_view(['POST', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
 def shared(request, pk):
     """
     Maneja la acción de compartir o dejar de compartir una publicación.
 
+    Métodos HTTP admitidos:
+        - POST: Invierte el estado actual (comparte o deja de compartir).
+        - PUT: Comparte la publicación (idempotente).
+        - DELETE: Deja de compartir la publicación (idempotente).
+
     Args:
         request: Objeto de solicitud de Django.
         pk (int): Clave primaria de la publicación.
@@ -83,14 +164,40 @@ def shared(request, pk):
     Returns:
         Response: Respuesta indicando el estado de la acción.
     """
-    post = Post.objects.get(pk=pk)
-    if request.user in post.shared.all():
-        post.shared.remove(request.user)
-    else:
-        post.shared.add(request.user)
-        if request.user != post.user:
-            Noti.objects.get_or_create(type='compartió tu publicación', post=post, to_user=post.user, from_user=request.user)
-    return Response({'status': 'ok'})
+    post = Post.objects.only('id', 'user_id').get(pk=pk)
+    is_shared = react(request, post, 'shared')
+    return Response({'status': 'ok', 'shared': is_shared})
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def reactions(request):
+    """
+    Aplica en una sola transacción un lote de reacciones del usuario actual.
+
+    Pensado para clientes con conexión intermitente que acumulan acciones y
+    las reenvían de una vez. Cada reacción es idempotente, así que reenviar
+    el mismo lote no cambia el resultado.
+
+    Cuerpo de la solicitud:
+        reactions (list): Lista de {'post': id, 'type': 'like'|'shared', 'value': bool}.
+
+    Args:
+        request: Objeto de solicitud de Django.
+
+    Returns:
+        Response: Resultado de cada reacción y los ids de publicaciones inexistentes.
+    """
+    if not isinstance(request.data, dict):
+        return Response({'detail': 'El cuerpo debe ser un objeto con la lista "reactions".'}, status=status.HTTP_400_BAD_REQUEST)
+    items = request.data.get('reactions', [])
+    # El límite se comprueba antes de validar cada elemento.
+    if isinstance(items, list) and len(items) > MAX_BULK_REACTIONS:
+        return Response({'detail': f'Máximo {MAX_BULK_REACTIONS} reacciones por solicitud.'}, status=status.HTTP_400_BAD_REQUEST)
+    serializer = ReactionSerializer(data=items, many=True)
+    serializer.is_valid(raise_exception=True)
+    results, missing = apply_reactions(request.user, serializer.validated_data)
+    return Response({'results': results, 'missing': missing})
 
 
 @api_view(['GET'])
@@ -99,39 +206,181 @@ def get_user_posts(request, username):
     """
     Obtiene las publicaciones del usuario especificado.
 
+    Las primeras páginas salen del nivel caliente; al agotarse continúa con
+    las publicaciones archivadas.
+
     Args:
         request: Objeto de solicitud de Django.
         username (str): Nombre de usuario del usuario cuyas publicaciones se desean obtener.
 
     Returns:
-        Response: Respuesta con las publicaciones del usuario.
+        Response: Respuesta paginada con las publicaciones del usuario.
     """
     user = User.objects.get(username=username)
-    posts = Post.objects.filter(user=user)
-    serializer = MyPostSerializer(posts, many=True)
-    return Response(serializer.data)
+    posts = TieredResults(
+        Post.objects.filter(user=user).select_related('user'),
+        ArchivedPost.objects.filter(user=user).select_related('user'),
+    )
+    paginator = ProfilePagination()
+    page = paginator.paginate_queryset(posts, request)
+    serializer = PostSerializer(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def batch_posts(request):
+    """
+    Obtiene varias publicaciones por sus ids en una sola solicitud.
+
+    Pensado para rehidratar las publicaciones que aparecen en notificaciones,
+    compartidos o timelines guardados en el cliente. Trae las publicaciones
+    con sus autores en una sola consulta (in_bulk + select_related) y el
+    estado del usuario actual (iliked/ishared) en una consulta por relación.
+    Los ids que no están en el nivel caliente se buscan entre las archivadas.
+
+    Query Parameters:
+        ids (str): Ids separados por comas (?ids=1,2,3); también se acepta ?ids=1&ids=2.
+
+    Args:
+        request: Objeto de solicitud de Django.
+
+    Returns:
+        Response: Publicaciones en el orden pedido (sin repetidos) y los ids
+            que no existen o fueron eliminados.
+    """
+    ids = []
+    seen = set()
+    for value in request.query_params.getlist('ids'):
+        # finditer no parte la cadena completa: se deja de leer al pasar el máximo.
+        for match in BATCH_ID_RE.finditer(value):
+            part = match.group().strip()
+            if not part:
+                continue
+            # isdigit() también acepta dígitos Unicode ('²') que int() rechaza.
+            if not (part.isascii() and part.isdigit()):
+                return Response({'detail': f'Id de publicación no válido: {part}'}, status=status.HTTP_400_BAD_REQUEST)
+            if int(part) not in seen:
+                seen.add(int(part))
+                ids.append(int(part))
+            if len(ids) > MAX_BATCH_POSTS:
+                return Response(
+                    {'detail': f'Máximo {MAX_BATCH_POSTS} publicaciones por solicitud.'}, status=status.HTTP_400_BAD_REQUEST
+                )
+
+    found = Post.objects.select_related('user').in_bulk(ids)
+    archived_ids = [post_id for post_id in ids if post_id not in found]
+    if archived_ids:
+        found.update(ArchivedPost.objects.select_related('user').in_bulk(archived_ids))
+    posts = [found[post_id] for post_id in ids if post_id in found]
+    missing = [post_id for post_id in ids if post_id not in found]
+    serializer = PostSerializer(posts, many=True, context={'request': request})
+    return Response({'posts': serializer.data, 'missing': missing})
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search_posts(request):
+    """
+    Busca publicaciones por su contenido con el índice de texto completo.
+
+    Los resultados se ordenan por relevancia y se paginan por número de
+    página (?page=N); ?count=true incluye el total.
+
+    Args:
+        request: Objeto de solicitud de Django con el parámetro ?q=.
+
+    Returns:
+        Response: Respuesta paginada con las publicaciones encontradas.
+    """
+    results = PostSearchResults(request.query_params.get('q', ''))
+    paginator = SearchPagination()
+    page = paginator.paginate_queryset(results, request)
+    serializer = PostSerializer(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def trending(request):
+    """
+    Obtiene las etiquetas en tendencia.
+
+    Se sirve desde el top-K en memoria del proceso, que incorpora los usos
+    nuevos de forma incremental como mucho cada TRENDING_REFRESH_INTERVAL
+    segundos; no agrega la tabla de publicaciones en cada solicitud.
+
+    Args:
+        request: Objeto de solicitud de Django.
 
-class PostList(generics.ListCreateAPIView):
+    Returns:
+        Response: Lista de etiquetas con sus usos en la ventana y su puntaje.
+    """
+    tracker = get_tracker()
+    tracker.refresh_if_stale(settings.TRENDING_REFRESH_INTERVAL)
+    return Response(tracker.top())
+
+class PostList(StreamingUploadMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     """
     Vista para listar y crear publicaciones.
 
+    La imagen se recibe por bloques y se rechaza en cuanto supera los límites
+    de tamaño o de dimensiones (StreamingUploadMixin).
+
     Attributes:
         queryset (QuerySet): Conjunto de datos de todas las publicaciones.
         serializer_class (PostSerializer): Clase del serializador para las publicaciones.
         permission_classes (list): Lista de clases de permisos requeridas para acceder a la vista.
-        pagination_class (CustomPagination): Clase de paginación personalizada.
+        pagination_class (FeedPagination): Paginación por cursor, sin total por defecto.
 
     Methods:
-        perform_create(self, serializer): Crea una nueva publicación asociada al usuario actual.
+        get_version_stamp(self, request): Obtiene la versión de la página para el ETag (GET responde 304 si no cambió).
+        paginate_queryset(self, queryset): Reutiliza la página cargada para el ETag.
+        perform_create(self, serializer): Crea una nueva publicación asociada al usuario actual,
+            guarda sus etiquetas y en segundo plano la reparte a los timelines de sus
+            seguidores y genera las variantes de su imagen.
     """
-    queryset = Post.objects.all()
+    queryset = Post.objects.select_related('user')
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = CustomPagination
+    pagination_class = FeedPagination
+
+    def get_queryset(self):
+        """
+        Obtiene las publicaciones del nivel caliente, que continúan con las
+        archivadas solo en las páginas que pasan del nivel caliente.
+
+        Returns:
+            TieredResults: Publicaciones calientes y archivadas con sus autores.
+        """
+        return TieredResults(super().get_queryset(), ArchivedPost.objects.select_related('user'))
+
+    def get_version_stamp(self, request, *args, **kwargs):
+        """
+        Obtiene la versión de la página pedida sin serializarla.
+
+        Pagina el queryset una sola vez y guarda la página: si el cliente no
+        tiene esta versión, paginate_queryset() la reutiliza en vez de
+        repetir las consultas. El ETag cambia si la página gana, pierde o
+        modifica alguna publicación (o cambia su autor), o si cambia el total
+        (solo con ?page=).
+
+        Returns:
+            list: Partes de la versión.
+        """
+        self.stamped_page = super().paginate_queryset(self.filter_queryset(self.get_queryset()))
+        meta = self.paginator.get_paginated_response([]).data['meta']
+        return [meta, [(post.pk, post.version, post.user.version) for post in self.stamped_page]]
+
+    def paginate_queryset(self, queryset):
+        """
+        Devuelve la página ya cargada por get_version_stamp() o la pagina.
+        """
+        page = getattr(self, 'stamped_page', None)
+        return page if page is not None else super().paginate_queryset(queryset)
 
     def perform_create(self, serializer):
         """
-        Crea una nueva publicación asociada al usuario actual.
+        Crea una nueva publicación asociada al usuario actual y guarda sus
+        etiquetas. En segundo plano la reparte a los timelines de sus
+        seguidores y genera las variantes de su imagen.
 
         Args:
             serializer: Instancia del serializador de la publicación.
@@ -139,21 +388,133 @@ class PostList(generics.ListCreateAPIView):
         Returns:
             None
         """
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            post = serializer.save(user=self.request.user)
+            save_hashtags(post)
+        run_in_background(fan_out_post, post.pk)
+        schedule_variants(post, 'image')
+
+class HomeTimeline(generics.ListAPIView):
+    """
+    Vista para listar el timeline de inicio del usuario actual.
+
+    Lee el timeline materializado (TimelineEntry) con un único recorrido por
+    rango del índice, después de traer las publicaciones recientes de las
+    cuentas muy seguidas que no se reparten al escribir.
+
+    Attributes:
+        serializer_class (PostSerializer): Clase del serializador para las publicaciones.
+        permission_classes (list): Lista de clases de permisos requeridas para acceder a la vista.
+        pagination_class (FeedPagination): Paginación por cursor, sin total por defecto.
+    """
+    serializer_class = PostSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = FeedPagination
+
+    def get_queryset(self):
+        """
+        Obtiene las entradas del timeline del usuario actual.
+
+        Returns:
+            QuerySet: Entradas del timeline con la publicación y su autor precargados.
+        """
+        return TimelineEntry.objects.filter(user=self.request.user).select_related('post__user')
+
+    def list(self, request, *args, **kwargs):
+        """
+        Devuelve una página del timeline de inicio.
+
+        Args:
+            request: Objeto de solicitud de Django.
+
+        Returns:
+            Response: Respuesta paginada con las publicaciones del timeline.
+        """
+        pull_celebrity_posts(request.user)
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer([entry.post for entry in page], many=True)
+        return self.get_paginated_response(serializer.data)
 
-class PostDetail(generics.RetrieveUpdateDestroyAPIView):
+class PostDetail(StreamingUploadMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Vista para obtener, actualizar y eliminar una publicación específica.
 
+    GET responde con ETag, y 304 si el cliente ya tiene la versión actual.
+    Las imágenes nuevas se reciben por bloques con límites de tamaño (StreamingUploadMixin).
+
     Attributes:
         queryset (QuerySet): Conjunto de datos de todas las publicaciones.
         serializer_class (PostSerializer): Clase del serializador para las publicaciones.
         permission_classes (list): Lista de clases de permisos requeridas para acceder a la vista.
+
+    Methods:
+        get_version_stamp(self, request, pk): Obtiene la versión de la publicación y de su autor.
+        get_object(self): Obtiene la publicación, también si está archivada (solo lectura).
+        perform_update(self, serializer): Guarda los cambios y aumenta la versión de la publicación.
     """
-    queryset = Post.objects.all()
+    queryset = Post.objects.select_related('user')
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticated, IsUserOrReadOnly]
 
+    def get_version_stamp(self, request, *args, **kwargs):
+        """
+        Obtiene la versión de la publicación y de su autor sin serializarla.
+
+        Las reacciones del usuario actual también aumentan la versión de la
+        publicación, así que iliked/ishared quedan cubiertos.
+
+        Returns:
+            list: Partes de la versión o None si no existe.
+        """
+        row = Post.objects.filter(pk=kwargs['pk']).values_list('version', 'user__version').first()
+        if row is None:
+            row = ArchivedPost.objects.filter(pk=kwargs['pk']).values_list('version', 'user__version').first()
+        return list(row) if row is not None else None
+
+    def get_object(self):
+        """
+        Obtiene la publicación del nivel caliente o, para leerla o eliminarla,
+        la archivada con ese id. Las publicaciones archivadas no se editan.
+
+        Returns:
+            Post | ArchivedPost: Publicación solicitada.
+        """
+        try:
+            return super().get_object()
+        except Http404:
+            if self.request.method not in ('GET', 'HEAD', 'DELETE'):
+                raise
+        post = get_object_or_404(ArchivedPost.objects.select_related('user'), pk=self.kwargs['pk'])
+        self.check_object_permissions(self.request, post)
+        return post
+
+    def perform_update(self, serializer):
+        """
+        Guarda los cambios de la publicación y aumenta su versión para que
+        la caché de fragmentos no devuelva el contenido anterior. Si cambia
+        el contenido, sincroniza sus etiquetas y resta de las tendencias las
+        que se quitaron. Si cambia la imagen, descarta sus variantes y genera
+        las nuevas en segundo plano.
+
+        Args:
+            serializer: Instancia del serializador de la publicación.
+
+        Returns:
+            None
+        """
+        image_changed = 'image' in serializer.validated_data
+        if image_changed:
+            reset_variants(serializer.instance, 'image')
+        with transaction.atomic():
+            # Post.save() aumenta version y updated_at.
+            post = serializer.save()
+            if 'content' in serializer.validated_data:
+                removed = update_hashtags(post)
+                if removed:
+                    transaction.on_commit(lambda: get_tracker().forget(removed))
+        if image_changed:
+            schedule_variants(post, 'image')
+
 class CommentDetail(generics.RetrieveUpdateDestroyAPIView):
     """
     Vista de detalle, actualización y eliminación de un comentario.
@@ -167,6 +528,22 @@ class CommentDetail(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated, IsUserOrReadOnly]
 
+    def perform_destroy(self, instance):
+        """
+        Elimina el comentario y descuenta el contador de comentarios de la publicación.
+
+        Args:
+            instance (Comment): Comentario a eliminar.
+
+        Returns:
+            None
+        """
+        with transaction.atomic():
+            instance.delete()
+            Post.objects.filter(pk=instance.post_id, comments_count__gt=0).update(
+                comments_count=F('comments_count') - 1, **version_bump()
+            )
+
 class CommentList(generics.ListCreateAPIView):
     """
     Vista para obtener la lista de comentarios asociados a una publicación y crear nuevos comentarios.
@@ -175,11 +552,13 @@ class CommentList(generics.ListCreateAPIView):
         queryset (QuerySet): Conjunto de datos que representa todos los comentarios.
         serializer_class (CommentSerializer): Clase del serializador asociado a los comentarios.
         permission_classes (list): Lista de clases de permisos requeridos para acceder a la vista.
+        pagination_class (CommentPagination): Paginación por cursor ("cargar más antiguos").
     """
     
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CommentPagination
 
     def get_object(self, pk):
         """
@@ -196,19 +575,25 @@ class CommentList(generics.ListCreateAPIView):
 
     def get(self, request, pk):
         """
-        Obtiene todos los comentarios asociados a una publicación.
+        Obtiene una página de los comentarios asociados a una publicación,
+        de los más nuevos a los más antiguos; meta.next carga los anteriores.
+        Si la publicación está archivada, lee sus comentarios archivados.
 
         Args:
             request: Objeto de solicitud de Django.
             pk (int): Clave primaria de la publicación.
 
         Returns:
-            Response: Respuesta con los comentarios asociados a la publicación.
+            Response: Respuesta paginada con los comentarios asociados a la publicación.
         """
-        post = self.get_object(pk)
-        comments = Comment.objects.filter(post=post)
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data)
+        if Post.objects.filter(pk=pk).exists():
+            comments = Comment.objects.filter(post_id=pk).select_related('user')
+        else:
+            post = get_object_or_404(ArchivedPost, pk=pk)
+            comments = ArchivedComment.objects.filter(post=post).select_related('user')
+        page = self.paginate_queryset(comments)
+        serializer = CommentSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
     def create(self, request, pk):
         """
@@ -228,7 +613,9 @@ class CommentList(generics.ListCreateAPIView):
             body=data['body'],
             post=post
                 )
-        comment.save()
+        with transaction.atomic():
+            comment.save()
+            Post.objects.filter(pk=post.pk).update(comments_count=F('comments_count') + 1, **version_bump())
         if request.user != post.user:
             Noti.objects.get_or_create(type='Comentó tu publicación', post=post, to_user=post.user, from_user=request.user)
         serializer = CommentSerializer(comment, many=False)
@@ -8,7 +8,15 @@ class Chat(models.Model):
         username (str): Nombre de usuario asociado al mensaje.
         message (str): Contenido del mensaje.
         canal (str): Nombre del canal de chat al que pertenece el mensaje.
+
+    Meta:
+        indexes: Índice para obtener los mensajes de un canal.
     """
     username = models.CharField(max_length=50)
     message = models.CharField(max_length=50)
     canal = models.CharField(max_length=50)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['canal'], name='chat_chat_canal_idx'),
+        ]
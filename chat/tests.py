@@ -1,4 +1,7 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
+from testutils.queryplan import QueryPlanMixin
+from users.models import User
 from chat.models import Chat
 
 class ChatModelTests(TestCase):
@@ -20,3 +23,30 @@ class ChatModelTests(TestCase):
         self.assertEqual(chat.username, 'user1')
         self.assertEqual(chat.message, 'Que bolá, bro!')
         self.assertEqual(chat.canal, 'general')
+
+class ChatQueryPlanTests(QueryPlanMixin, TestCase):
+    """
+    Pruebas de regresión del plan de consultas del chat.
+
+    Métodos:
+        test_chat_uses_indexes(): Verifica que la vista chat no recorre tablas completas.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configura datos de prueba para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+        cls.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpass123')
+        Chat.objects.create(username='user1', message='Hola', canal='chat_user1-user2')
+        Chat.objects.create(username='user2', message='Otro canal', canal='chat_user2-user3')
+
+    def test_chat_uses_indexes(self):
+        """
+        Verifica que la vista chat no recorre tablas completas.
+        """
+        client = APIClient()
+        client.force_authenticate(user=self.user1)
+        response = self.assertQueriesUseIndexes(lambda: client.get('/chat/canal/user2/'))
+        self.assertEqual(len(response.data), 1)
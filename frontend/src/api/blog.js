@@ -27,32 +27,35 @@ export const addComment = async (data) => {
 }
 
 /**
- * Obtiene los comentarios asociados a una publicación.
+ * Obtiene una página de los comentarios asociados a una publicación.
  * @param {number} id - Identificador de la publicación.
- * @returns {Promise} - Promesa que se resuelve con los comentarios de la publicación.
+ * @param {string} cursor - Cursor de la página (meta.next de la anterior); vacío para la primera.
+ * @returns {Promise} - Promesa que se resuelve con {data, meta}.
  */
-export const getComments = async (id) => { 
-  const response = await authAxios.get(`/${blogURL}/comments/${id}/`);
+export const getComments = async (id, cursor = '') => { 
+  const response = await authAxios.get(`/${blogURL}/comments/${id}/?cursor=${encodeURIComponent(cursor)}`);
   return response.data;
 }
 
 /**
- * Obtiene las publicaciones que le gustan a un usuario.
+ * Obtiene una página de las publicaciones que le gustan a un usuario.
  * @param {string} username - Nombre de usuario del usuario.
- * @returns {Promise} - Promesa que se resuelve con las publicaciones que le gustan al usuario.
+ * @param {string} cursor - Cursor de la página (meta.next de la anterior); vacío para la primera.
+ * @returns {Promise} - Promesa que se resuelve con {data, meta}.
  */
-export const getUserLikes = async (username)  => {
-  const response = await authAxios.get(`/${blogURL}/likes/${username}/`);
+export const getUserLikes = async (username, cursor = '')  => {
+  const response = await authAxios.get(`/${blogURL}/likes/${username}/?cursor=${encodeURIComponent(cursor)}`);
   return response.data;
 }
 
 /**
- * Obtiene las publicaciones compartidas por un usuario.
+ * Obtiene una página de las publicaciones compartidas por un usuario.
  * @param {string} username - Nombre de usuario del usuario.
- * @returns {Promise} - Promesa que se resuelve con las publicaciones compartidas por el usuario.
+ * @param {string} cursor - Cursor de la página (meta.next de la anterior); vacío para la primera.
+ * @returns {Promise} - Promesa que se resuelve con {data, meta}.
  */
-export const getUserShared = async (username)  => {
-  const response = await authAxios.get(`/${blogURL}/shared/${username}/`);
+export const getUserShared = async (username, cursor = '')  => {
+  const response = await authAxios.get(`/${blogURL}/shared/${username}/?cursor=${encodeURIComponent(cursor)}`);
   return response.data;
 }
 
@@ -99,14 +102,14 @@ export const editPost = async (data) => {
 }
 
 /**
- * Obtiene las publicaciones de un usuario.
+ * Obtiene una página de las publicaciones de un usuario.
  * @param {string} username - Nombre de usuario del usuario.
- * @returns {Promise} - Promesa que se resuelve con las publicaciones del usuario.
+ * @param {string} cursor - Cursor de la página (meta.next de la anterior); vacío para la primera.
+ * @returns {Promise} - Promesa que se resuelve con {data, meta}.
  */
-export const getUserPosts = async (username) => {
-  const response = await authAxios.get(`/${blogURL}/my/${username}/`);
+export const getUserPosts = async (username, cursor = '') => {
+  const response = await authAxios.get(`/${blogURL}/my/${username}/?cursor=${encodeURIComponent(cursor)}`);
   return response.data;
-
 }
 
 /**
@@ -118,12 +121,12 @@ export const addPost = async (data) => {
 }
 
 /**
- * Obtiene las publicaciones paginadas.
- * @param {object} params - Parámetros de paginación.
+ * Obtiene las publicaciones paginadas por cursor.
+ * @param {object} params - Parámetros de paginación (pageParam es el cursor de meta.next).
  * @returns {Promise} - Promesa que se resuelve con las publicaciones paginadas.
  */
-export const getPosts = async ({ pageParam = 1 }) => {
-  const response = await authAxios.get(`/${blogURL}/?page=${pageParam}&pages=10`);
+export const getPosts = async ({ pageParam = '' }) => {
+  const response = await authAxios.get(`/${blogURL}/?cursor=${encodeURIComponent(pageParam)}`);
   return response.data;
 }
 
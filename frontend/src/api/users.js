@@ -62,6 +62,17 @@ export const userProfile = async (username) => {
   return res.data;
 };
 
+/**
+ * Obtiene una página de los seguidores de un usuario.
+ * @param {string} username - Nombre de usuario del usuario.
+ * @param {string} cursor - Cursor de la página (meta.next de la anterior); vacío para la primera.
+ * @returns {Promise} - Promesa que se resuelve con {data, meta}.
+ */
+export const followers = async (username, cursor = "") => {
+  const res = await authAxios.get(`/${usersURL}/${username}/followers/?cursor=${cursor}`);
+  return res.data;
+};
+
 /**
  * Realiza una solicitud de registro de usuario.
  * @param {object} data - Datos de registro del usuario.
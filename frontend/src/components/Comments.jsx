@@ -1,6 +1,7 @@
-import { useQuery, useQueryClient, useMutation } from "@tanstack/react-query"
+import { useInfiniteQuery, useQueryClient, useMutation } from "@tanstack/react-query"
 import { getComments, deleteComment } from "../api/blog"
 import Loader from "./Loader"
+import LoadMore from "./LoadMore"
 import toast from "react-hot-toast"
 import AddComment from "./AddComment"
 import { Link } from "react-router-dom"
@@ -29,11 +30,14 @@ const Comments = ({ post }) => {
   const [editingCommentId, setEditingCommentId] = useState(null); 
   const user = localStorage.getItem("username");
 
-  // Consulta los comentarios de la publicación.
-  const { data: comments, isLoading, isError, error } = useQuery({
+  // Consulta los comentarios de la publicación, por páginas (cursor en meta.next).
+  const commentsQuery = useInfiniteQuery({
     queryKey: ["comments", post.id],
-    queryFn: () => getComments(post.id)
+    queryFn: ({ pageParam = '' }) => getComments(post.id, pageParam),
+    getNextPageParam: (lastPage) => lastPage?.meta?.next || undefined,
   })
+  const { data, isLoading, isError, error } = commentsQuery
+  const comments = data?.pages.flatMap((page) => page.data) ?? []
 
   // Mutación para eliminar un comentario.
   const deleteCommentMutation = useMutation({
@@ -102,6 +106,7 @@ const Comments = ({ post }) => {
           </div>
         </div>
       ))}
+      <LoadMore query={commentsQuery} label="Cargar comentarios más antiguos" />
     </>
 
   )
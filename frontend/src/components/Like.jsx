@@ -32,18 +32,10 @@ const Like = ({ p, user = localStorage.getItem("user_id") }) => {
     }
   })
 
-  const found = p.liked.some((key) => {
-    if(key == user){
-      return true
-    } else {
-      return false
-    }
-  })
-
   return (
     <AiFillHeart 
       onClick={() => likeMutation.mutate(p.id)}
-      { ...p.iliked || found ? {color: 'red'} : {color: 'white'} }
+      { ...p.iliked ? {color: 'red'} : {color: 'white'} }
       size={20} />
   )
 }
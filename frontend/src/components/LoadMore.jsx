@@ -0,0 +1,32 @@
+import Loader from "./Loader";
+
+/**
+ * Componente LoadMore.
+ * 
+ * Un botón para cargar la siguiente página de una consulta paginada por cursor
+ * (useInfiniteQuery). No se muestra si no hay más páginas.
+ * 
+ * @component
+ * @param {Object} props - Las propiedades pasadas al componente.
+ * @param {Object} props.query - Resultado de useInfiniteQuery (hasNextPage, isFetchingNextPage, fetchNextPage).
+ * @param {string} props.label - Texto del botón.
+ * 
+ * @returns {JSX.Element} El botón, un indicador de carga o nada.
+ */
+const LoadMore = ({ query, label = "Cargar más" }) => {
+  if (query.isFetchingNextPage) return <Loader />;
+  if (!query.hasNextPage) return null;
+
+  return (
+    <div className="flex justify-center p-5">
+      <button
+        className="text-sky-500 hover:underline"
+        onClick={() => query.fetchNextPage()}
+      >
+        {label}
+      </button>
+    </div>
+  );
+};
+
+export default LoadMore;
@@ -1,8 +1,9 @@
-import { useQuery } from "@tanstack/react-query"
+import { useInfiniteQuery } from "@tanstack/react-query"
 import { AiOutlineMessage } from "react-icons/ai"
 import { getUserLikes } from "../api/blog"
 import { toast } from "react-hot-toast"
 import Loader from "./Loader"
+import LoadMore from "./LoadMore"
 import Like from "./Like"
 import Shared from "./Shared"
 import { Link } from "react-router-dom"
@@ -29,10 +30,15 @@ const MyLikes = ({ user }) => {
   const APIbaseURL = "http://127.0.0.1:8000"; // process.env.REACT_APP_API_BASE_URL;
   const userId = localStorage.getItem('user_id')
 
-  const { data: likes, isLoading, isError, error } = useQuery({
-    queryKey: ["posts"],
-    queryFn: () => getUserLikes(user.username),
+  // Pestaña paginada por cursor (meta.next); la clave empieza por "posts"
+  // para que se actualice junto con las demás publicaciones.
+  const query = useInfiniteQuery({
+    queryKey: ["posts", "likes", user.username],
+    queryFn: ({ pageParam = '' }) => getUserLikes(user.username, pageParam),
+    getNextPageParam: (lastPage) => lastPage?.meta?.next || undefined,
   })
+  const { data, isLoading, isError, error } = query
+  const likes = data?.pages.flatMap((page) => page.data) ?? []
 
   if (isLoading) return <Loader />
   if (isError) return toast.error(error.message)
@@ -77,7 +83,7 @@ const MyLikes = ({ user }) => {
                       </Link>
 
                       <p>
-                        {p.parent.length}
+                        {p.comments_count}
                       </p>
 
           </div>
@@ -102,6 +108,7 @@ const MyLikes = ({ user }) => {
   </div>
 
     ))}
+    <LoadMore query={query} />
     </>
 
   )
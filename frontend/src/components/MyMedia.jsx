@@ -1,3 +1,5 @@
+import LoadMore from "./LoadMore";
+
 /**
  * Componente MyMedia.
  * 
@@ -6,10 +8,11 @@
  * @component
  * @param {Object} props - Las propiedades pasadas al componente.
  * @param {Array} props.posts - La lista de publicaciones con imágenes a mostrar.
+ * @param {Object} props.query - Consulta paginada de las publicaciones, para cargar más.
  * 
  * @returns {JSX.Element} El componente MyMedia con las imágenes de las publicaciones.
  */
-const MyMedia = ({ posts }) => {
+const MyMedia = ({ posts, query }) => {
   const APIbaseURL = "http://127.0.0.1:8000"; // process.env.REACT_APP_API_BASE_URL;
 
   return (
@@ -28,6 +31,9 @@ const MyMedia = ({ posts }) => {
             </div>
           : '' 
         ))}
+      <div style={{ clear: 'both' }}>
+        {query && <LoadMore query={query} />}
+      </div>
     </>
 
   )
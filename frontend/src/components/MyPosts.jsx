@@ -4,9 +4,10 @@ import {
 } from "react-icons/ai";
 import { BsFillTrashFill } from "react-icons/bs";
 import { getUserPosts, deletePost } from "../api/blog";
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import { useInfiniteQuery, useMutation, useQueryClient } from "@tanstack/react-query";
 import toast from "react-hot-toast";
 import Loader from "./Loader";
+import LoadMore from "./LoadMore";
 import EditPost from "./EditPost";
 import { Link } from "react-router-dom";
 import { useState } from "react";
@@ -48,10 +49,14 @@ const MyPosts = ({ user, myUser, posts }) => {
     }
   })
 
-  const { data, isLoading, isError, error } = useQuery({
-  queryKey: ["posts", user.username],
-  queryFn: () => getUserPosts(user.username),
+  // Publicaciones paginadas por cursor (meta.next).
+  const query = useInfiniteQuery({
+    queryKey: ["posts", user.username],
+    queryFn: ({ pageParam = '' }) => getUserPosts(user.username, pageParam),
+    getNextPageParam: (lastPage) => lastPage?.meta?.next || undefined,
   })
+  const { isLoading, isError, error } = query
+  const data = query.data?.pages.flatMap((page) => page.data) ?? []
 
 
   if(deletePostsMutation.isLoading) return <Loader/>
@@ -98,7 +103,7 @@ const MyPosts = ({ user, myUser, posts }) => {
             <Link to={`../post/${p.id}`}>
               <AiOutlineMessage size={20} />
             </Link>
-              <p>{p.parent.length}</p>
+              <p>{p.comments_count}</p>
           </div>
 
           <div className="flex flex-row items-center text-neutral-500 gap-2 cursor-pointer transition hover:text-green-500">
@@ -138,6 +143,7 @@ const MyPosts = ({ user, myUser, posts }) => {
   </div>
 
     ))}
+    <LoadMore query={query} />
     </>
   )
 }
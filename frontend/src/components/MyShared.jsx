@@ -1,8 +1,9 @@
-import { useQuery } from "@tanstack/react-query"
+import { useInfiniteQuery } from "@tanstack/react-query"
 import { AiOutlineMessage } from "react-icons/ai"
 import { getUserShared } from "../api/blog"
 import { toast } from "react-hot-toast"
 import Loader from "./Loader"
+import LoadMore from "./LoadMore"
 import Like from "./Like"
 import Shared from "./Shared"
 import { Link } from "react-router-dom"
@@ -29,10 +30,15 @@ const MyShared = ({ user }) => {
   const APIbaseURL = "http://127.0.0.1:8000"; // process.env.REACT_APP_API_BASE_URL;
   const userId = localStorage.getItem('user_id')
 
-  const { data: shared, isLoading, isError, error } = useQuery({
-    queryKey: ["posts"],
-    queryFn: () => getUserShared(user.username),
+  // Pestaña paginada por cursor (meta.next); la clave empieza por "posts"
+  // para que se actualice junto con las demás publicaciones.
+  const query = useInfiniteQuery({
+    queryKey: ["posts", "shared", user.username],
+    queryFn: ({ pageParam = '' }) => getUserShared(user.username, pageParam),
+    getNextPageParam: (lastPage) => lastPage?.meta?.next || undefined,
   })
+  const { data, isLoading, isError, error } = query
+  const shared = data?.pages.flatMap((page) => page.data) ?? []
 
   if (isLoading) return <Loader />
   if (isError) return toast.error(error.message)
@@ -81,7 +87,7 @@ const MyShared = ({ user }) => {
                       </Link>
 
                       <p>
-                        {p.parent.length}
+                        {p.comments_count}
                       </p>
 
           </div>
@@ -107,6 +113,7 @@ const MyShared = ({ user }) => {
 
     ))}
     </div>
+    <LoadMore query={query} />
     </>
   )
 }
@@ -31,19 +31,11 @@ const Shared = ({ p, user = localStorage.getItem("user_id") }) => {
     }
   })
 
-  const found = p.shared.some((key) => {
-    if(key == user){
-      return true
-    } else {
-      return false
-    }
-  })
-
   return (
 
     <AiOutlineRetweet size={20}
       onClick={() => SharedMutation.mutate(p.id)}
-      { ...p.ishared || found ? {color: 'green'} : {color: 'white'}}
+      { ...p.ishared ? {color: 'green'} : {color: 'white'}}
       />
   )
 }
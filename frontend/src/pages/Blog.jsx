@@ -107,7 +107,7 @@ const Blog = () => {
                           <AiOutlineMessage size={20} />
                         </Link>
 
-                        <p>{p.parent.length}</p>
+                        <p>{p.comments_count}</p>
                       </div>
 
                       <div className="flex flex-row items-center text-neutral-500 gap-2 cursor-pointer transition hover:text-green-500">
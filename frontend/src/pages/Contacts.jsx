@@ -1,6 +1,7 @@
 import { Link } from "react-router-dom";
-import { userProfile } from "../api/users";
-import { useQuery } from "@tanstack/react-query";
+import { followers } from "../api/users";
+import { useInfiniteQuery } from "@tanstack/react-query";
+import LoadMore from "../components/LoadMore";
 
 
 /**
@@ -12,11 +13,13 @@ const Contacts = () => {
   const APIbaseURL = "http://127.0.0.1:8000"; // process.env.REACT_APP_API_BASE_URL;
   const username = localStorage.getItem("username");
 
-  // Obtiene la información del perfil del usuario, incluyendo los contactos seguidos.
-  const { data } = useQuery({
+  // Seguidores del usuario, paginados por cursor (meta.next).
+  const contactsQuery = useInfiniteQuery({
     queryKey: ["contacts"],
-    queryFn: () => userProfile(username),
+    queryFn: ({ pageParam = "" }) => followers(username, pageParam),
+    getNextPageParam: (lastPage) => lastPage?.meta?.next || undefined,
   });
+  const contacts = contactsQuery.data?.pages.flatMap((page) => page.data) ?? [];
 
 
   return (
@@ -33,7 +36,7 @@ const Contacts = () => {
       </div>
       
       {/* Lista de contactos */}
-      {data?.followed_usernames?.map((contact) => (
+      {contacts.map((contact) => (
         <Link key={contact.username} to={`/chat/${contact.username}`}>
           <div className="border-b-[1px] border-neutral-800 p-5 cursor-pointer hover:bg-neutral-900 transition">
             <div className="flex flex-row items-start gap-3">
@@ -57,6 +60,8 @@ const Contacts = () => {
           </div>
         </Link>
       ))}
+
+      <LoadMore query={contactsQuery} />
     </>
   );
 };
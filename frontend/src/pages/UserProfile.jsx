@@ -1,6 +1,6 @@
 import { useParams, Link} from "react-router-dom"
 import { useState } from "react"
-import { useQuery } from "@tanstack/react-query"
+import { useQuery, useInfiniteQuery } from "@tanstack/react-query"
 import { getUserData } from "../api/users"
 import Loader from "../components/Loader"
 import { AiOutlineArrowLeft,} from "react-icons/ai";
@@ -50,11 +50,14 @@ const UserProfile = () => {
     queryFn: () => getUserData(username),
   })
 
-  // Obtiene las publicaciones del usuario mediante una consulta.
-  const { data: posts, isLoading: loadingPosts, isError: isErrorPosts, error: errorPosts } = useQuery({
-    queryFn: () => getUserPosts(username),
-    queryKey: ['user_posts']
+  // Obtiene las publicaciones del usuario, por páginas (misma consulta que MyPosts).
+  const postsQuery = useInfiniteQuery({
+    queryKey: ["posts", username],
+    queryFn: ({ pageParam = '' }) => getUserPosts(username, pageParam),
+    getNextPageParam: (lastPage) => lastPage?.meta?.next || undefined,
   })
+  const { isLoading: loadingPosts, isError: isErrorPosts, error: errorPosts } = postsQuery
+  const posts = postsQuery.data?.pages.flatMap((page) => page.data) ?? []
 
   if(loadingPosts) return <Loader />
   if(isErrorPosts) return <div>Error: {errorPosts.message}</div>
@@ -171,7 +174,7 @@ const UserProfile = () => {
       </div>
         {show === 0 && <MyPosts user={user} posts={posts} myUser={myUser} />}
         {show === 1 && <MyShared user={user} />}
-        {show === 2 && <MyMedia posts={posts} />}
+        {show === 2 && <MyMedia posts={posts} query={postsQuery} />}
         {show === 3 && <MyLikes user={user} />}
 
     </>
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-18 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('noti', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='noti',
+            index=models.Index(fields=['to_user', 'is_read', '-created_at'], name='noti_to_user_read_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='noti',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['to_user', '-created_at'], name='noti_unread_idx'),
+        ),
+    ]
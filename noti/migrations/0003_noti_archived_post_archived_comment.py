@@ -0,0 +1,25 @@
+# Generated by Django 4.2 on 2026-10-18 08:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_reaction_through_models'),
+        ('noti', '0002_noti_noti_to_user_read_created_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='noti',
+            name='archived_comment',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.archivedcomment'),
+        ),
+        migrations.AddField(
+            model_name='noti',
+            name='archived_post',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.archivedpost'),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 from users.models import User
-from blog.models import Post, Comment
+from blog.models import ArchivedComment, ArchivedPost, Post, Comment
 
 class Noti(models.Model):
     """
@@ -12,19 +12,46 @@ class Noti(models.Model):
         to_user (User): Usuario que recibe la notificación.
         post (Post): Post asociado a la notificación (opcional).
         comment (Comment): Comentario asociado a la notificación (opcional).
+        archived_post (ArchivedPost): Publicación asociada, si se archivó (blog/archive.py).
+        archived_comment (ArchivedComment): Comentario asociado, si se archivó.
         created_at (datetime): Fecha y hora de creación de la notificación.
         is_read (bool): Indica si la notificación ha sido leída.
 
     Meta:
         ordering: Lista de campos utilizados para ordenar las notificaciones por fecha de creación.
+        indexes: Índices para listar las notificaciones leídas o no leídas de un usuario.
     """
     type = models.CharField(max_length=40)
     from_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='noti_from')
     to_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='noti_to')
     post = models.ForeignKey(Post, on_delete=models.CASCADE, null=True, blank=True)
     comment = models.ForeignKey(Comment, on_delete=models.CASCADE, null=True, blank=True)
+    archived_post = models.ForeignKey(ArchivedPost, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    archived_comment = models.ForeignKey(ArchivedComment, on_delete=models.CASCADE, null=True, blank=True,
+                                         related_name='+')
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['to_user', 'is_read', '-created_at'], name='noti_to_user_read_created_idx'),
+            # SQLite compila is_read=False como NOT is_read y no puede buscar por
+            # esa columna en el índice anterior; el índice parcial sí le sirve.
+            models.Index(fields=['to_user', '-created_at'], condition=models.Q(is_read=False),
+                         name='noti_unread_idx'),
+        ]
+
+    @property
+    def target_post(self):
+        """
+        Publicación de la notificación, esté en el nivel caliente o archivada.
+        """
+        return self.post if self.post_id is not None else self.archived_post
+
+    @property
+    def target_comment_id(self):
+        """
+        Id del comentario de la notificación, esté en el nivel caliente o archivado.
+        """
+        return self.comment_id if self.comment_id is not None else self.archived_comment_id
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from . models import Noti
+from backend.images import VariantImageField
 from blog.serializers import MyPostSerializer
 
 class NotiSerializer(serializers.ModelSerializer):
@@ -8,9 +9,10 @@ class NotiSerializer(serializers.ModelSerializer):
 
     Atributos:
         to_user (str): Nombre de usuario del destinatario de la notificación.
-        avatar (str): URL del avatar del remitente de la notificación.
+        avatar (str): URL del avatar (variante pequeña si existe) del remitente de la notificación.
         from_user (str): Nombre de usuario del remitente de la notificación.
-        post (MyPostSerializer): Serializador del modelo Post asociado (solo lectura).
+        post (MyPostSerializer): Publicación asociada (solo lectura), también si está archivada.
+        comment (int): Id del comentario asociado, también si está archivado.
 
     Meta:
         model: Modelo asociado al serializador (Noti).
@@ -20,13 +22,15 @@ class NotiSerializer(serializers.ModelSerializer):
         get_avatar(obj): Obtiene la URL del avatar del usuario asociado a la notificación.
     """
     to_user = serializers.ReadOnlyField(source='to_user.username')
-    avatar = serializers.ReadOnlyField(source='from_user.avatar.url')
+    avatar = VariantImageField(source='from_user.avatar', variants_field='avatar_variants', size='small',
+                               absolute=False, read_only=True)
     from_user = serializers.ReadOnlyField(source='from_user.username')
-    post = MyPostSerializer(read_only=True)
+    post = MyPostSerializer(source='target_post', read_only=True)
+    comment = serializers.ReadOnlyField(source='target_comment_id')
 
     class Meta:
         model = Noti
-        fields = '__all__'
+        exclude = ['archived_post', 'archived_comment']
 
     def get_avatar(self, obj):
         """
@@ -1,4 +1,6 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
+from testutils.queryplan import QueryPlanMixin
 from users.models import User
 from blog.models import Post, Comment
 from noti.models import Noti
@@ -43,3 +45,32 @@ class NotiModelTests(TestCase):
         self.assertEqual(noti.post, self.post)
         self.assertEqual(noti.comment, self.comment)
         self.assertFalse(noti.is_read)
+
+class NotiQueryPlanTests(QueryPlanMixin, TestCase):
+    """
+    Pruebas de regresión del plan de consultas de las notificaciones.
+
+    Métodos:
+        test_unread_notifications_use_indexes(): Verifica que noti_no_l no recorre tablas completas.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configura datos de prueba para las pruebas.
+        """
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+        cls.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpass123')
+        post = Post.objects.create(content='Hello, world!', user=cls.user1)
+        for is_read in (True, False):
+            Noti.objects.create(type='le gusto tu publicación', from_user=cls.user2, to_user=cls.user1,
+                                post=post, is_read=is_read)
+
+    def test_unread_notifications_use_indexes(self):
+        """
+        Verifica que noti_no_l no recorre tablas completas ni ordena sin índice.
+        """
+        client = APIClient()
+        client.force_authenticate(user=self.user1)
+        response = self.assertQueriesUseIndexes(lambda: client.get('/noti/no/'))
+        self.assertEqual(len(response.data), 1)
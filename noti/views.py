@@ -5,6 +5,9 @@ from rest_framework.response import Response
 from . models import Noti
 from . serializers import NotiSerializer
 
+# La publicación de cada notificación puede estar en el nivel caliente o archivada.
+NOTI_RELATED = ('from_user', 'to_user', 'post__user', 'archived_post__user')
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def noti(request):
@@ -21,7 +24,7 @@ def noti(request):
         Response: Respuesta JSON con las notificaciones leídas.
     """
     user = request.user
-    notis = Noti.objects.filter(to_user=user, is_read=True)
+    notis = Noti.objects.filter(to_user=user, is_read=True).select_related(*NOTI_RELATED)
     serializer = NotiSerializer(notis, many=True)
     return Response(serializer.data)
 
@@ -41,7 +44,7 @@ def noti_no_l(request):
         Response: Respuesta JSON con las notificaciones no leídas.
     """
     user = request.user
-    notis = Noti.objects.filter(to_user=user, is_read=False)
+    notis = Noti.objects.filter(to_user=user, is_read=False).select_related(*NOTI_RELATED)
     serializer = NotiSerializer(notis, many=True)
     return Response(serializer.data)
 
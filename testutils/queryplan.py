@@ -0,0 +1,83 @@
+# Utilidades solo para las pruebas: ningún módulo de la aplicación las importa.
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+# Líneas del plan que indican que no se usó un índice para filtrar u ordenar.
+SQLITE_FULL_SCAN = 'SCAN '
+SQLITE_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+POSTGRES_FULL_SCAN = 'Seq Scan'
+POSTGRES_SORT = 'Sort'
+
+
+def explain(sql):
+    """
+    Devuelve el plan de ejecución de una consulta SQL.
+
+    En PostgreSQL se desactiva el recorrido secuencial para la consulta, así
+    el plan no depende del tamaño de las tablas de prueba: si aun así aparece
+    un "Seq Scan" es que no hay índice que la resuelva.
+
+    Args:
+        sql (str): Consulta SQL con los parámetros ya interpolados.
+
+    Returns:
+        list: Líneas del plan de ejecución.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN {sql}')
+            return [row[0] for row in cursor.fetchall()]
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def plan_problems(sql):
+    """
+    Devuelve las líneas del plan que indican un recorrido completo de tabla
+    o una ordenación sin índice.
+
+    Args:
+        sql (str): Consulta SQL con los parámetros ya interpolados.
+
+    Returns:
+        list: Líneas problemáticas del plan (vacía si la consulta usa índices).
+    """
+    problems = []
+    for line in explain(sql):
+        if connection.vendor == 'postgresql':
+            if POSTGRES_FULL_SCAN in line or line.strip().lstrip('->').strip().startswith(POSTGRES_SORT):
+                problems.append(line)
+        elif (line.startswith(SQLITE_FULL_SCAN) and ' USING ' not in line) or SQLITE_SORT in line:
+            problems.append(line)
+    return problems
+
+
+class QueryPlanMixin:
+    """
+    Mixin para pruebas que comprueba el plan de las consultas de una vista.
+
+    Métodos:
+        assertQueriesUseIndexes(func): Ejecuta func y falla si alguna de sus
+            consultas SELECT recorre una tabla completa u ordena sin índice.
+    """
+
+    def assertQueriesUseIndexes(self, func):
+        """
+        Ejecuta func y comprueba con EXPLAIN cada consulta SELECT que lanza.
+
+        Args:
+            func (callable): Código que ejecuta las consultas (normalmente una petición a la vista).
+
+        Returns:
+            El valor devuelto por func.
+        """
+        with CaptureQueriesContext(connection) as context:
+            result = func()
+        selects = [query['sql'] for query in context.captured_queries if query['sql'].startswith('SELECT')]
+        self.assertTrue(selects, 'La vista no ejecutó ninguna consulta')
+        for sql in selects:
+            problems = plan_problems(sql)
+            self.assertFalse(problems, f'Consulta sin índice:\n{sql}\nPlan: {problems}')
+        return result
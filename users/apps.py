@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        # Mantiene la caché de búsquedas de usuarios (users/search.py), los
+        # contadores de seguimientos y el índice del grafo (users/graph.py) al borrar usuarios.
+        from . import signals  # noqa: F401
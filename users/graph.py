@@ -0,0 +1,325 @@
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+
+from backend.tasks import run_in_background
+
+from .models import Follow, User
+
+_graph = None
+_graph_lock = threading.Lock()         # protege _graph, _pending y _rebuild_started
+_first_build_lock = threading.Lock()
+_pending = []                          # cambios registrados por cada construcción en curso
+_rebuild_started = None
+
+
+def _find(values, value, lo=0, hi=None):
+    """
+    Busca value en un tramo ordenado de values.
+
+    Returns:
+        bool: True si value está en values[lo:hi].
+    """
+    hi = len(values) if hi is None else hi
+    pos = bisect_left(values, value, lo, hi)
+    return pos < hi and values[pos] == value
+
+
+class FollowGraph:
+    """
+    Índice en memoria del grafo de seguimientos en formato CSR.
+
+    Los usuarios se numeran por su posición en ids (ordenados). Para cada
+    fila r, out_indices[out_indptr[r]:out_indptr[r + 1]] son las filas de
+    las cuentas que sigue, ordenadas; in_indptr/in_indices guardan lo mismo
+    para los seguidores. Son arrays de enteros de tamaño fijo: 8 bytes por
+    seguimiento y 24 por usuario, sin un objeto Python por arista.
+
+    - follows(a, b) busca b en la fila de a: O(log grado), sin consultas.
+    - mutual_followers(a, b) intersecta dos filas ordenadas recorriendo la
+      más corta y buscando en la otra.
+
+    Los cambios posteriores a la construcción (seguir y dejar de seguir en
+    este proceso) se guardan en un delta por usuario que se consulta antes
+    de las filas, siempre con el lock del índice porque apply() lo modifica
+    desde otros hilos; get_follow_graph() reconstruye el índice en segundo plano
+    cuando el delta crece o el índice envejece, y así también incorpora los
+    cambios hechos en otros procesos.
+
+    Atributos:
+        ids (array): Ids de los usuarios, ordenados.
+        out_indptr (array): Inicio de la fila de seguidos de cada usuario.
+        out_indices (array): Filas de los usuarios seguidos.
+        in_indptr (array): Inicio de la fila de seguidores de cada usuario.
+        in_indices (array): Filas de los seguidores.
+        built_at (float): Instante (time.monotonic) de la construcción.
+    """
+
+    def __init__(self, ids, out_indptr, out_indices, in_indptr, in_indices):
+        self.ids = ids
+        self.out_indptr = out_indptr
+        self.out_indices = out_indices
+        self.in_indptr = in_indptr
+        self.in_indices = in_indices
+        self.built_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._delta_out = {}   # id -> {id seguido: True si se agregó, False si se quitó}
+        self._delta_in = {}    # id -> {id seguidor: True/False}
+        self.delta_size = 0
+
+    @classmethod
+    def build(cls):
+        """
+        Construye el índice leyendo la tabla de seguimientos una sola vez.
+
+        Las aristas se leen ordenadas por (from_user, to_user), el orden del
+        índice único, así que las filas de seguidos salen ordenadas; las de
+        seguidores se arman con un conteo por columna.
+
+        Returns:
+            FollowGraph: Índice con el estado actual de la base de datos.
+        """
+        ids = array('q', User.objects.order_by('id').values_list('id', flat=True))
+        n = len(ids)
+        out_indptr = array('q', bytes(8 * (n + 1)))
+        out_indices = array('I')
+        in_counts = array('q', bytes(8 * (n + 1)))
+        edges = Follow.objects.order_by('from_user_id', 'to_user_id').values_list('from_user_id', 'to_user_id')
+        for from_id, to_id in edges.iterator(chunk_size=10000):
+            from_row = bisect_left(ids, from_id)
+            to_row = bisect_left(ids, to_id)
+            if from_row == n or to_row == n or ids[from_row] != from_id or ids[to_row] != to_id:
+                continue
+            out_indptr[from_row + 1] += 1
+            out_indices.append(to_row)
+            in_counts[to_row + 1] += 1
+        for row in range(n):
+            out_indptr[row + 1] += out_indptr[row]
+            in_counts[row + 1] += in_counts[row]
+
+        in_indptr = array('q', in_counts)
+        in_indices = array('I', bytes(4 * len(out_indices)))
+        for from_row in range(n):
+            for pos in range(out_indptr[from_row], out_indptr[from_row + 1]):
+                to_row = out_indices[pos]
+                in_indices[in_counts[to_row]] = from_row
+                in_counts[to_row] += 1
+        return cls(ids, out_indptr, out_indices, in_indptr, in_indices)
+
+    def _row(self, user_id):
+        row = bisect_left(self.ids, user_id)
+        return row if row < len(self.ids) and self.ids[row] == user_id else None
+
+    def _base_neighbors(self, indptr, indices, user_id):
+        row = self._row(user_id)
+        if row is None:
+            return set()
+        return {self.ids[r] for r in indices[indptr[row]:indptr[row + 1]]}
+
+    def _neighbors(self, indptr, indices, delta, user_id):
+        neighbors = self._base_neighbors(indptr, indices, user_id)
+        # apply() puede agregar claves desde otros hilos: se recorre una copia.
+        with self._lock:
+            changes = dict(delta.get(user_id, {}))
+        for other_id, added in changes.items():
+            if added:
+                neighbors.add(other_id)
+            else:
+                neighbors.discard(other_id)
+        return neighbors
+
+    def apply(self, from_id, to_id, following):
+        """
+        Registra que from_id empezó (following=True) o dejó de seguir a to_id.
+        """
+        with self._lock:
+            if to_id not in self._delta_out.get(from_id, {}):
+                self.delta_size += 1
+            self._delta_out.setdefault(from_id, {})[to_id] = following
+            self._delta_in.setdefault(to_id, {})[from_id] = following
+
+    def follows(self, from_id, to_id):
+        """
+        Indica si from_id sigue a to_id.
+
+        Returns:
+            bool: True si lo sigue.
+        """
+        with self._lock:
+            changed = self._delta_out.get(from_id, {}).get(to_id)
+        if changed is not None:
+            return changed
+        from_row, to_row = self._row(from_id), self._row(to_id)
+        if from_row is None or to_row is None:
+            return False
+        return _find(self.out_indices, to_row, self.out_indptr[from_row], self.out_indptr[from_row + 1])
+
+    def following(self, user_id):
+        """
+        Devuelve los ids de los usuarios que sigue user_id.
+        """
+        return self._neighbors(self.out_indptr, self.out_indices, self._delta_out, user_id)
+
+    def followers(self, user_id):
+        """
+        Devuelve los ids de los seguidores de user_id.
+        """
+        return self._neighbors(self.in_indptr, self.in_indices, self._delta_in, user_id)
+
+    def mutual_followers(self, viewer_id, user_id):
+        """
+        Cuenta las cuentas que sigue viewer_id y que siguen a user_id ("seguidores que conoces").
+
+        Sin cambios pendientes para ninguno de los dos, se intersectan las
+        filas ordenadas directamente; si no, los conjuntos con el delta aplicado.
+
+        Returns:
+            int: Cantidad de seguidores en común.
+        """
+        with self._lock:
+            changed = viewer_id in self._delta_out or user_id in self._delta_in
+        if changed:
+            return len(self.following(viewer_id) & self.followers(user_id))
+        viewer_row, user_row = self._row(viewer_id), self._row(user_id)
+        if viewer_row is None or user_row is None:
+            return 0
+        a = (self.out_indptr[viewer_row], self.out_indptr[viewer_row + 1], self.out_indices)
+        b = (self.in_indptr[user_row], self.in_indptr[user_row + 1], self.in_indices)
+        (lo, hi, short), (other_lo, other_hi, other) = sorted([a, b], key=lambda row: row[1] - row[0])
+        return sum(1 for pos in range(lo, hi) if _find(other, short[pos], other_lo, other_hi))
+
+    def memory_usage(self):
+        """
+        Devuelve el tamaño en memoria del índice.
+
+        Returns:
+            dict: Usuarios, seguimientos, cambios pendientes y bytes de cada
+                array y del total.
+        """
+        arrays = {
+            'ids': self.ids,
+            'out_indptr': self.out_indptr,
+            'out_indices': self.out_indices,
+            'in_indptr': self.in_indptr,
+            'in_indices': self.in_indices,
+        }
+        usage = {name: sys.getsizeof(values) for name, values in arrays.items()}
+        with self._lock:
+            delta_bytes = sum(
+                sys.getsizeof(delta) + sum(sys.getsizeof(changes) for changes in delta.values())
+                for delta in (self._delta_out, self._delta_in)
+            )
+        return {
+            'users': len(self.ids),
+            'edges': len(self.out_indices),
+            'pending_changes': self.delta_size,
+            'bytes': usage,
+            'delta_bytes': delta_bytes,
+            'total_bytes': sum(usage.values()) + delta_bytes,
+        }
+
+
+def _build():
+    """
+    Construye un índice nuevo y lo pone en lugar del actual.
+
+    Los cambios que record_follow() registra mientras se lee la base de
+    datos se aplican al índice nuevo antes del cambio, así no se pierden
+    los que la lectura ya no alcanzó a ver (aplicarlos de nuevo no cambia nada).
+
+    Returns:
+        FollowGraph: Índice nuevo.
+    """
+    global _graph
+    changes = []
+    with _graph_lock:
+        _pending.append(changes)
+    try:
+        graph = FollowGraph.build()
+        with _graph_lock:
+            for change in changes:
+                graph.apply(*change)
+            _graph = graph
+    finally:
+        with _graph_lock:
+            _pending.remove(changes)
+    return graph
+
+
+def rebuild_follow_graph():
+    """
+    Reconstruye el índice; es la tarea en segundo plano de get_follow_graph().
+    """
+    global _rebuild_started
+    try:
+        _build()
+    finally:
+        with _graph_lock:
+            _rebuild_started = None
+
+
+def get_follow_graph():
+    """
+    Devuelve el índice del grafo de seguimientos del proceso.
+
+    Se construye en la primera llamada. Cuando tiene más de
+    FOLLOW_GRAPH_MAX_AGE segundos o más de FOLLOW_GRAPH_MAX_DELTA cambios
+    pendientes se programa una reconstrucción en segundo plano
+    (backend.tasks.run_in_background) y se sigue devolviendo el índice
+    actual hasta que el nuevo lo reemplaza, sin bloquear las solicitudes.
+
+    Returns:
+        FollowGraph: Índice actual.
+    """
+    global _rebuild_started
+    graph = _graph
+    if graph is None:
+        with _first_build_lock:
+            graph = _graph or _build()
+        return graph
+
+    now = time.monotonic()
+    if now - graph.built_at > settings.FOLLOW_GRAPH_MAX_AGE or graph.delta_size > settings.FOLLOW_GRAPH_MAX_DELTA:
+        with _graph_lock:
+            # Una reconstrucción programada que nunca corrió (transacción
+            # revertida) no impide programar otra pasado FOLLOW_GRAPH_MAX_AGE.
+            schedule = _rebuild_started is None or now - _rebuild_started > settings.FOLLOW_GRAPH_MAX_AGE
+            if schedule:
+                _rebuild_started = now
+        if schedule:
+            run_in_background(rebuild_follow_graph)
+    return graph
+
+
+def record_follow(from_id, to_id, following):
+    """
+    Aplica un seguimiento nuevo o eliminado al índice del proceso, si ya está construido.
+
+    También lo guarda para las construcciones en curso, que lo aplican al
+    índice nuevo antes de ponerlo en uso.
+
+    Args:
+        from_id (int): Usuario que sigue o deja de seguir.
+        to_id (int): Usuario seguido.
+        following (bool): True si empezó a seguirlo, False si dejó de hacerlo.
+    """
+    with _graph_lock:
+        graph = _graph
+        for changes in _pending:
+            changes.append((from_id, to_id, following))
+    if graph is not None:
+        graph.apply(from_id, to_id, following)
+
+
+def reset_follow_graph():
+    """
+    Descarta el índice del proceso; se reconstruye en la siguiente lectura.
+    """
+    global _graph, _rebuild_started
+    with _graph_lock:
+        _graph = None
+        _rebuild_started = None
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from users.recommendations import compute_all
+
+class Command(BaseCommand):
+    """
+    Comando para recalcular las sugerencias de a quién seguir de todos los usuarios.
+
+    Lee el grafo de seguimientos una vez, calcula para cada usuario los
+    amigos de amigos y los co-seguimientos, y guarda las RECO_SIZE mejores
+    sugerencias. Pensado para ejecutarse periódicamente (cron); entre
+    ejecuciones, seguir o dejar de seguir recalcula las del usuario que lo hace.
+
+    Uso:
+        python manage.py compute_recommendations [--batch-size N]
+    """
+    help = 'Recalcula las sugerencias de a quién seguir de todos los usuarios.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Cantidad de usuarios guardados por transacción.')
+
+    def handle(self, *args, **options):
+        total = compute_all(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Usuarios procesados: {total}'))
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.graph import FollowGraph
+
+class Command(BaseCommand):
+    """
+    Comando para medir el índice en memoria del grafo de seguimientos.
+
+    Construye el índice con el estado actual de la base de datos y muestra
+    cuántos usuarios y seguimientos tiene, cuánto tardó y cuánta memoria
+    ocupa cada array.
+
+    Uso:
+        python manage.py follow_graph_stats
+    """
+    help = 'Muestra el tamaño en memoria del índice del grafo de seguimientos.'
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        graph = FollowGraph.build()
+        elapsed = time.perf_counter() - start
+        usage = graph.memory_usage()
+        self.stdout.write(f"Usuarios: {usage['users']}")
+        self.stdout.write(f"Seguimientos: {usage['edges']}")
+        self.stdout.write(f'Construcción: {elapsed:.2f} s')
+        for name, size in usage['bytes'].items():
+            self.stdout.write(f'  {name}: {size} bytes')
+        self.stdout.write(self.style.SUCCESS(f"Total: {usage['total_bytes']} bytes"))
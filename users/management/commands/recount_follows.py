@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from backend.versioning import version_bump
+from users.models import User
+
+class Command(BaseCommand):
+    """
+    Comando para reconciliar los contadores desnormalizados de seguidores de User.
+
+    Recalcula followers_count y following_count a partir de la tabla de
+    seguimientos y actualiza solo los usuarios cuyos contadores no coinciden.
+
+    Uso:
+        python manage.py recount_follows [--batch-size N] [--dry-run]
+    """
+    help = 'Reconcilia los contadores followers_count y following_count de los usuarios.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Cantidad de usuarios procesados por lote.')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Muestra cuántos usuarios se corregirían sin guardar cambios.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+        fixed = 0
+        last_id = 0
+
+        while True:
+            batch = list(
+                User.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .annotate(
+                    real_followers=Count('follower_links', distinct=True),
+                    real_following=Count('following_links', distinct=True),
+                )
+                .values_list('id', 'followers_count', 'following_count',
+                             'real_followers', 'real_following')[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+
+            for user_id, *stored, real_followers, real_following in batch:
+                if stored == [real_followers, real_following]:
+                    continue
+                fixed += 1
+                if not dry_run:
+                    User.objects.filter(id=user_id).update(
+                        followers_count=real_followers, following_count=real_following, **version_bump(),
+                    )
+
+        verb = 'se corregirían' if dry_run else 'corregidos'
+        self.stdout.write(self.style.SUCCESS(f'Usuarios {verb}: {fixed}'))
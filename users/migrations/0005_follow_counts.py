@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def backfill_counts(apps, schema_editor):
+    """
+    Rellena followers_count y following_count a partir de la tabla de seguidores.
+    """
+    User = apps.get_model('users', 'User')
+    Follow = apps.get_model('users', 'Follow')
+
+    def count(field):
+        rows = Follow.objects.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(total=Count('pk')).values('total')
+        return Coalesce(Subquery(rows[:1]), 0)
+
+    User.objects.update(followers_count=count('to_user'), following_count=count('from_user'))
+
+
+class Migration(migrations.Migration):
+    """
+    Convierte la relación automática User.following en el modelo intermedio
+    Follow sobre la misma tabla (con la fecha en que se empezó a seguir) y
+    agrega los contadores desnormalizados de seguidores y seguidos.
+    """
+
+    dependencies = [
+        ('users', '0004_user_avatar_variants_user_cover_image_variants'),
+    ]
+
+    operations = [
+        # La tabla ya existe: solo cambia el estado de los modelos.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='Follow',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('from_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='following_links', to=settings.AUTH_USER_MODEL)),
+                        ('to_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='follower_links', to=settings.AUTH_USER_MODEL)),
+                    ],
+                    options={'db_table': 'users_user_following', 'unique_together': {('from_user', 'to_user')}},
+                ),
+                migrations.AlterField(
+                    model_name='user',
+                    name='following',
+                    field=models.ManyToManyField(blank=True, related_name='followed', through='users.Follow', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='follow',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterUniqueTogether(name='follow', unique_together=set()),
+        migrations.AddConstraint(
+            model_name='follow',
+            constraint=models.UniqueConstraint(fields=('from_user', 'to_user'), name='users_follow_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['to_user', '-created_at', '-id'], name='users_follow_to_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['from_user', '-created_at', '-id'], name='users_follow_from_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['followers_count'], name='users_followers_count_idx'),
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+from django.db import migrations, models
+import django.db.models.functions.text
+
+# En PostgreSQL, además de los índices de expresión: text_pattern_ops para
+# LIKE 'prefijo%' y trigramas (pg_trgm) para LIKE '%subcadena%'.
+POSTGRES_CREATE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX users_username_prefix_idx ON users_user (lower(username) text_pattern_ops)",
+    "CREATE INDEX users_name_prefix_idx ON users_user (lower(name) text_pattern_ops)",
+    "CREATE INDEX users_username_trgm_idx ON users_user USING GIN (lower(username) gin_trgm_ops)",
+    "CREATE INDEX users_name_trgm_idx ON users_user USING GIN (lower(name) gin_trgm_ops)",
+]
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS users_username_prefix_idx",
+    "DROP INDEX IF EXISTS users_name_prefix_idx",
+    "DROP INDEX IF EXISTS users_username_trgm_idx",
+    "DROP INDEX IF EXISTS users_name_trgm_idx",
+]
+
+
+def run(statements_by_vendor):
+    def operation(apps, schema_editor):
+        statements = statements_by_vendor.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+    """
+    Crea los índices de la búsqueda de usuarios (users/search.py): LOWER(username)
+    y LOWER(name) en todas las bases de datos, y en PostgreSQL los índices de
+    prefijo y de trigramas.
+    """
+
+    dependencies = [
+        ('users', '0005_follow_counts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Lower('username'), name='users_username_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='users_name_lower_idx'),
+        ),
+        migrations.RunPython(
+            run({'postgresql': POSTGRES_CREATE}),
+            run({'postgresql': POSTGRES_DROP}),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, UserManager
 
@@ -76,26 +77,35 @@ class User(AbstractBaseUser, PermissionsMixin):
         username (str): Nombre de usuario del usuario.
         email (str): Correo electrónico único del usuario.
         name (str): Nombre del usuario.
-        following (ManyToManyField): Relación de usuarios seguidos por este usuario.
+        following (ManyToManyField): Relación de usuarios seguidos por este usuario (a través de Follow).
+        followers_count (int): Cantidad desnormalizada de seguidores.
+        following_count (int): Cantidad desnormalizada de usuarios seguidos.
         bio (str): Biografía del usuario.
         avatar (ImageField): Imagen de perfil del usuario.
         cover_image (ImageField): Imagen de portada del usuario.
+        avatar_variants (dict): Variantes redimensionadas (WebP/JPEG) del avatar.
+        cover_image_variants (dict): Variantes redimensionadas (WebP/JPEG) de la portada.
         date_joined (datetime): Fecha y hora de registro del usuario.
         is_staff (bool): Indica si el usuario tiene permisos de administrador.
-
-    Métodos:
-        followed_usernames: Devuelve una lista de diccionarios con información de usuarios seguidos.
+        version (int): Sello de versión del perfil; aumenta con cada cambio (ETag).
+        updated_at (datetime): Fecha y hora del último cambio del perfil.
     """
     username = models.CharField(max_length=200, unique=True)
     email = models.CharField(max_length=200, unique=True)
     name = models.CharField(max_length=255, blank=True)
-    following = models.ManyToManyField("self",symmetrical=False,related_name="followed" ,blank=True)
+    following = models.ManyToManyField("self",symmetrical=False,related_name="followed" ,blank=True, through='Follow')
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
     bio = models.CharField(max_length=255, blank=True)
     avatar = models.ImageField(default='profiles/default/avatar.png', upload_to='profiles/avatars')
     cover_image = models.ImageField(default='profiles/default/cover.png', upload_to='profiles/covers') 
+    avatar_variants = models.JSONField(default=dict, blank=True)
+    cover_image_variants = models.JSONField(default=dict, blank=True)
     date_joined = models.DateTimeField(default=timezone.now)
 
     is_staff = models.BooleanField(default=False)
+    version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     objects = CustomUserManager()
 
@@ -104,7 +114,64 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     class Meta:
         ordering = ['-date_joined']
+        indexes = [
+            models.Index(fields=['followers_count'], name='users_followers_count_idx'),
+            # Búsqueda de usuarios (users/search.py).
+            models.Index(Lower('username'), name='users_username_lower_idx'),
+            models.Index(Lower('name'), name='users_name_lower_idx'),
+        ]
+
+class Follow(models.Model):
+    """
+    Modelo intermedio de User.following con la fecha en que se empezó a seguir.
+
+    Usa la tabla de la antigua relación automática. Los índices
+    (to_user, created_at, id) y (from_user, created_at, id) sirven las listas
+    paginadas de seguidores y seguidos, de la más reciente a la más antigua.
 
-    @property
-    def followed_usernames(self):
-        return [{'username': user.username, 'avatar': user.avatar.url} for user in self.followed.all()]
\ No newline at end of file
+    Atributos:
+        from_user (User): Usuario que sigue.
+        to_user (User): Usuario seguido.
+        created_at (datetime): Fecha y hora en que se empezó a seguir.
+    """
+    from_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='following_links')
+    to_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='follower_links')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'users_user_following'
+        indexes = [
+            models.Index(fields=['to_user', '-created_at', '-id'], name='users_follow_to_created_idx'),
+            models.Index(fields=['from_user', '-created_at', '-id'], name='users_follow_from_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['from_user', 'to_user'], name='users_follow_unique'),
+        ]
+
+class Recommendation(models.Model):
+    """
+    Sugerencia precalculada de a quién seguir (users/recommendations.py).
+
+    Las calcula por lotes el comando compute_recommendations y se recalculan
+    las de un usuario cuando sigue o deja de seguir a alguien.
+
+    Atributos:
+        user (User): Usuario que recibe la sugerencia.
+        candidate (User): Usuario sugerido.
+        score (float): Puntaje de la sugerencia (mayor es mejor).
+        mutuals (int): Cantidad de usuarios seguidos por user que siguen a candidate.
+        computed_at (datetime): Fecha y hora del cálculo.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='recommendations')
+    candidate = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    score = models.FloatField()
+    mutuals = models.PositiveIntegerField(default=0)
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-score', 'candidate'], name='users_reco_user_score_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'candidate'], name='users_reco_unique'),
+        ]
@@ -0,0 +1,157 @@
+import heapq
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Follow, Recommendation, User
+
+# Peso de cada camino yo -> seguido -> candidato (amigos de amigos) y de cada
+# cuenta que yo y el candidato seguimos en común (co-seguimiento).
+FOF_WEIGHT = 1.0
+COFOLLOW_WEIGHT = 0.5
+
+
+def load_graph(user_ids=None, max_degree=None):
+    """
+    Carga el grafo de seguimientos como listas de adyacencia dispersas.
+
+    Sin user_ids se lee la tabla completa con un solo recorrido. Con
+    user_ids se lee solo el vecindario que necesitan sus sugerencias: a
+    quién siguen esos usuarios y, de esas cuentas, a quién siguen y quién
+    las sigue (esto último solo de las que no están en large, las únicas
+    que cuentan para el co-seguimiento).
+
+    En los dos casos, large son las cuentas con más de max_degree
+    seguidores según followers_count: así la carga completa y la parcial
+    deciden igual qué cuentas aportan co-seguimientos, aunque en la parcial
+    los seguidores de las cuentas grandes no se carguen.
+
+    Args:
+        user_ids (list): Usuarios cuyo vecindario se carga (None para todo el grafo).
+        max_degree (int): Seguidores máximos de una cuenta para contar co-seguimientos.
+
+    Returns:
+        tuple: (seguidos, seguidores, large); dos dict {id: set de ids} y un
+            set de ids.
+    """
+    max_degree = settings.RECO_MAX_DEGREE if max_degree is None else max_degree
+    following = defaultdict(set)
+    followers = defaultdict(set)
+
+    def add(edges):
+        for from_id, to_id in edges.iterator(chunk_size=10000):
+            following[from_id].add(to_id)
+            followers[to_id].add(from_id)
+
+    edges = Follow.objects.values_list('from_user_id', 'to_user_id')
+    large_users = User.objects.filter(followers_count__gt=max_degree)
+    if user_ids is None:
+        add(edges)
+        return following, followers, set(large_users.values_list('id', flat=True))
+    add(edges.filter(from_user_id__in=user_ids))
+    middle = set().union(*(following[user_id] for user_id in user_ids))
+    add(edges.filter(from_user_id__in=middle))
+    large = set(large_users.filter(id__in=middle).values_list('id', flat=True))
+    add(edges.filter(to_user_id__in=middle - large))
+    return following, followers, large
+
+
+def score_user(user_id, following, followers, large=(), size=None):
+    """
+    Calcula las mejores sugerencias de un usuario a partir del grafo en memoria.
+
+    Es una fila del producto disperso A·A (amigos de amigos) más la fila de
+    A·Aᵀ (co-seguimiento), recorriendo solo los vecinos de user_id. Las
+    cuentas seguidas que están en large no aportan co-seguimientos: casi
+    todos las siguen y solo agregarían ruido y costo.
+
+    Args:
+        user_id (int): Usuario para el que se calculan las sugerencias.
+        following (dict): Seguidos de cada usuario.
+        followers (dict): Seguidores de cada usuario.
+        large (set): Cuentas con demasiados seguidores para el co-seguimiento.
+        size (int): Cantidad de sugerencias.
+
+    Returns:
+        list: Tuplas (puntaje, candidato, amigos en común), de la mejor a la peor.
+    """
+    size = settings.RECO_SIZE if size is None else size
+    mine = following.get(user_id, set())
+    scores = defaultdict(float)
+    mutuals = defaultdict(int)
+    for followed_id in mine:
+        for candidate in following.get(followed_id, ()):
+            scores[candidate] += FOF_WEIGHT
+            mutuals[candidate] += 1
+        if followed_id not in large:
+            for candidate in followers.get(followed_id, ()):
+                scores[candidate] += COFOLLOW_WEIGHT
+    ranked = (
+        (score, candidate, mutuals[candidate])
+        for candidate, score in scores.items()
+        if candidate != user_id and candidate not in mine
+    )
+    # Empates: primero el candidato más nuevo (id mayor).
+    return heapq.nlargest(size, ranked)
+
+
+def save_recommendations(results):
+    """
+    Reemplaza las sugerencias guardadas de los usuarios calculados.
+
+    Args:
+        results (dict): {id de usuario: lista devuelta por score_user()}.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        Recommendation.objects.filter(user_id__in=list(results)).delete()
+        Recommendation.objects.bulk_create(
+            Recommendation(user_id=user_id, candidate_id=candidate, score=score, mutuals=mutuals, computed_at=now)
+            for user_id, ranked in results.items()
+            for score, candidate, mutuals in ranked
+        )
+
+
+def compute_all(batch_size=500):
+    """
+    Recalcula las sugerencias de todos los usuarios con el grafo completo en memoria.
+
+    El grafo se lee una sola vez; las sugerencias se guardan en
+    transacciones de batch_size usuarios.
+
+    Args:
+        batch_size (int): Usuarios guardados por transacción.
+
+    Returns:
+        int: Cantidad de usuarios procesados.
+    """
+    following, followers, large = load_graph()
+    results = {}
+    total = 0
+    for user_id in list(User.objects.order_by('id').values_list('id', flat=True)):
+        results[user_id] = score_user(user_id, following, followers, large)
+        if len(results) >= batch_size:
+            save_recommendations(results)
+            total += len(results)
+            results = {}
+    if results:
+        save_recommendations(results)
+        total += len(results)
+    return total
+
+
+def refresh_user(user_id):
+    """
+    Recalcula las sugerencias de un usuario con su vecindario del grafo.
+
+    Se ejecuta en segundo plano después de que el usuario sigue o deja de
+    seguir a alguien. Las sugerencias de los demás usuarios afectados se
+    actualizan en el siguiente compute_recommendations.
+
+    Args:
+        user_id (int): Usuario cuyas sugerencias se recalculan.
+    """
+    following, followers, large = load_graph([user_id])
+    save_recommendations({user_id: score_user(user_id, following, followers, large)})
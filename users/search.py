@@ -0,0 +1,211 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .models import User
+
+# Búsqueda de usuarios para el autocompletado. Los niveles de coincidencia se
+# resuelven con índices: LOWER(username) y LOWER(name) (migración
+# 0006_user_search_indexes), más índices text_pattern_ops y trigramas
+# (pg_trgm) en PostgreSQL para los prefijos y las subcadenas.
+MAX_QUERY_LENGTH = 50
+# Las subcadenas solo se buscan a partir de este largo (un trigrama).
+MIN_SUBSTRING_LENGTH = 3
+# Mayor carácter de Unicode: [q, q + MAX_CHAR) es el rango de los textos que empiezan por q.
+MAX_CHAR = '\U0010ffff'
+ORDERING = ('-followers_count', '-id')
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def normalize_query(query):
+    """
+    Normaliza el texto buscado: sin espacios en los extremos, en minúsculas y recortado.
+
+    Args:
+        query (str): Texto buscado.
+
+    Returns:
+        str: Texto normalizado (vacío si no hay nada que buscar).
+    """
+    return (query or '').strip().lower()[:MAX_QUERY_LENGTH]
+
+
+def prefix_filter(alias, prefix):
+    """
+    Filtro de los textos que empiezan por prefix.
+
+    En PostgreSQL usa LIKE 'prefijo%', que resuelve el índice text_pattern_ops;
+    en SQLite un rango sobre el índice de la expresión, porque allí LIKE no
+    usa índices de expresiones.
+    """
+    if connection.vendor == 'postgresql':
+        return Q(**{f'{alias}__startswith': prefix})
+    return Q(**{f'{alias}__gte': prefix, f'{alias}__lt': prefix + MAX_CHAR})
+
+
+def ranked_user_ids(query, limit):
+    """
+    Devuelve los ids de los usuarios que coinciden con la búsqueda, del más al menos relevante.
+
+    Los niveles de coincidencia se consultan en orden y cada uno completa lo
+    que falte hasta limit:
+
+    1. username exacto;
+    2. username que empieza por la búsqueda;
+    3. name que empieza por la búsqueda;
+    4. username o name que la contienen (desde MIN_SUBSTRING_LENGTH caracteres).
+
+    Dentro de cada nivel se ordena por followers_count de mayor a menor.
+    En SQLite, LOWER() solo pasa a minúsculas las letras ASCII.
+
+    Args:
+        query (str): Búsqueda normalizada con normalize_query().
+        limit (int): Cantidad máxima de resultados.
+
+    Returns:
+        list: Ids de los usuarios.
+    """
+    users = User.objects.alias(lower_username=Lower('username'), lower_name=Lower('name'))
+    tiers = [
+        Q(lower_username=query),
+        prefix_filter('lower_username', query),
+        prefix_filter('lower_name', query),
+    ]
+    if len(query) >= MIN_SUBSTRING_LENGTH:
+        tiers.append(Q(lower_username__contains=query) | Q(lower_name__contains=query))
+
+    ids = []
+    for tier in tiers:
+        remaining = limit - len(ids)
+        if remaining <= 0:
+            break
+        # Se piden de más los que ya salieron en un nivel anterior.
+        found = users.filter(tier).order_by(*ORDERING).values_list('id', flat=True)[:remaining + len(ids)]
+        ids += [pk for pk in found if pk not in ids]
+    return ids[:limit]
+
+
+class HotPrefixCache:
+    """
+    Caché LRU en memoria de los resultados de las búsquedas más cortas.
+
+    Las búsquedas de pocos caracteres (los primeros del autocompletado) son
+    las más repetidas y las que más filas recorren, así que se guarda su
+    lista de ids ya ordenada durante ttl segundos. Al guardar o borrar un
+    usuario, invalidate() descarta las entradas que lo incluyen o en las que
+    podría aparecer. Cada proceso tiene su propia caché: en los demás, el
+    cambio se ve al vencer ttl; lo mismo ocurre con los cambios de
+    followers_count, que se hacen con QuerySet.update().
+
+    Atributos:
+        max_size (int): Cantidad máxima de búsquedas guardadas (0 desactiva la caché).
+        ttl (float): Segundos que vale cada entrada.
+        max_length (int): Largo máximo de las búsquedas que se guardan.
+    """
+
+    def __init__(self, max_size=1024, ttl=60, max_length=3):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_length = max_length
+        self._lock = threading.Lock()
+        self._items = OrderedDict()
+
+    def get(self, query):
+        """
+        Devuelve los ids guardados para la búsqueda o None si no están o vencieron.
+        """
+        with self._lock:
+            item = self._items.get(query)
+            if item is None:
+                return None
+            expires, ids = item
+            if expires < time.monotonic():
+                del self._items[query]
+                return None
+            self._items.move_to_end(query)
+            return ids
+
+    def set(self, query, ids):
+        """
+        Guarda los ids de una búsqueda si es lo bastante corta.
+        """
+        if self.max_size <= 0 or len(query) > self.max_length:
+            return
+        with self._lock:
+            self._items[query] = (time.monotonic() + self.ttl, ids)
+            self._items.move_to_end(query)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def invalidate(self, user_id, *texts):
+        """
+        Descarta las búsquedas que incluyen al usuario o que coinciden con sus textos.
+
+        Args:
+            user_id (int): Id del usuario guardado o borrado.
+            texts (str): username y name del usuario.
+        """
+        texts = [text.lower() for text in texts if text]
+        with self._lock:
+            stale = [
+                query for query, (_, ids) in self._items.items()
+                if user_id in ids or any(query in text for text in texts)
+            ]
+            for query in stale:
+                del self._items[query]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+def get_search_cache():
+    """
+    Devuelve la caché de búsquedas cortas del proceso.
+
+    Returns:
+        HotPrefixCache: Caché configurada con USER_SEARCH_CACHE_SIZE,
+            USER_SEARCH_CACHE_TTL y USER_SEARCH_CACHE_MAX_LENGTH.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HotPrefixCache(
+                max_size=getattr(settings, 'USER_SEARCH_CACHE_SIZE', 1024),
+                ttl=getattr(settings, 'USER_SEARCH_CACHE_TTL', 60),
+                max_length=getattr(settings, 'USER_SEARCH_CACHE_MAX_LENGTH', 3),
+            )
+        return _cache
+
+
+def search_users(query, limit=None):
+    """
+    Busca usuarios por username y name para el autocompletado.
+
+    Args:
+        query (str): Texto buscado.
+        limit (int): Cantidad de resultados; nunca más de USER_SEARCH_LIMIT.
+
+    Returns:
+        list: Usuarios ordenados por relevancia.
+    """
+    max_limit = settings.USER_SEARCH_LIMIT
+    limit = max_limit if limit is None else max(min(limit, max_limit), 0)
+    query = normalize_query(query)
+    if not query or not limit:
+        return []
+    cache = get_search_cache()
+    ids = cache.get(query)
+    if ids is None:
+        ids = ranked_user_ids(query, max_limit)
+        cache.set(query, ids)
+    ids = ids[:limit]
+    users = User.objects.in_bulk(ids)
+    return [users[pk] for pk in ids if pk in users]
@@ -1,6 +1,55 @@
+from django.db import models
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from .models import User
+from backend.images import ImageVariantsField, VariantImageField
+from .graph import get_follow_graph
+from .models import Follow, User
+
+class UserListSerializer(serializers.ListSerializer):
+    """
+    Serializador de listas de User que resuelve por lotes el estado de seguimiento.
+
+    Antes de serializar la lista consulta, con una sola consulta a la tabla de
+    seguimientos, a cuáles de esos usuarios sigue el usuario actual, y deja el
+    conjunto de ids en el contexto para que los serializadores de User lo lean.
+
+    Métodos:
+        to_representation(data): Precarga el estado de seguimiento y serializa la lista.
+    """
+
+    def to_representation(self, data):
+        """
+        Precarga el estado de seguimiento del usuario actual y serializa la lista de usuarios.
+
+        Args:
+            data: QuerySet, Manager o lista de objetos User.
+
+        Returns:
+            list: Lista de usuarios serializados.
+        """
+        users = list(data.all() if isinstance(data, models.Manager) else data)
+        request = self.context.get('request')
+        if request is not None and request.user.is_authenticated and 'i_follow' in self.child.fields:
+            self.context['followed_ids'] = set(
+                Follow.objects.filter(from_user_id=request.user.pk, to_user_id__in=[user.pk for user in users])
+                .values_list('to_user_id', flat=True)
+            )
+        return super().to_representation(users)
+
+
+def resolve_i_follow(serializer, obj):
+    """
+    Indica si el usuario actual sigue a obj.
+
+    Usa los ids precargados por UserListSerializer cuando existen; si no,
+    hace una comprobación de existencia sobre la tabla de seguimientos.
+    """
+    followed_ids = serializer.context.get('followed_ids')
+    if followed_ids is not None:
+        return obj.pk in followed_ids
+    current_user = serializer.context.get('request').user
+    return Follow.objects.filter(from_user_id=current_user.pk, to_user_id=obj.pk).exists()
+
 
 class SearchSerializer(serializers.ModelSerializer):
     """
@@ -9,7 +58,7 @@ class SearchSerializer(serializers.ModelSerializer):
     Campos:
         name (str): Nombre del usuario.
         username (str): Nombre de usuario del usuario.
-        avatar (str): URL de la imagen de perfil del usuario.
+        avatar (str): URL de la imagen de perfil del usuario (variante pequeña si existe).
         i_follow (bool): Indica si el usuario actual sigue al usuario en cuestión.
 
     Métodos:
@@ -17,24 +66,27 @@ class SearchSerializer(serializers.ModelSerializer):
     """
 
     username = serializers.ReadOnlyField()
+    avatar = VariantImageField(variants_field='avatar_variants', size='small', read_only=True)
     i_follow = serializers.SerializerMethodField(read_only=True) 
 
     class Meta:
         model = User
+        list_serializer_class = UserListSerializer
         fields = ['name', 'username', 'avatar', 'i_follow']
 
     def get_i_follow(self, obj):
         """
         Obtiene si el usuario actual sigue al usuario en cuestión.
 
+        Usa los ids precargados por UserListSerializer en las listas.
+
         Args:
             obj: Objeto del usuario en cuestión.
 
         Returns:
             bool: True si el usuario actual sigue al usuario, False en caso contrario.
         """
-        current_user = self.context.get('request').user
-        return True if current_user in obj.followed.all() else False
+        return resolve_i_follow(self, obj)
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -45,83 +97,82 @@ class UserSerializer(serializers.ModelSerializer):
         id (int): Identificador único del usuario.
         username (str): Nombre de usuario del usuario.
         email (str): Correo electrónico del usuario.
-        avatar (str): URL de la imagen de perfil del usuario.
+        avatar (str): URL de la imagen de perfil del usuario (variante mediana si existe).
+        avatar_variants (dict): URLs y tamaños de las variantes WebP/JPEG del avatar.
         bio (str): Biografía del usuario.
-        cover_image (str): URL de la imagen de portada del usuario.
+        cover_image (str): URL de la imagen de portada; con ahorro de datos, la de su variante más liviana.
+        cover_image_variants (dict): URLs y tamaños de las variantes WebP/JPEG de la portada.
         date_joined (datetime): Fecha y hora de registro del usuario.
         i_follow (bool): Indica si el usuario actual sigue al usuario en cuestión.
-        followers (int): Número de seguidores del usuario.
-        following (int): Número de usuarios a los que sigue el usuario.
+        followers (int): Número de seguidores del usuario (followers_count).
+        following (int): Número de usuarios a los que sigue el usuario (following_count).
         name (str): Nombre del usuario.
-        followed_usernames (list): Lista de diccionarios con información de usuarios seguidos.
+        follows_you (bool): Indica si el usuario sigue al usuario actual.
+        mutual_followers (int): Cantidad de cuentas que sigue el usuario actual y que siguen al usuario.
 
     Métodos:
         get_i_follow(obj): Obtiene si el usuario actual sigue al usuario en cuestión.
-        get_followers(obj): Obtiene el número de seguidores del usuario.
-        get_following(obj): Obtiene el número de usuarios a los que sigue el usuario.
-        get_followed_usernames(obj): Obtiene la lista de diccionarios con información de usuarios seguidos.
+        get_follows_you(obj): Obtiene si el usuario sigue al usuario actual.
+        get_mutual_followers(obj): Obtiene la cantidad de seguidores en común.
     """
 
     email = serializers.ReadOnlyField()
     username = serializers.ReadOnlyField()
-    followers =  serializers.SerializerMethodField(read_only=True)
+    avatar = VariantImageField(variants_field='avatar_variants', size='medium', required=False)
+    avatar_variants = ImageVariantsField()
+    cover_image = VariantImageField(variants_field='cover_image_variants', required=False)
+    cover_image_variants = ImageVariantsField()
+    followers = serializers.ReadOnlyField(source='followers_count')
     i_follow = serializers.SerializerMethodField(read_only=True) 
-    following = serializers.SerializerMethodField(read_only=True) 
-    followed_usernames = serializers.SerializerMethodField(read_only=True) 
+    following = serializers.ReadOnlyField(source='following_count')
+    follows_you = serializers.SerializerMethodField(read_only=True)
+    mutual_followers = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = User
-        fields = ['id', 'username', 'email', 'avatar', 'bio', 'cover_image', 
-                  'date_joined', 'i_follow', 'followers', 'following', 'name', 'followed_usernames']
+        list_serializer_class = UserListSerializer
+        fields = ['id', 'username', 'email', 'avatar', 'avatar_variants', 'bio', 'cover_image',
+                  'cover_image_variants', 'date_joined', 'i_follow', 'followers', 'following', 'name',
+                  'follows_you', 'mutual_followers']
 
     def get_i_follow(self, obj):
         """
         Obtiene si el usuario actual sigue al usuario en cuestión.
 
-        Args:
-            obj: Objeto del usuario en cuestión.
-
-        Returns:
-            bool: True si el usuario actual sigue al usuario, False en caso contrario.
-        """
-        current_user = self.context.get('request').user
-        return True if current_user in obj.followed.all() else False
-
-    def get_followers(self, obj):
-        """
-        Obtiene el número de seguidores del usuario.
+        Usa los ids precargados por UserListSerializer en las listas.
 
         Args:
             obj: Objeto del usuario en cuestión.
 
         Returns:
-            int: Número de seguidores del usuario.
+            bool: True si el usuario actual sigue al usuario, False en caso contrario.
         """
-        return obj.followed.count()
+        return resolve_i_follow(self, obj)
 
-    def get_following(self, obj):
+    def get_follows_you(self, obj):
         """
-        Obtiene el número de usuarios a los que sigue el usuario.
+        Obtiene si el usuario sigue al usuario actual, con el índice del grafo de seguimientos.
 
         Args:
             obj: Objeto del usuario en cuestión.
 
         Returns:
-            int: Número de usuarios a los que sigue el usuario.
+            bool: True si el usuario sigue al usuario actual.
         """
-        return obj.following.count()
+        return get_follow_graph().follows(obj.pk, self.context.get('request').user.pk)
 
-    def get_followed_usernames(self, obj):
+    def get_mutual_followers(self, obj):
         """
-        Obtiene la lista de diccionarios con información de usuarios seguidos.
+        Obtiene cuántas de las cuentas que sigue el usuario actual siguen al usuario,
+        con el índice del grafo de seguimientos.
 
         Args:
             obj: Objeto del usuario en cuestión.
 
         Returns:
-            list: Lista de diccionarios con información de usuarios seguidos.
+            int: Cantidad de seguidores en común.
         """
-        return obj.followed_usernames
+        return get_follow_graph().mutual_followers(self.context.get('request').user.pk, obj.pk)
 
 
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
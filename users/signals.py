@@ -0,0 +1,65 @@
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from backend.versioning import version_bump
+from .graph import record_follow
+from .models import Follow, User
+from .search import get_search_cache
+
+# Campos que cambian los resultados de la búsqueda de usuarios.
+SEARCH_FIELDS = {'username', 'name'}
+
+
+@receiver(post_save, sender=User)
+def refresh_user_search_on_save(sender, instance, created=False, update_fields=None, **kwargs):
+    """
+    Descarta de la caché de búsquedas las entradas afectadas al crear o editar un usuario.
+
+    Los guardados que no tocan username ni name (por ejemplo, last_login al
+    iniciar sesión) no invalidan nada.
+    """
+    if update_fields is not None and not SEARCH_FIELDS & set(update_fields):
+        return
+    get_search_cache().invalidate(instance.pk, instance.username, instance.name)
+
+
+@receiver(post_delete, sender=User)
+def refresh_user_search_on_delete(sender, instance, **kwargs):
+    """
+    Descarta de la caché de búsquedas las entradas que incluían al usuario borrado.
+    """
+    get_search_cache().invalidate(instance.pk, instance.username, instance.name)
+
+
+@receiver(pre_delete, sender=User)
+def release_follow_counts(sender, instance, **kwargs):
+    """
+    Descuenta los seguimientos del usuario que se borra de los contadores de los demás.
+
+    El borrado en cascada quita sus filas de Follow sin pasar por la vista
+    follow: sus seguidos pierden un seguidor y sus seguidores, un seguido.
+    Tras el commit también se quitan esas aristas del índice del grafo de
+    seguimientos del proceso (users/graph.py).
+    """
+    followed = Follow.objects.filter(from_user=instance).values('to_user')
+    User.objects.filter(pk__in=followed).exclude(pk=instance.pk).update(
+        followers_count=Greatest(F('followers_count') - 1, 0), **version_bump()
+    )
+    fans = Follow.objects.filter(to_user=instance).values('from_user')
+    User.objects.filter(pk__in=fans).exclude(pk=instance.pk).update(
+        following_count=Greatest(F('following_count') - 1, 0), **version_bump()
+    )
+
+    edges = list(
+        Follow.objects.filter(Q(from_user=instance) | Q(to_user=instance)).values_list('from_user_id', 'to_user_id')
+    )
+
+    def forget_edges():
+        for from_id, to_id in edges:
+            record_follow(from_id, to_id, False)
+
+    if edges:
+        transaction.on_commit(forget_edges)
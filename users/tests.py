@@ -1,5 +1,18 @@
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from testutils.queryplan import QueryPlanMixin, explain
+from django.core.management import call_command
+from io import StringIO
+import threading
+from unittest import mock
+from users.models import Follow, Recommendation
+from users.recommendations import refresh_user
+from users.graph import FollowGraph, get_follow_graph, record_follow, reset_follow_graph
+from users.search import get_search_cache, ranked_user_ids
 
 class CustomUserTests(TestCase):
     """
@@ -70,3 +83,494 @@ class UserProfileTests(TestCase):
         self.assertEqual(f'{self.user.username}', 'user1')
         self.assertEqual(f'{self.user.email}', 'user1@example.com')
         self.assertEqual(self.user.followed.count(), 0)
+
+class UserDetailConditionalTests(TestCase):
+    """
+    Pruebas para los GET condicionales del perfil de usuario.
+
+    Métodos:
+        test_profile_not_modified(): Verifica el 304 del perfil y que cambia al seguirlo o editarlo.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configura datos de prueba para las pruebas.
+        """
+        User = get_user_model()
+        cls.user1 = User.objects.create_user(username='user1', email='user1@example.com', password='testpass123')
+        cls.user2 = User.objects.create_user(username='user2', email='user2@example.com', password='testpass123')
+
+    def test_profile_not_modified(self):
+        """
+        Verifica el 304 del perfil y que el ETag cambia al seguirlo o editarlo.
+        """
+        client = APIClient()
+        client.force_authenticate(user=self.user1)
+        etag = client.get('/users/user2/')['ETag']
+        self.assertEqual(client.get('/users/user2/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        client.post('/users/follow/user2/')
+        response = client.get('/users/user2/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['i_follow'])
+
+        etag = response['ETag']
+        client.patch('/users/user1/', {'bio': 'Nueva biografía'})
+        self.assertEqual(client.get('/users/user2/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        own = client.get('/users/user1/')
+        self.assertEqual(own.data['bio'], 'Nueva biografía')
+
+class FollowTests(QueryPlanMixin, TestCase):
+    """
+    Pruebas para los contadores de seguidores y las listas de seguidores y seguidos.
+
+    Métodos:
+        test_follow_updates_counts(): Verifica los contadores al seguir y dejar de seguir.
+        test_deleting_user_updates_counts(): Verifica los contadores de los demás al borrar un usuario.
+        test_profile_without_followed_list(): Verifica que el perfil no incluye la lista de seguidores.
+        test_followers_cursor_pagination(): Verifica la paginación por cursor de los seguidores.
+        test_following_list(): Verifica la lista de usuarios seguidos.
+        test_followers_use_indexes(): Verifica que la lista de seguidores no recorre tablas completas.
+        test_search_follow_state_batched(): Verifica que i_follow de una lista se resuelve en una consulta.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configura datos de prueba para las pruebas.
+        """
+        User = get_user_model()
+        cls.star = User.objects.create_user(username='star', email='star@example.com', password='testpass123')
+        cls.fans = [
+            User.objects.create_user(username=f'fan{i}', email=f'fan{i}@example.com', password='testpass123')
+            for i in range(13)
+        ]
+
+    def follow_all(self):
+        for fan in self.fans:
+            client = APIClient()
+            client.force_authenticate(user=fan)
+            client.post('/users/follow/star/')
+
+    def test_follow_updates_counts(self):
+        """
+        Verifica que seguir y dejar de seguir actualiza followers_count y following_count.
+        """
+        client = APIClient()
+        client.force_authenticate(user=self.fans[0])
+        client.post('/users/follow/star/')
+        self.star.refresh_from_db()
+        self.fans[0].refresh_from_db()
+        self.assertEqual((self.star.followers_count, self.fans[0].following_count), (1, 1))
+        self.assertEqual(client.get('/users/star/').data['followers'], 1)
+
+        response = client.post('/users/follow/star/')
+        self.assertEqual(response.data, {'detail': 'Ya no lo sigues'})
+        self.star.refresh_from_db()
+        self.fans[0].refresh_from_db()
+        self.assertEqual((self.star.followers_count, self.fans[0].following_count), (0, 0))
+        self.assertFalse(Follow.objects.exists())
+
+    def test_deleting_user_updates_counts(self):
+        """
+        Verifica que borrar un usuario descuenta sus seguimientos de los contadores de los demás.
+        """
+        self.follow_all()
+        client = APIClient()
+        client.force_authenticate(user=self.star)
+        client.post('/users/follow/fan1/')
+
+        self.fans[0].delete()
+        self.star.refresh_from_db()
+        self.assertEqual(self.star.followers_count, 12)
+        client.force_authenticate(user=self.star)
+        self.assertEqual(client.delete('/users/star/').status_code, 204)
+        self.fans[1].refresh_from_db()
+        self.assertEqual((self.fans[1].following_count, self.fans[1].followers_count), (0, 0))
+
+    def test_profile_without_followed_list(self):
+        """
+        Verifica que el perfil devuelve los contadores y no la lista de seguidores.
+        """
+        self.follow_all()
+        client = APIClient()
+        client.force_authenticate(user=self.star)
+        response = client.get('/users/star/')
+        self.assertNotIn('followed_usernames', response.data)
+        self.assertEqual(response.data['followers'], 13)
+        self.assertEqual(response.data['following'], 0)
+        self.assertFalse(response.data['i_follow'])
+
+    def test_followers_cursor_pagination(self):
+        """
+        Verifica que los seguidores se paginan por cursor, del más reciente al más antiguo.
+        """
+        self.follow_all()
+        client = APIClient()
+        client.force_authenticate(user=self.star)
+        first = client.get('/users/star/followers/')
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(len(first.data['data']), 10)
+        self.assertEqual(first.data['data'][0]['username'], 'fan12')
+        second = client.get('/users/star/followers/', {'cursor': first.data['meta']['next']})
+        usernames = [user['username'] for user in first.data['data'] + second.data['data']]
+        self.assertEqual(usernames, [f'fan{i}' for i in reversed(range(13))])
+        self.assertIsNone(second.data['meta']['next'])
+
+    def test_following_list(self):
+        """
+        Verifica que la lista de seguidos devuelve los usuarios que sigue el usuario.
+        """
+        self.follow_all()
+        client = APIClient()
+        client.force_authenticate(user=self.fans[0])
+        response = client.get('/users/fan0/following/')
+        self.assertEqual([user['username'] for user in response.data['data']], ['star'])
+        self.assertTrue(response.data['data'][0]['i_follow'])
+
+    def test_followers_use_indexes(self):
+        """
+        Verifica que la lista de seguidores no recorre tablas completas ni ordena sin índice.
+        """
+        self.follow_all()
+        client = APIClient()
+        client.force_authenticate(user=self.star)
+        response = self.assertQueriesUseIndexes(lambda: client.get('/users/star/followers/'))
+        self.assertEqual(len(response.data['data']), 10)
+
+    def test_search_follow_state_batched(self):
+        """
+        Verifica que i_follow de los resultados de búsqueda se resuelve en una sola consulta.
+        """
+        for fan in self.fans[8:]:
+            Follow.objects.create(from_user=self.star, to_user=fan)
+        get_search_cache().clear()
+        client = APIClient()
+        client.force_authenticate(user=self.star)
+        client.get('/users/u/search/', {'query': 'fan'})
+        # Con la búsqueda en caché: los usuarios y su estado de seguimiento.
+        with self.assertNumQueries(2):
+            response = client.get('/users/u/search/', {'query': 'fan'})
+        following = {user['username'] for user in response.data['users'] if user['i_follow']}
+        self.assertEqual(following, {f'fan{i}' for i in range(8, 13)})
+
+class UserSearchTests(TestCase):
+    """
+    Pruebas para la búsqueda de usuarios del autocompletado.
+
+    Métodos:
+        test_ranking(): Verifica el orden exacto, prefijo, nombre y subcadena, con el impulso por seguidores.
+        test_result_cap(): Verifica el límite de resultados.
+        test_cache_refreshed_on_save(): Verifica que editar un usuario actualiza las búsquedas en caché.
+        test_prefix_uses_lower_index(): Verifica que la búsqueda por prefijo usa el índice LOWER(username).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Configura datos de prueba para las pruebas.
+        """
+        User = get_user_model()
+        cls.viewer = User.objects.create_user(username='viewer', email='viewer@example.com', password='testpass123')
+        for username, name, followers in [
+            ('mariano', '', 5),
+            ('maria', '', 0),
+            ('mariabonita', '', 50),
+            ('pepe', 'María López', 100),
+            ('rosamaria', '', 1000),
+            ('otro', '', 10000),
+        ]:
+            user = User.objects.create_user(username=username, email=f'{username}@example.com', password='testpass123')
+            User.objects.filter(pk=user.pk).update(name=name, followers_count=followers)
+
+    def setUp(self):
+        """
+        Vacía la caché de búsquedas y autentica al usuario.
+        """
+        get_search_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.viewer)
+
+    def search(self, query, **params):
+        response = self.client.get('/users/u/search/', {'query': query, **params})
+        return [user['username'] for user in response.data['users']]
+
+    def test_ranking(self):
+        """
+        Verifica que el username exacto va primero, luego los prefijos por seguidores,
+        luego los nombres y al final las subcadenas.
+        """
+        self.assertEqual(self.search('Maria'), ['maria', 'mariabonita', 'mariano', 'rosamaria'])
+        self.assertEqual(self.search('marí'), ['pepe'])
+        self.assertEqual(self.search('  '), [])
+
+    @override_settings(USER_SEARCH_LIMIT=2)
+    def test_result_cap(self):
+        """
+        Verifica que nunca se devuelven más de USER_SEARCH_LIMIT resultados.
+        """
+        self.assertEqual(self.search('mar'), ['mariabonita', 'mariano'])
+        self.assertEqual(self.search('mar', limit=1000), ['mariabonita', 'mariano'])
+        self.assertEqual(self.search('mar', limit=1), ['mariabonita'])
+
+    def test_cache_refreshed_on_save(self):
+        """
+        Verifica que crear o renombrar un usuario invalida las búsquedas cortas en caché.
+        """
+        self.assertEqual(self.search('mar'), ['mariabonita', 'mariano', 'maria', 'pepe', 'rosamaria'])
+        User = get_user_model()
+        User.objects.create_user(username='mar', email='mar@example.com', password='testpass123')
+        self.assertEqual(self.search('mar')[0], 'mar')
+
+        user = User.objects.get(username='mariano')
+        user.username = 'juan'
+        user.save()
+        self.assertNotIn('mariano', self.search('mar'))
+
+    def test_prefix_uses_lower_index(self):
+        """
+        Verifica que los niveles exacto y de prefijo buscan en el índice LOWER(username).
+        """
+        with CaptureQueriesContext(connection) as context:
+            ranked_user_ids('ma', 10)
+        plans = [' '.join(explain(query['sql'])) for query in context.captured_queries]
+        self.assertIn('users_username_lower_idx', plans[0])
+        self.assertIn('users_username_lower_idx', plans[1])
+        self.assertIn('users_name_lower_idx', plans[2])
+
+@override_settings(BACKGROUND_TASKS_ASYNC=False)
+class RecommendationTests(TestCase):
+    """
+    Pruebas para las sugerencias de a quién seguir.
+
+    Métodos:
+        test_friends_of_friends_ranking(): Verifica el cálculo por lotes y el orden de reco.
+        test_refresh_on_follow(): Verifica que seguir a alguien recalcula las sugerencias.
+        test_large_accounts_same_in_both_paths(): Verifica que ambos cálculos excluyen las mismas cuentas grandes.
+        test_fallback_without_recommendations(): Verifica que reco completa con usuarios recientes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Crea el grafo: ana sigue a bea y carlos; bea y carlos siguen a dani; bea sigue a eva.
+        """
+        User = get_user_model()
+        cls.users = {
+            name: User.objects.create_user(username=name, email=f'{name}@example.com', password='testpass123')
+            for name in ['ana', 'bea', 'carlos', 'dani', 'eva', 'fer']
+        }
+        for from_user, to_user in [('ana', 'bea'), ('ana', 'carlos'), ('bea', 'dani'),
+                                   ('carlos', 'dani'), ('bea', 'eva')]:
+            Follow.objects.create(from_user=cls.users[from_user], to_user=cls.users[to_user])
+
+    def reco(self, name):
+        client = APIClient()
+        client.force_authenticate(user=self.users[name])
+        return [user['username'] for user in client.get('/users/reco/').data]
+
+    def test_friends_of_friends_ranking(self):
+        """
+        Verifica que compute_recommendations guarda los amigos de amigos ordenados por puntaje.
+        """
+        call_command('compute_recommendations', stdout=StringIO())
+        dani = Recommendation.objects.get(user=self.users['ana'], candidate=self.users['dani'])
+        self.assertEqual(dani.mutuals, 2)
+        self.assertEqual(self.reco('ana')[:2], ['dani', 'eva'])
+        self.assertFalse(Recommendation.objects.filter(user=self.users['ana'], candidate=self.users['bea']).exists())
+
+    def test_refresh_on_follow(self):
+        """
+        Verifica que seguir a alguien quita la sugerencia y recalcula las del usuario.
+        """
+        call_command('compute_recommendations', stdout=StringIO())
+        client = APIClient()
+        client.force_authenticate(user=self.users['fer'])
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post('/users/follow/bea/')
+        candidates = Recommendation.objects.filter(user=self.users['fer']).order_by('-score', '-candidate_id')
+        self.assertEqual([reco.candidate.username for reco in candidates], ['eva', 'dani', 'ana'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post('/users/follow/dani/')
+        self.assertNotIn('dani', self.reco('fer'))
+
+    @override_settings(RECO_MAX_DEGREE=1)
+    def test_large_accounts_same_in_both_paths(self):
+        """
+        Verifica que el cálculo por lotes y el incremental excluyen las mismas cuentas grandes del co-seguimiento.
+        """
+        for name in ('bea', 'dani'):
+            Follow.objects.create(from_user=self.users['fer'], to_user=self.users[name])
+        call_command('recount_follows', stdout=StringIO())
+
+        def saved():
+            candidates = Recommendation.objects.filter(user=self.users['fer']).order_by('-score', '-candidate_id')
+            return [(reco.candidate.username, reco.score) for reco in candidates]
+
+        call_command('compute_recommendations', stdout=StringIO())
+        batch = saved()
+        # bea y dani tienen más de un seguidor: sus seguidores no aportan co-seguimientos.
+        self.assertEqual(batch, [('eva', 1.0)])
+        refresh_user(self.users['fer'].pk)
+        self.assertEqual(saved(), batch)
+
+    def test_fallback_without_recommendations(self):
+        """
+        Verifica que, sin sugerencias calculadas, reco devuelve usuarios no seguidos.
+        """
+        users = self.reco('ana')
+        self.assertEqual(len(users), 3)
+        self.assertNotIn('bea', users)
+        self.assertNotIn('ana', users)
+
+class FollowGraphTests(TestCase):
+    """
+    Pruebas para el índice en memoria del grafo de seguimientos.
+
+    Métodos:
+        test_edges_and_mutuals(): Verifica las búsquedas de aristas y los seguidores en común.
+        test_follow_updates_index(): Verifica que seguir y dejar de seguir actualiza el índice.
+        test_stale_index_rebuilds_in_background(): Verifica la reconstrucción en segundo plano.
+        test_reads_during_concurrent_changes(): Verifica las lecturas mientras otro hilo aplica cambios.
+        test_deleted_user_leaves_index(): Verifica que borrar un usuario quita sus aristas del índice.
+        test_profile_badges(): Verifica follows_you y mutual_followers en el perfil.
+        test_memory_report(): Verifica el informe de memoria.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Crea el grafo: ana sigue a bea, carlos y dani; bea y carlos siguen a dani; dani sigue a ana.
+        """
+        User = get_user_model()
+        cls.users = {
+            name: User.objects.create_user(username=name, email=f'{name}@example.com', password='testpass123')
+            for name in ['ana', 'bea', 'carlos', 'dani']
+        }
+        for from_user, to_user in [('ana', 'bea'), ('ana', 'carlos'), ('ana', 'dani'),
+                                   ('bea', 'dani'), ('carlos', 'dani'), ('dani', 'ana')]:
+            Follow.objects.create(from_user=cls.users[from_user], to_user=cls.users[to_user])
+
+    def setUp(self):
+        """
+        Descarta el índice de pruebas anteriores.
+        """
+        reset_follow_graph()
+        self.addCleanup(reset_follow_graph)
+
+    def pk(self, name):
+        return self.users[name].pk
+
+    def test_edges_and_mutuals(self):
+        """
+        Verifica follows(), following(), followers() y mutual_followers() contra la tabla.
+        """
+        graph = FollowGraph.build()
+        self.assertTrue(graph.follows(self.pk('ana'), self.pk('bea')))
+        self.assertFalse(graph.follows(self.pk('bea'), self.pk('ana')))
+        self.assertEqual(graph.followers(self.pk('dani')), {self.pk('ana'), self.pk('bea'), self.pk('carlos')})
+        self.assertEqual(graph.following(self.pk('dani')), {self.pk('ana')})
+        self.assertEqual(graph.mutual_followers(self.pk('ana'), self.pk('dani')), 2)
+        self.assertEqual(graph.mutual_followers(self.pk('bea'), self.pk('dani')), 0)
+        self.assertFalse(graph.follows(0, self.pk('ana')))
+
+    @override_settings(BACKGROUND_TASKS_ASYNC=False)
+    def test_follow_updates_index(self):
+        """
+        Verifica que la vista de seguir aplica los cambios al índice ya construido.
+        """
+        graph = get_follow_graph()
+        client = APIClient()
+        client.force_authenticate(user=self.users['bea'])
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post('/users/follow/carlos/')
+        self.assertTrue(graph.follows(self.pk('bea'), self.pk('carlos')))
+        self.assertEqual(graph.mutual_followers(self.pk('bea'), self.pk('dani')), 1)
+
+        client.force_authenticate(user=self.users['ana'])
+        with self.captureOnCommitCallbacks(execute=True):
+            client.post('/users/follow/bea/')
+        self.assertFalse(graph.follows(self.pk('ana'), self.pk('bea')))
+        self.assertEqual(graph.mutual_followers(self.pk('ana'), self.pk('dani')), 1)
+        self.assertIs(get_follow_graph(), graph)
+
+    @override_settings(BACKGROUND_TASKS_ASYNC=False, FOLLOW_GRAPH_MAX_AGE=60)
+    def test_stale_index_rebuilds_in_background(self):
+        """
+        Verifica que un índice viejo se sigue usando hasta que el nuevo lo
+        reemplaza y que los cambios registrados durante la construcción llegan al nuevo.
+        """
+        graph = get_follow_graph()
+        graph.built_at -= 61
+        build = FollowGraph.build.__func__
+
+        def build_with_concurrent_follow(cls):
+            built = build(cls)
+            record_follow(self.pk('bea'), self.pk('carlos'), True)
+            return built
+
+        with mock.patch.object(FollowGraph, 'build', classmethod(build_with_concurrent_follow)):
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                self.assertIs(get_follow_graph(), graph)
+                self.assertIs(get_follow_graph(), graph)
+            self.assertEqual(len(callbacks), 1)
+            callbacks[0]()
+
+        rebuilt = get_follow_graph()
+        self.assertIsNot(rebuilt, graph)
+        self.assertTrue(rebuilt.follows(self.pk('bea'), self.pk('carlos')))
+        self.assertTrue(graph.follows(self.pk('bea'), self.pk('carlos')))
+        self.assertEqual(rebuilt.mutual_followers(self.pk('ana'), self.pk('dani')), 2)
+
+    def test_reads_during_concurrent_changes(self):
+        """
+        Verifica que leer los vecinos mientras otro hilo aplica cambios no falla.
+        """
+        graph = FollowGraph.build()
+        ana, dani = self.pk('ana'), self.pk('dani')
+        writer = threading.Thread(target=lambda: [graph.apply(ana, 10000 + i, True) for i in range(20000)])
+        writer.start()
+        while writer.is_alive():
+            graph.following(ana)
+            graph.mutual_followers(ana, dani)
+        writer.join()
+        self.assertEqual(len(graph.following(ana)), 20003)
+
+    def test_deleted_user_leaves_index(self):
+        """
+        Verifica que borrar un usuario quita sus seguimientos del índice ya construido.
+        """
+        ana, bea, carlos, dani = (self.pk(name) for name in ['ana', 'bea', 'carlos', 'dani'])
+        graph = get_follow_graph()
+        with self.captureOnCommitCallbacks(execute=True):
+            get_user_model().objects.get(pk=bea).delete()
+        self.assertFalse(graph.follows(ana, bea))
+        self.assertEqual(graph.following(ana), {carlos, dani})
+        self.assertEqual(graph.followers(dani), {ana, carlos})
+        self.assertEqual(graph.mutual_followers(ana, dani), 1)
+
+    def test_profile_badges(self):
+        """
+        Verifica que el perfil indica si el usuario te sigue y cuántos seguidores tienen en común.
+        """
+        client = APIClient()
+        client.force_authenticate(user=self.users['ana'])
+        response = client.get('/users/dani/')
+        self.assertTrue(response.data['follows_you'])
+        self.assertEqual(response.data['mutual_followers'], 2)
+        response = client.get('/users/bea/')
+        self.assertFalse(response.data['follows_you'])
+        self.assertEqual(response.data['mutual_followers'], 0)
+
+    def test_memory_report(self):
+        """
+        Verifica que el informe de memoria cuenta usuarios, seguimientos y bytes.
+        """
+        usage = FollowGraph.build().memory_usage()
+        self.assertEqual((usage['users'], usage['edges']), (4, 6))
+        self.assertGreater(usage['total_bytes'], 0)
+        output = StringIO()
+        call_command('follow_graph_stats', stdout=output)
+        self.assertIn('Seguimientos: 6', output.getvalue())
@@ -21,6 +21,10 @@ urlpatterns = [
     # Ruta para obtener un nuevo token de acceso utilizando un token de actualización
     path('refresh/', TokenRefreshView.as_view()),
 
+    # Rutas para obtener los seguidores y los seguidos de un usuario (paginados por cursor)
+    path('<str:username>/followers/', views.followers),
+    path('<str:username>/following/', views.following),
+
     # Ruta para ver, actualizar y eliminar detalles de un usuario
     path('<str:username>/', views.UserDetailView.as_view()),
 ]
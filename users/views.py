@@ -5,20 +5,41 @@ from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework.permissions import IsAuthenticated
-from .models import User
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from .models import Follow, Recommendation, User
+from .graph import record_follow
+from .recommendations import refresh_user
 from .serializers import MyTokenObtainPairSerializer, MyUserSerializer, UserSerializer, SearchSerializer
 from .permissions import IsUserOrReadOnly
+from .search import search_users
+from backend.conditional import ConditionalGetMixin
+from backend.pagination import ProfilePagination
+from backend.tasks import run_in_background
+from backend.images import reset_variants, schedule_variants
+from backend.uploads import StreamingUploadMixin
+from backend.versioning import version_bump
 from noti.serializers import NotiSerializer
 from noti.models import Noti
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 
+# Cantidad de usuarios que devuelve reco.
+RECO_COUNT = 5
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def follow(request, username):
     """
     Permite a un usuario autenticado seguir o dejar de seguir a otro usuario.
 
+    Actualiza en la misma transacción los contadores followers_count y
+    following_count de ambos usuarios. Después del commit aplica el cambio al
+    índice del grafo de seguimientos del proceso y recalcula en segundo plano
+    las sugerencias de a quién seguir del usuario actual.
+
     Métodos HTTP admitidos:
         - POST
 
@@ -32,19 +53,40 @@ def follow(request, username):
     me = request.user
     user = User.objects.get(username=username)
 
-    if user in me.following.all():
-        me.following.remove(user)
+    with transaction.atomic():
+        # Se decide por las filas borradas o creadas, no por una lectura previa:
+        # dos solicitudes simultáneas no pueden aplicar el mismo cambio dos veces.
+        created = False
+        following = not Follow.objects.filter(from_user=me, to_user=user).delete()[0]
+        if following:
+            _, created = Follow.objects.get_or_create(from_user=me, to_user=user)
+            step = 1 if created else 0
+        else:
+            step = -1
+        if step:
+            # Cambian los contadores de ambos perfiles y el i_follow del seguido.
+            User.objects.filter(pk=me.pk).update(
+                following_count=Greatest(F('following_count') + step, 0), **version_bump()
+            )
+            User.objects.filter(pk=user.pk).update(
+                followers_count=Greatest(F('followers_count') + step, 0), **version_bump()
+            )
+        Recommendation.objects.filter(user=me, candidate=user).delete()
+        run_in_background(refresh_user, me.pk)
+        transaction.on_commit(lambda: record_follow(me.pk, user.pk, following))
+
+    if not following:
         return Response({ 'detail': 'Ya no lo sigues' }, status=status.HTTP_200_OK)
-    else:
-        me.following.add(user)
-        noti = Noti(
-            type='te empezó a seguir',
-            to_user=user,
-            from_user=me
-                )
-        noti.save()
-        serializer = NotiSerializer(noti, many=False)
-        return Response(serializer.data)
+    if not created:
+        return Response({ 'detail': 'Ya lo sigues' }, status=status.HTTP_200_OK)
+    noti = Noti(
+        type='te empezó a seguir',
+        to_user=user,
+        from_user=me
+            )
+    noti.save()
+    serializer = NotiSerializer(noti, many=False)
+    return Response(serializer.data)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -52,6 +94,10 @@ def reco(request):
     """
     Recopila y devuelve una lista de usuarios recomendados para seguir.
 
+    Lee las sugerencias precalculadas (users/recommendations.py), de mayor a
+    menor puntaje. Si no alcanzan (usuarios nuevos o que aún no pasaron por
+    compute_recommendations) se completan con los usuarios más recientes.
+
     Métodos HTTP admitidos:
         - GET
 
@@ -61,8 +107,16 @@ def reco(request):
     Returns:
         Response: Respuesta JSON con la lista de usuarios recomendados.
     """
-    users = User.objects.exclude(username=request.user.username)
-    users = users.exclude(id__in = request.user.following.all())[:5]
+    me = request.user
+    followed = Follow.objects.filter(from_user=me).values('to_user_id')
+    users = [
+        reco.candidate for reco in
+        Recommendation.objects.filter(user=me).exclude(candidate_id__in=followed)
+        .select_related('candidate').order_by('-score', '-candidate_id')[:RECO_COUNT]
+    ]
+    if len(users) < RECO_COUNT:
+        latest = User.objects.exclude(pk=me.pk).exclude(id__in=followed).exclude(id__in=[user.pk for user in users])
+        users += list(latest[:RECO_COUNT - len(users)])
     serializer = SearchSerializer(users, many=True, context={"request": request})
     return Response(serializer.data)
 
@@ -72,6 +126,10 @@ def search(request):
     """
     Busca y devuelve una lista de usuarios que coinciden con la consulta proporcionada.
 
+    Los resultados se ordenan por relevancia (username exacto, prefijo de
+    username, prefijo de name y subcadena, y dentro de cada nivel por
+    seguidores) y nunca son más de USER_SEARCH_LIMIT (users/search.py).
+
     Métodos HTTP admitidos:
         - GET
 
@@ -79,27 +137,87 @@ def search(request):
         request: Objeto de solicitud.
 
     Query Parameters:
-        query (str): Cadena de búsqueda para encontrar usuarios por su nombre de usuario.
+        query (str): Cadena de búsqueda para encontrar usuarios por su nombre de usuario o su nombre.
+        limit (int): Cantidad de resultados (opcional, como mucho USER_SEARCH_LIMIT).
 
     Returns:
         Response: Respuesta JSON con la lista de usuarios coincidentes.
     """
-    query = request.query_params.get('query', None)
-    if query is not None:
-        users = User.objects.filter(username__icontains=query)
-        serializer = SearchSerializer(users, many=True, context={"request": request})
-        return Response({ 'users': serializer.data })
+    try:
+        limit = int(request.query_params.get('limit', settings.USER_SEARCH_LIMIT))
+    except ValueError:
+        limit = settings.USER_SEARCH_LIMIT
+    users = search_users(request.query_params.get('query'), limit)
+    serializer = SearchSerializer(users, many=True, context={"request": request})
+    return Response({ 'users': serializer.data })
+
+
+def follow_list(request, username, direction):
+    """
+    Obtiene una página de seguidores o de seguidos de un usuario, del más
+    reciente al más antiguo.
+
+    Pagina por keyset las filas de Follow con un recorrido por rango del
+    índice (to_user, created_at, id) o (from_user, created_at, id).
+
+    Args:
+        request: Objeto de solicitud.
+        username (str): Nombre de usuario.
+        direction (str): 'followers' o 'following'.
+
+    Returns:
+        Response: Respuesta paginada con los usuarios.
+    """
+    user = User.objects.get(username=username)
+    if direction == 'followers':
+        links = Follow.objects.filter(to_user=user).select_related('from_user')
     else:
-        return Response({'users': []})
+        links = Follow.objects.filter(from_user=user).select_related('to_user')
+    paginator = ProfilePagination()
+    page = paginator.paginate_queryset(links, request)
+    users = [link.from_user if direction == 'followers' else link.to_user for link in page]
+    serializer = SearchSerializer(users, many=True, context={"request": request})
+    return paginator.get_paginated_response(serializer.data)
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def followers(request, username):
+    """
+    Obtiene los seguidores de un usuario, paginados por cursor (meta.next).
+
+    Args:
+        request: Objeto de solicitud.
+        username (str): Nombre de usuario.
 
-class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
+    Returns:
+        Response: Respuesta paginada con los seguidores.
+    """
+    return follow_list(request, username, 'followers')
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def following(request, username):
+    """
+    Obtiene los usuarios que sigue un usuario, paginados por cursor (meta.next).
+
+    Args:
+        request: Objeto de solicitud.
+        username (str): Nombre de usuario.
+
+    Returns:
+        Response: Respuesta paginada con los usuarios seguidos.
+    """
+    return follow_list(request, username, 'following')
+
+
+class UserDetailView(StreamingUploadMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Vista para ver, actualizar y eliminar detalles de un usuario.
 
     Métodos HTTP admitidos:
-        - GET: Obtiene los detalles de un usuario.
-        - PUT/PATCH: Actualiza los detalles de un usuario.
+        - GET: Obtiene los detalles de un usuario (con ETag; 304 si no cambió).
+        - PUT/PATCH: Actualiza los detalles de un usuario. El avatar y la portada se
+          reciben por bloques con límites de tamaño (StreamingUploadMixin).
         - DELETE: Elimina un usuario.
 
     Atributos:
@@ -121,6 +239,41 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
     lookup_field = 'username'
     lookup_url_kwarg = 'username'
 
+    def get_version_stamp(self, request, *args, **kwargs):
+        """
+        Obtiene la versión del perfil sin cargar ni serializar al usuario.
+
+        Incluye la versión del usuario actual, porque seguir o dejar de seguir
+        a alguien cambia los seguidores en común que ve en otros perfiles.
+
+        Returns:
+            list: Partes de la versión o None si no existe.
+        """
+        version = User.objects.filter(username=kwargs['username']).values_list('version', flat=True).first()
+        if version is None:
+            return None
+        return [version, request.user.version]
+
+    def perform_update(self, serializer):
+        """
+        Guarda los cambios del perfil y aumenta su versión. Si cambia el
+        avatar o la portada, descarta sus variantes y genera las nuevas en
+        segundo plano.
+
+        Args:
+            serializer: Instancia del serializador del usuario.
+
+        Returns:
+            None
+        """
+        changed = [name for name in ('avatar', 'cover_image') if name in serializer.validated_data]
+        for name in changed:
+            reset_variants(serializer.instance, name)
+        user = serializer.save(**version_bump())
+        user.refresh_from_db(fields=['version'])
+        for name in changed:
+            schedule_variants(user, name)
+
 class MyTokenObtainPairView(TokenObtainPairView):
     """
     Vista para obtener un par de tokens de acceso y de actualización.